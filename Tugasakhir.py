@@ -1,7 +1,26 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections import deque, namedtuple, OrderedDict
+from itertools import islice, count
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+import heapq
 import os
+import sys
+import threading
+import time
+
+from penyimpanan import DataSedangDipakai, Penyimpanan, PenyimpananJurnal, PenyimpananSQLite
+from ekspor import ekspor_nota
+from dapur import KEBIJAKAN, PenjadwalDapur
+from pemantau_stok import PemantauStok, teks_peringatan
+from instrumentasi import Instrumentasi, WatchdogTk
+
+# acuan pengukuran cold start (lihat AplikasiRestoran.waktu_startup)
+WAKTU_MULAI = time.perf_counter()
+# target: jendela sudah tampil dan bisa dipakai dalam waktu ini, berapa pun besar katalog/riwayat
+TARGET_COLD_START_MS = 500
 
 # ===============================
 #  THEME / COLOR CONFIG
@@ -24,27 +43,90 @@ rating_restoran = 4.9
 waktu_buka = "10:00"
 waktu_tutup = "22:00"
 
+# folder jurnal + snapshot (pemulihan setelah aplikasi crash)
+DIREKTORI_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_restoran")
+
+# nota (pesanan selesai) yang tetap di memori; yang lebih lama pindah ke arsip dingin per batch
+BATAS_NOTA_PANAS = 500
+BATCH_ARSIP_NOTA = 100
+UKURAN_HALAMAN_NOTA = 100   # baris per halaman di tab Nota
+
+# ===============================
+#  Kunci stok (lock striping)
+# ===============================
+# Setiap MenuItem dipetakan ke salah satu lock berdasarkan id-nya, jadi dua
+# terminal yang menambah item berbeda hampir tidak pernah saling menunggu,
+# tanpa harus membuat satu Lock per item untuk katalog besar.
+_kunci_stok = [threading.Lock() for _ in range(64)]
+
+def atur_kunci_stok(jumlah_stripe, buat_kunci=threading.Lock):
+    # 1 stripe = satu lock global (dipakai benchmark sebagai pembanding);
+    # buat_kunci: pabrik lock, mis. lock terukur di benchmark/stok.py
+    global _kunci_stok
+    _kunci_stok = [buat_kunci() for _ in range(jumlah_stripe)]
+
+def kunci_stok(menu_item):
+    return _kunci_stok[hash(menu_item.id) % len(_kunci_stok)]
+
 class MenuItem:
+    __slots__ = ("id", "nama", "kategori", "harga", "stok", "direservasi")
+    STASIUN = "dapur"   # stasiun dapur yang memasak item ini (lihat dapur.py)
+
     def __init__(self, id, nama, kategori, harga, stok):
         self.id = id
         self.nama = nama
         self.kategori = kategori
         self.harga = harga
-        self.stok = stok
+        self.stok = stok          # stok yang masih bisa dipesan
+        self.direservasi = 0      # sudah masuk pesanan aktif, belum diproses dapur
 
     def get_info(self):
         return f"{self.nama} - Rp {self.harga:,} (Stok: {self.stok})"
 
     def kurangi_stok(self, jumlah):
-        if self.stok >= jumlah:
-            self.stok -= jumlah
-            return True
-        return False
+        # cek-lalu-kurangi harus atomik terhadap thread lain
+        with kunci_stok(self):
+            if self.stok >= jumlah:
+                self.stok -= jumlah
+                return True
+            return False
 
     def tambah_stok(self, jumlah):
-        self.stok += jumlah
+        with kunci_stok(self):
+            self.stok += jumlah
+
+    # ------------------
+    # Reservasi stok: reservasi -> komit (pesanan selesai) / lepas (dibatalkan)
+    # ------------------
+    def reservasi(self, jumlah):
+        with kunci_stok(self):
+            if self.stok >= jumlah:
+                self.stok -= jumlah
+                self.direservasi += jumlah
+                return True
+            return False
+
+    def komit_reservasi(self, jumlah):
+        with kunci_stok(self):
+            self.direservasi -= jumlah
+
+    def batal_komit(self, jumlah):
+        with kunci_stok(self):
+            self.direservasi += jumlah
+
+    def lepas_reservasi(self, jumlah):
+        with kunci_stok(self):
+            self.direservasi -= jumlah
+            self.stok += jumlah
+
+    def ke_dict(self):
+        return {"jenis": "menu", "id": self.id, "nama": self.nama, "kategori": self.kategori,
+                "harga": self.harga, "stok": self.stok}
 
 class Makanan(MenuItem):
+    __slots__ = ("tingkat_kepedasan",)
+    STASIUN = "grill"
+
     def __init__(self, id, nama, harga, stok, tingkat_kepedasan=0):
         super().__init__(id, nama, "makanan", harga, stok)
         self.tingkat_kepedasan = tingkat_kepedasan
@@ -53,7 +135,13 @@ class Makanan(MenuItem):
         pedas = " 🌶" * self.tingkat_kepedasan
         return f"🍽️ {self.nama}{pedas} - Rp {self.harga:,} (Stok: {self.stok})"
 
+    def ke_dict(self):
+        return dict(super().ke_dict(), jenis="makanan", tingkat_kepedasan=self.tingkat_kepedasan)
+
 class Minuman(MenuItem):
+    __slots__ = ("ukuran", "dingin")
+    STASIUN = "minuman"
+
     def __init__(self, id, nama, harga, stok, ukuran="regular", dingin=True):
         super().__init__(id, nama, "minuman", harga, stok)
         self.ukuran = ukuran
@@ -63,30 +151,312 @@ class Minuman(MenuItem):
         suhu = "❄️" if self.dingin else "☕"
         return f"🥤 {self.nama} {suhu} - Rp {self.harga:,} (Stok: {self.stok})"
 
+    def ke_dict(self):
+        return dict(super().ke_dict(), jenis="minuman", ukuran=self.ukuran, dingin=self.dingin)
+
+# field yang boleh diubah lewat perbarui_katalog (selain id)
+MENU_FIELD = ("nama", "kategori", "harga", "stok", "tingkat_kepedasan", "ukuran", "dingin")
+
+def menu_dari_dict(d):
+    if d["jenis"] == "makanan":
+        return Makanan(d["id"], d["nama"], d["harga"], d["stok"], d.get("tingkat_kepedasan", 0))
+    if d["jenis"] == "minuman":
+        return Minuman(d["id"], d["nama"], d["harga"], d["stok"], d.get("ukuran", "regular"), d.get("dingin", True))
+    return MenuItem(d["id"], d["nama"], d["kategori"], d["harga"], d["stok"])
+
 class Meja:
+    __slots__ = ("nomor", "kapasitas", "status", "pesanan")
+
     def __init__(self, nomor, kapasitas=2):
         self.nomor = nomor
         self.kapasitas = kapasitas
         self.status = "kosong"
         self.pesanan = None
 
+# ===============================
+#  Alokasi meja (best-fit)
+# ===============================
+MAKS_GABUNG_MEJA = 4
+
+class AlokasiMeja:
+    """
+    Indeks meja kosong untuk penempatan otomatis. Meja kosong dikelompokkan
+    per kapasitas, tiap kelompok berupa min-heap nomor meja; daftar kapasitas
+    terurut dicari dengan bisect, jadi meja terkecil yang cukup didapat dalam
+    O(log n). Entri heap milik meja yang sudah terisi dibuang secara malas
+    saat muncul di puncak heap.
+    """
+    def __init__(self, meja=()):
+        self._meja = {}          # nomor -> Meja
+        self._heap = {}          # kapasitas -> heap nomor meja (bisa berisi entri basi)
+        self._kapasitas = []     # kapasitas yang punya heap, terurut
+        self._kosong = set()     # nomor meja yang benar-benar kosong
+        self._di_heap = set()    # nomor yang masih ada di salah satu heap (kosong atau basi)
+        for m in meja:
+            self.daftar(m)
+
+    def daftar(self, meja):
+        self._meja[meja.nomor] = meja
+        self.perbarui(meja)
+
+    def perbarui(self, meja):
+        # dipanggil setiap status meja berubah (duduk / dilepas)
+        if meja.status != "kosong":
+            self._kosong.discard(meja.nomor)
+            return
+        self._kosong.add(meja.nomor)
+        if meja.nomor not in self._di_heap:
+            heap = self._heap.get(meja.kapasitas)
+            if heap is None:
+                heap = self._heap[meja.kapasitas] = []
+                insort(self._kapasitas, meja.kapasitas)
+            heapq.heappush(heap, meja.nomor)
+            self._di_heap.add(meja.nomor)
+
+    def _puncak(self, kapasitas):
+        heap = self._heap[kapasitas]
+        while heap and heap[0] not in self._kosong:
+            self._di_heap.discard(heapq.heappop(heap))
+        return heap[0] if heap else None
+
+    def jumlah_kosong(self):
+        return len(self._kosong)
+
+    def cari(self, jumlah_orang, maks_gabung=MAKS_GABUNG_MEJA):
+        """
+        [Meja] untuk rombongan jumlah_orang: satu meja kosong dengan kapasitas
+        terkecil yang cukup (nomor terkecil bila sama), atau jika tidak ada,
+        beberapa meja kosong bersebelahan yang digabung. None jika tidak ada.
+        """
+        if jumlah_orang <= 0:
+            return None
+        for kapasitas in islice(self._kapasitas, bisect_left(self._kapasitas, jumlah_orang), None):
+            nomor = self._puncak(kapasitas)
+            if nomor is not None:
+                return [self._meja[nomor]]
+        return self._cari_gabungan(jumlah_orang, maks_gabung)
+
+    def _cari_gabungan(self, jumlah_orang, maks_gabung):
+        # bersebelahan = nomor berurutan. Jalur cadangan untuk rombongan besar saja,
+        # jadi cukup memindai meja kosong: O(k * maks_gabung)
+        terbaik = None
+        kosong = sorted(self._kosong)
+        for i, awal in enumerate(kosong):
+            total = 0
+            for j in range(i, min(i + maks_gabung, len(kosong))):
+                if kosong[j] != awal + (j - i):
+                    break
+                total += self._meja[kosong[j]].kapasitas
+                if total >= jumlah_orang:
+                    kunci = (total, j - i, awal)
+                    if terbaik is None or kunci < terbaik[0]:
+                        terbaik = (kunci, kosong[i:j + 1])
+                    break
+        if terbaik is None:
+            return None
+        return [self._meja[n] for n in terbaik[1]]
+
+class BarisPesanan(namedtuple("BarisPesanan", "menu_item jumlah catatan subtotal")):
+    """
+    Satu baris item pesanan. Tuple tanpa __dict__ (jauh lebih kecil dari dict
+    4 kunci); menu_item hanya pointer ke objek katalog yang dipakai bersama,
+    dan catatan di-intern supaya catatan yang sama ("pedas", "tanpa es")
+    hanya disimpan sekali.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def baru(cls, menu_item, jumlah, catatan="", subtotal=None):
+        if subtotal is None:
+            subtotal = menu_item.harga * jumlah
+        return cls(menu_item, jumlah, sys.intern(catatan) if catatan else "", subtotal)
+
+# ===============================
+#  Cache teks pesanan / nota (LRU)
+# ===============================
+# Versi pesanan diambil dari satu counter global, jadi versi unik antar
+# objek: entri cache milik pesanan lain dengan id sama tidak akan cocok.
+_versi_pesanan = count(1)
+
+class CacheTeks:
+    """
+    LRU untuk teks pesanan yang sudah dirender, kunci (jenis, id_pesanan).
+    Pesanan lama (sudah selesai, tidak dibuka lagi) otomatis tergeser.
+    """
+    def __init__(self, kapasitas=512):
+        self.kapasitas = kapasitas
+        self._data = OrderedDict()
+        self._kunci = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, kunci):
+        with self._kunci:
+            entri = self._data.get(kunci)
+            if entri is not None:
+                self._data.move_to_end(kunci)
+            return entri
+
+    def simpan(self, kunci, entri):
+        with self._kunci:
+            self._data[kunci] = entri
+            self._data.move_to_end(kunci)
+            if len(self._data) > self.kapasitas:
+                self._data.popitem(last=False)
+
+    def bersihkan(self):
+        with self._kunci:
+            self._data.clear()
+
+cache_teks = CacheTeks()
+
 class Pesanan:
-    def __init__(self, id_pesanan, nomor_meja):
+    __slots__ = ("id_pesanan", "nomor_meja", "meja_gabungan", "items", "_status", "total_harga",
+                 "waktu_buat", "_waktu_selesai", "_kunci", "_versi", "_versi_dasar")
+
+    def __init__(self, id_pesanan, nomor_meja, waktu_buat=None, meja_gabungan=()):
+        # _versi berubah di setiap perubahan; _versi_dasar hanya jika teks lama
+        # tidak bisa dipakai lagi (item dihapus / status berubah), bukan saat item ditambah
+        self._versi = self._versi_dasar = next(_versi_pesanan)
         self.id_pesanan = id_pesanan
         self.nomor_meja = nomor_meja
+        self.meja_gabungan = tuple(meja_gabungan)   # meja lain yang digabung untuk rombongan besar
         self.items = []
-        self.status = "aktif"  # aktif -> sedang makan / menunggu, selesai -> sudah diproses
+        self._status = "aktif"  # aktif -> sedang makan / menunggu, selesai -> sudah diproses
         self.total_harga = 0
-        self.waktu_buat = datetime.now()
-        self.waktu_selesai = None
+        self.waktu_buat = waktu_buat or datetime.now()
+        self._waktu_selesai = None
+        self._kunci = threading.Lock()   # items & total_harga diubah bersama
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, status):
+        self._status = status
+        self._ubah_dasar()
+
+    @property
+    def waktu_selesai(self):
+        return self._waktu_selesai
+
+    @waktu_selesai.setter
+    def waktu_selesai(self, waktu):
+        self._waktu_selesai = waktu
+        self._ubah_dasar()
+
+    @property
+    def semua_meja(self):
+        return (self.nomor_meja,) + self.meja_gabungan
+
+    @property
+    def label_meja(self):
+        return "+".join(map(str, self.semua_meja))
+
+    def _ubah_dasar(self):
+        self._versi = self._versi_dasar = next(_versi_pesanan)
+
+    def _ubah_tambah(self):
+        self._versi = next(_versi_pesanan)
+
+    def ke_dict(self):
+        d = {
+            "id": self.id_pesanan, "meja": self.nomor_meja, "status": self.status,
+            "waktu_buat": self.waktu_buat.isoformat(),
+            "waktu_selesai": self.waktu_selesai.isoformat() if self.waktu_selesai else None,
+            "items": [[it.menu_item.id, it.jumlah, it.catatan, it.subtotal] for it in self.items],
+        }
+        if self.meja_gabungan:
+            d["gabungan"] = list(self.meja_gabungan)
+        return d
+
+    @classmethod
+    def dari_dict(cls, d, get_menu):
+        p = cls(d["id"], d["meja"], datetime.fromisoformat(d["waktu_buat"]), d.get("gabungan", ()))
+        p.status = d["status"]
+        if d["waktu_selesai"]:
+            p.waktu_selesai = datetime.fromisoformat(d["waktu_selesai"])
+        for id_menu, jumlah, catatan, subtotal in d["items"]:
+            p.items.append(BarisPesanan.baru(get_menu(id_menu), jumlah, catatan, subtotal))
+            p.total_harga += subtotal
+        return p
 
     def tambah_item(self, menu_item, jumlah, catatan=""):
-        if menu_item.kurangi_stok(jumlah):
-            subtotal = menu_item.harga * jumlah
-            self.items.append({"menu_item": menu_item, "jumlah": jumlah, "catatan": catatan, "subtotal": subtotal})
-            self.total_harga += subtotal
-            return True
-        return False
+        # baris dibangun sebelum reservasi: input tidak valid tidak boleh meninggalkan stok tertahan
+        it = BarisPesanan.baru(menu_item, jumlah, catatan)
+        if not menu_item.reservasi(jumlah):
+            return False
+        with self._kunci:
+            self.items.append(it)
+            self.total_harga += it.subtotal
+            self._ubah_tambah()
+            if self.status == "selesai":
+                # pesanan sudah diproses: stok langsung dianggap terjual
+                menu_item.komit_reservasi(jumlah)
+        return True
+
+    def tambah_items(self, baris):
+        """
+        Tambah banyak baris sekaligus: baris = [(menu_item, jumlah, catatan), ...].
+        Stok semua baris direservasi dulu; jika satu saja kurang, tidak ada
+        yang ditambahkan (all-or-nothing). Kembalikan True jika berhasil.
+        """
+        # baris dibangun sebelum reservasi: input tidak valid tidak boleh meninggalkan stok tertahan
+        baris = [BarisPesanan.baru(m, j, c or "") for m, j, c in baris]
+        if not baris or any(it.jumlah <= 0 for it in baris):
+            return False
+        # satu reservasi per menu, walau muncul di beberapa baris
+        kebutuhan = {}
+        for it in baris:
+            kebutuhan[it.menu_item] = kebutuhan.get(it.menu_item, 0) + it.jumlah
+        diambil = []
+        for menu_item, jumlah in kebutuhan.items():
+            if not menu_item.reservasi(jumlah):
+                for m, j in diambil:
+                    m.lepas_reservasi(j)
+                return False
+            diambil.append((menu_item, jumlah))
+        with self._kunci:
+            for it in baris:
+                self.items.append(it)
+                self.total_harga += it.subtotal
+            self._ubah_tambah()
+            if self.status == "selesai":
+                for menu_item, jumlah in diambil:
+                    menu_item.komit_reservasi(jumlah)
+        return True
+
+    def _kembalikan_stok(self, it):
+        if self.status == "selesai":
+            it.menu_item.tambah_stok(it.jumlah)
+        else:
+            it.menu_item.lepas_reservasi(it.jumlah)
+
+    def lepas_semua_reservasi(self):
+        for it in self.items:
+            self._kembalikan_stok(it)
+
+    def reservasi_ulang(self):
+        """Reservasi ulang semua item (all-or-nothing). Kembalikan True jika berhasil."""
+        diambil = []
+        for it in self.items:
+            if not it.menu_item.reservasi(it.jumlah):
+                for m, j in diambil:
+                    m.lepas_reservasi(j)
+                return False
+            diambil.append((it.menu_item, it.jumlah))
+        return True
+
+    def komit_stok(self):
+        # dipanggil saat pesanan selesai: reservasi menjadi terjual
+        for it in self.items:
+            it.menu_item.komit_reservasi(it.jumlah)
+
+    def batal_komit_stok(self):
+        for it in self.items:
+            it.menu_item.batal_komit(it.jumlah)
 
     def hapus_item_terakhir(self, menu_item_nama, jumlah):
         """
@@ -95,160 +465,1457 @@ class Pesanan:
         """
         for i in range(len(self.items)-1, -1, -1):
             it = self.items[i]
-            if it['menu_item'].nama == menu_item_nama and it['jumlah'] == jumlah:
-                subtotal = it['subtotal']
+            if it.menu_item.nama == menu_item_nama and it.jumlah == jumlah:
+                subtotal = it.subtotal
                 # restore stok
-                it['menu_item'].tambah_stok(it['jumlah'])
+                self._kembalikan_stok(it)
                 # hapus
                 self.total_harga -= subtotal
                 self.items.pop(i)
+                self._ubah_dasar()
                 return True, subtotal
         return False, 0
 
-    def get_info_pesanan(self):
-        teks = f"Pesanan #{self.id_pesanan} - Meja {self.nomor_meja}\nStatus: {self.status}\n"
-        teks += f"Dibuat: {self.waktu_buat.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        if self.waktu_selesai:
-            teks += f"Selesai: {self.waktu_selesai.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        teks += "-"*36 + "\n"
-        for i, it in enumerate(self.items, start=1):
-            teks += f"{i}. {it['menu_item'].nama} x{it['jumlah']} - Rp {it['subtotal']:,}\n"
-            if it['catatan']:
-                teks += f"   Catatan: {it['catatan']}\n"
-        teks += "-"*36 + "\n"
-        teks += f"TOTAL: Rp {self.total_harga:,}\n"
+    def hapus_item_index(self, index):
+        """
+        Hapus baris item pada posisi index (O(1) untuk baris terakhir).
+        Stok dikembalikan. Kembalikan baris yang dihapus.
+        """
+        with self._kunci:
+            it = self.items.pop(index)
+            self.total_harga -= it.subtotal
+            self._ubah_dasar()
+        self._kembalikan_stok(it)
+        return it
+
+    def hapus_items(self, awal, akhir):
+        """Hapus baris items[awal:akhir] sekaligus. Stok dikembalikan. Kembalikan baris yang dihapus."""
+        with self._kunci:
+            dihapus = self.items[awal:akhir]
+            del self.items[awal:akhir]
+            self.total_harga -= sum(it.subtotal for it in dihapus)
+            self._ubah_dasar()
+        for it in dihapus:
+            self._kembalikan_stok(it)
+        return dihapus
+
+    def _render(self, jenis, kepala, baris, kaki, simpan=True):
+        """
+        Render teks lewat cache. Jika sejak render terakhir hanya ada item
+        yang ditambahkan, baris baru saja yang diformat dan disambung.
+        simpan=False: hasil tidak dimasukkan ke cache (mis. ekspor massal).
+        """
+        kunci = (jenis, self.id_pesanan)
+        with self._kunci:
+            entri = cache_teks.get(kunci)   # (versi_dasar, versi, jumlah_baris, kepala+badan, teks)
+            if entri is not None and entri[0] == self._versi_dasar:
+                if entri[1] == self._versi:
+                    return entri[4]
+                awal, badan = entri[2], entri[3]
+            else:
+                awal, badan = 0, kepala()
+            badan += "".join(baris(i, it) for i, it in enumerate(self.items[awal:], start=awal + 1))
+            teks = badan + kaki()
+            if not simpan:
+                return teks
+            cache_teks.simpan(kunci, (self._versi_dasar, self._versi, len(self.items), badan, teks))
         return teks
 
-    def get_nota_text(self):
+    def get_info_pesanan(self):
+        def kepala():
+            teks = f"Pesanan #{self.id_pesanan} - Meja {self.label_meja}\nStatus: {self.status}\n"
+            teks += f"Dibuat: {self.waktu_buat.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            if self.waktu_selesai:
+                teks += f"Selesai: {self.waktu_selesai.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            return teks + "-"*36 + "\n"
+
+        def baris(i, it):
+            teks = f"{i}. {it.menu_item.nama} x{it.jumlah} - Rp {it.subtotal:,}\n"
+            if it.catatan:
+                teks += f"   Catatan: {it.catatan}\n"
+            return teks
+
+        def kaki():
+            return "-"*36 + "\n" + f"TOTAL: Rp {self.total_harga:,}\n"
+
+        return self._render("info", kepala, baris, kaki)
+
+    def get_nota_text(self, pakai_cache=True):
         # Lebih terstruktur untuk nota/receipt
-        lines = []
-        lines.append(f"{nama_restoran}")
-        lines.append(f"Waktu: {self.waktu_buat.strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"Pesanan: #{self.id_pesanan}    Meja: {self.nomor_meja}")
-        lines.append("-"*36)
-        for it in self.items:
-            lines.append(f"{it['menu_item'].nama} x{it['jumlah']}  Rp {it['subtotal']:,}")
-            if it['catatan']:
-                lines.append(f"  (Catatan: {it['catatan']})")
-        lines.append("-"*36)
-        lines.append(f"TOTAL: Rp {self.total_harga:,}")
-        if self.waktu_selesai:
-            lines.append(f"Selesai: {self.waktu_selesai.strftime('%Y-%m-%d %H:%M:%S')}")
-        return "\n".join(lines)
+        def kepala():
+            lines = []
+            lines.append(f"{nama_restoran}")
+            lines.append(f"Waktu: {self.waktu_buat.strftime('%Y-%m-%d %H:%M:%S')}")
+            lines.append(f"Pesanan: #{self.id_pesanan}    Meja: {self.label_meja}")
+            lines.append("-"*36)
+            return "\n".join(lines) + "\n"
+
+        def baris(i, it):
+            teks = f"{it.menu_item.nama} x{it.jumlah}  Rp {it.subtotal:,}\n"
+            if it.catatan:
+                teks += f"  (Catatan: {it.catatan})\n"
+            return teks
+
+        def kaki():
+            lines = ["-"*36, f"TOTAL: Rp {self.total_harga:,}"]
+            if self.waktu_selesai:
+                lines.append(f"Selesai: {self.waktu_selesai.strftime('%Y-%m-%d %H:%M:%S')}")
+            return "\n".join(lines)
+
+        return self._render("nota", kepala, baris, kaki, simpan=pakai_cache)
+
+# ===============================
+#  Indeks Menu (lookup & pencarian)
+# ===============================
+class IndeksMenu:
+    """
+    Indeks katalog menu: dict per id, bucket per kategori, dan daftar kata
+    terurut untuk pencarian prefix (bisect). Jika hasil prefix kurang,
+    dilengkapi pencarian fuzzy (huruf berurutan / subsequence) pada nama.
+    """
+    def __init__(self):
+        self._by_id = {}
+        self._by_kategori = {}   # kategori -> {id: MenuItem}
+        self._kata = []          # list terurut (kata_lower, id)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def _kata_item(self, item):
+        return {(k, item.id) for k in item.nama.lower().split()} | {(item.nama.lower(), item.id)}
+
+    def tambah(self, item):
+        if item.id in self._by_id:
+            self.hapus(item.id)
+        self._by_id[item.id] = item
+        self._by_kategori.setdefault(item.kategori, {})[item.id] = item
+        for kunci in self._kata_item(item):
+            insort(self._kata, kunci)
+
+    def tambah_banyak(self, items):
+        # impor katalog besar: satu kali sort alih-alih insort per kata
+        kata = []
+        for item in items:
+            if item.id in self._by_id:
+                self.hapus(item.id)
+            self._by_id[item.id] = item
+            self._by_kategori.setdefault(item.kategori, {})[item.id] = item
+            kata.extend(self._kata_item(item))
+        self._kata.extend(kata)
+        self._kata.sort()
+
+    def hapus(self, id_menu):
+        item = self._by_id.pop(id_menu, None)
+        if item is None:
+            return None
+        self._by_kategori.get(item.kategori, {}).pop(id_menu, None)
+        for kunci in self._kata_item(item):
+            i = bisect_left(self._kata, kunci)
+            if i < len(self._kata) and self._kata[i] == kunci:
+                del self._kata[i]
+        return item
+
+    def get(self, id_menu):
+        return self._by_id.get(id_menu)
+
+    def by_kategori(self, kategori):
+        # view O(1) atas bucket kategori (ikut berubah bila katalog berubah; salin dengan list() bila perlu)
+        return self._by_kategori.get(kategori, {}).values()
+
+    def cari(self, teks, batas=50):
+        teks = teks.strip().lower()
+        if not teks:
+            return list(islice(self._by_id.values(), batas))
+        hasil = {}
+        # prefix per kata: semua kunci >= teks yang masih diawali teks
+        i = bisect_left(self._kata, (teks,))
+        while i < len(self._kata) and len(hasil) < batas:
+            kata, id_menu = self._kata[i]
+            if not kata.startswith(teks):
+                break
+            hasil[id_menu] = self._by_id[id_menu]
+            i += 1
+        if len(hasil) < batas:
+            for item in self._by_id.values():
+                if item.id not in hasil and _cocok_fuzzy(teks, item.nama.lower()):
+                    hasil[item.id] = item
+                    if len(hasil) >= batas:
+                        break
+        return list(hasil.values())
+
+def _cocok_fuzzy(teks, nama):
+    # semua huruf teks muncul berurutan di nama ("abl" cocok dengan "ayam balap")
+    it = iter(nama)
+    return all(c in it for c in teks if c != " ")
+
+# ===============================
+#  Riwayat Aksi (command log)
+# ===============================
+class Aksi:
+    """
+    Satu entri riwayat. Menyimpan objek yang terlibat secara langsung,
+    sehingga undo/redo adalah pembalikan O(1) tanpa parsing string.
+    undo()/redo() mengembalikan (berhasil, pesan).
+    """
+    def __init__(self, deskripsi):
+        self.deskripsi = deskripsi
+
+    def __str__(self):
+        return self.deskripsi
+
+    def undo(self, manajer):
+        return False, f"Aksi dibatalkan: {self}\n(Tidak ada handler undo otomatis untuk tipe aksi ini)"
+
+    def redo(self, manajer):
+        return False, f"Tidak bisa redo: {self}"
+
+    def ke_dict(self):
+        return {"tipe": "aksi", "deskripsi": self.deskripsi}
+
+class AksiBuatPesanan(Aksi):
+    def __init__(self, pesanan):
+        super().__init__(f"Buat pesanan #{pesanan.id_pesanan}")
+        self.pesanan = pesanan
+
+    def undo(self, manajer):
+        p = self.pesanan
+        # hanya bisa undo jika pesanan masih aktif (belum diproses dapur)
+        if p.status != "aktif":
+            return False, f"Tidak bisa undo pesanan #{p.id_pesanan} karena statusnya bukan aktif ({p.status})"
+        # lepas reservasi stok untuk semua item yang ada di pesanan (jika ada)
+        p.lepas_semua_reservasi()
+        manajer.hapus_pesanan(p.id_pesanan)
+        manajer.pesanan_berubah(p, [it.menu_item for it in p.items])
+        return True, f"Pesanan #{p.id_pesanan} dibatalkan dan stok dikembalikan."
+
+    def redo(self, manajer):
+        p = self.pesanan
+        for meja in manajer.meja_pesanan(p):
+            if meja.status == "terisi":
+                return False, f"Meja {meja.nomor} sudah terisi."
+        if not p.reservasi_ulang():
+            return False, f"Stok tidak mencukupi untuk mengembalikan pesanan #{p.id_pesanan}"
+        manajer.pesanan.tambah(p)
+        for meja in manajer.meja_pesanan(p):
+            manajer.set_meja(meja, "terisi", p)
+        manajer.enqueue_pesanan(p)
+        manajer.pesanan_berubah(p, [it.menu_item for it in p.items])
+        return True, f"Pesanan #{p.id_pesanan} dibuat kembali."
+
+    def ke_dict(self):
+        return {"tipe": "buat", "id": self.pesanan.id_pesanan}
+
+class AksiTambahItem(Aksi):
+    def __init__(self, pesanan, index, menu_item, jumlah, catatan=""):
+        super().__init__(f"Tambah {menu_item.nama} x{jumlah}")
+        self.pesanan = pesanan
+        self.index = index
+        self.menu_item = menu_item
+        self.jumlah = jumlah   # delta stok = -jumlah
+        self.catatan = catatan
+
+    def undo(self, manajer):
+        items = self.pesanan.items
+        if self.index >= len(items) or items[self.index].menu_item is not self.menu_item:
+            return False, f"Aksi dibatalkan: {self}\n(Tidak menemukan item yang cocok untuk di-undo)"
+        it = self.pesanan.hapus_item_index(self.index)
+        manajer.pesanan_berubah(self.pesanan, [self.menu_item])
+        return True, f"Aksi undo berhasil: {self}\nSubtotal dikembalikan: Rp {it.subtotal:,}"
+
+    def redo(self, manajer):
+        if not self.pesanan.tambah_item(self.menu_item, self.jumlah, self.catatan):
+            return False, "Stok tidak mencukupi"
+        self.index = len(self.pesanan.items) - 1
+        manajer.pesanan_berubah(self.pesanan, [self.menu_item])
+        return True, f"{self.menu_item.nama} x{self.jumlah} ditambahkan kembali ke pesanan #{self.pesanan.id_pesanan}"
+
+    def ke_dict(self):
+        return {"tipe": "tambah", "id": self.pesanan.id_pesanan, "index": self.index,
+                "menu": self.menu_item.id, "jumlah": self.jumlah, "catatan": self.catatan}
+
+class AksiTambahBanyak(Aksi):
+    """Satu entri riwayat untuk satu batch baris (pesanan rombongan/katering)."""
+    def __init__(self, pesanan, index, baris):
+        super().__init__(f"Tambah {len(baris)} item ke pesanan #{pesanan.id_pesanan}")
+        self.pesanan = pesanan
+        self.index = index     # posisi baris pertama batch di pesanan.items
+        self.baris = baris     # [(menu_item, jumlah, catatan), ...]
+
+    def undo(self, manajer):
+        akhir = self.index + len(self.baris)
+        items = self.pesanan.items[self.index:akhir]
+        if len(items) != len(self.baris) or any(it.menu_item is not m for it, (m, _, _) in zip(items, self.baris)):
+            return False, f"Aksi dibatalkan: {self}\n(Tidak menemukan item yang cocok untuk di-undo)"
+        dihapus = self.pesanan.hapus_items(self.index, akhir)
+        manajer.pesanan_berubah(self.pesanan, [m for m, _, _ in self.baris])
+        return True, f"Aksi undo berhasil: {self}\nSubtotal dikembalikan: Rp {sum(it.subtotal for it in dihapus):,}"
+
+    def redo(self, manajer):
+        index = len(self.pesanan.items)
+        if not self.pesanan.tambah_items(self.baris):
+            return False, "Stok tidak mencukupi"
+        self.index = index
+        manajer.pesanan_berubah(self.pesanan, [m for m, _, _ in self.baris])
+        return True, f"{len(self.baris)} item ditambahkan kembali ke pesanan #{self.pesanan.id_pesanan}"
+
+    def ke_dict(self):
+        return {"tipe": "tambah_banyak", "id": self.pesanan.id_pesanan, "index": self.index,
+                "baris": [[m.id, j, c] for m, j, c in self.baris]}
+
+class AksiProsesPesanan(Aksi):
+    def __init__(self, pesanan):
+        super().__init__(f"Proses pesanan #{pesanan.id_pesanan}")
+        self.pesanan = pesanan
+
+    def undo(self, manajer):
+        p = self.pesanan
+        if p.status != "selesai":
+            return False, f"Pesanan #{p.id_pesanan} tidak berstatus selesai."
+        for meja in manajer.meja_pesanan(p):
+            if meja.status == "terisi" and meja.pesanan is not p:
+                return False, f"Meja {meja.nomor} sudah dipakai pesanan lain."
+        manajer.batal_selesaikan_pesanan(p)
+        # kembalikan ke depan antrian dapur
+        manajer.enqueue_pesanan(p)
+        manajer.antrian_pesanan.prioritaskan(p.id_pesanan)
+        return True, f"Pesanan #{p.id_pesanan} dikembalikan ke antrian."
+
+    def redo(self, manajer):
+        p = self.pesanan
+        if p not in manajer.antrian_pesanan:
+            return False, f"Pesanan #{p.id_pesanan} tidak ada di antrian."
+        manajer.batalkan_antrian(p.id_pesanan)
+        manajer.selesaikan_pesanan(p)
+        return True, f"Pesanan #{p.id_pesanan} diproses dan ditandai selesai."
+
+    def ke_dict(self):
+        return {"tipe": "proses", "id": self.pesanan.id_pesanan}
+
+def aksi_dari_dict(d, pesanan_by_id, get_menu):
+    if d["tipe"] == "buat":
+        return AksiBuatPesanan(pesanan_by_id[d["id"]])
+    if d["tipe"] == "tambah":
+        return AksiTambahItem(pesanan_by_id[d["id"]], d["index"], get_menu(d["menu"]), d["jumlah"], d["catatan"])
+    if d["tipe"] == "tambah_banyak":
+        return AksiTambahBanyak(pesanan_by_id[d["id"]], d["index"], [(get_menu(m), j, c) for m, j, c in d["baris"]])
+    if d["tipe"] == "proses":
+        return AksiProsesPesanan(pesanan_by_id[d["id"]])
+    return Aksi(d["deskripsi"])
+
+class RiwayatAksi:
+    """
+    Stack undo berupa ring buffer berkapasitas tetap (entri tertua dibuang
+    otomatis) + stack redo yang dikosongkan setiap ada aksi baru.
+    """
+    def __init__(self, kapasitas=500):
+        self.kapasitas = kapasitas
+        self._undo = deque(maxlen=kapasitas)
+        self._redo = deque(maxlen=kapasitas)
+
+    def __len__(self):
+        return len(self._undo)
+
+    def __bool__(self):
+        return bool(self._undo)
+
+    def __iter__(self):
+        return iter(self._undo)
+
+    def __reversed__(self):
+        return reversed(self._undo)
+
+    def push(self, aksi, hapus_redo=True):
+        self._undo.append(aksi)
+        if hapus_redo:
+            self._redo.clear()
+
+    def pop(self):
+        return self._undo.pop() if self._undo else None
+
+    def push_redo(self, aksi):
+        self._redo.append(aksi)
+
+    def pop_redo(self):
+        return self._redo.pop() if self._redo else None
+
+    def daftar_redo(self):
+        return list(self._redo)
+
+    def jumlah_halaman(self, ukuran=20):
+        return max(1, -(-len(self._undo) // ukuran))
+
+    def halaman(self, nomor, ukuran=20):
+        # halaman 1 = aksi terbaru; hanya baris di halaman itu yang dibaca
+        mulai = (nomor - 1) * ukuran
+        return list(islice(reversed(self._undo), mulai, mulai + ukuran))
+
+# ===============================
+#  Repositori Pesanan (indeks)
+# ===============================
+class RepositoriPesanan:
+    """
+    Penyimpanan pesanan dengan id monoton (tidak pernah dipakai ulang),
+    indeks utama per id, serta indeks sekunder per meja dan per status.
+    Tambah, ambil, ubah status, dan hapus semuanya O(1).
+    """
+    def __init__(self):
+        self._id_terakhir = 0
+        self._by_id = {}       # id -> Pesanan (urutan sisip terjaga)
+        self._by_meja = {}     # nomor_meja -> {id: Pesanan}
+        self._by_status = {}   # status -> {id: Pesanan}
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __reversed__(self):
+        return reversed(list(self._by_id.values()))
+
+    def __contains__(self, pesanan):
+        return self._by_id.get(pesanan.id_pesanan) is pesanan
+
+    def alokasi_id(self):
+        self._id_terakhir += 1
+        return self._id_terakhir
+
+    def tambah(self, pesanan):
+        self._id_terakhir = max(self._id_terakhir, pesanan.id_pesanan)
+        self._by_id[pesanan.id_pesanan] = pesanan
+        self._by_meja.setdefault(pesanan.nomor_meja, {})[pesanan.id_pesanan] = pesanan
+        self._by_status.setdefault(pesanan.status, {})[pesanan.id_pesanan] = pesanan
+
+    def get(self, id_pesanan):
+        return self._by_id.get(id_pesanan)
+
+    def hapus(self, id_pesanan):
+        pesanan = self._by_id.pop(id_pesanan, None)
+        if pesanan is None:
+            return None
+        self._by_meja.get(pesanan.nomor_meja, {}).pop(id_pesanan, None)
+        self._by_status.get(pesanan.status, {}).pop(id_pesanan, None)
+        return pesanan
+
+    def ubah_status(self, pesanan, status):
+        self._by_status.get(pesanan.status, {}).pop(pesanan.id_pesanan, None)
+        pesanan.status = status
+        if pesanan.id_pesanan in self._by_id:
+            self._by_status.setdefault(status, {})[pesanan.id_pesanan] = pesanan
+
+    def by_meja(self, nomor_meja):
+        return list(self._by_meja.get(nomor_meja, {}).values())
+
+    def by_status(self, status):
+        return list(self._by_status.get(status, {}).values())
+
+    def iter_status(self, status):
+        # tanpa salinan list; jangan ubah repositori selama iterasi
+        return iter(self._by_status.get(status, {}).values())
+
+    def jumlah_status(self, status):
+        return len(self._by_status.get(status, {}))
+
+# ===============================
+#  Agregat Penjualan (running total + rollup)
+# ===============================
+def _awal_jam(waktu):
+    return waktu.replace(minute=0, second=0, microsecond=0)
+
+def _awal_hari(waktu):
+    return waktu.replace(hour=0, minute=0, second=0, microsecond=0)
+
+class AgregatPenjualan:
+    """
+    Total penjualan berjalan + bucket per jam dan per hari.
+    Diperbarui saat pesanan selesai / dibatalkan, sehingga laporan tidak
+    perlu memindai riwayat pesanan. Setiap pesanan dicatat kontribusinya,
+    jadi pembatalan dan koreksi total selalu bisa dibalik dengan tepat.
+    Laporan rentang waktu memakai bucket untuk jam-jam penuh; jam tepi yang
+    terpotong batas rentang dihitung tepat dari waktu selesai tiap pesanan.
+    """
+    def __init__(self):
+        self.total_penjualan = 0
+        self.jumlah_pesanan = 0
+        self._kontribusi = {}   # id_pesanan -> (total, waktu_selesai)
+        self._isi_jam = {}      # datetime awal jam -> {id_pesanan: (total, waktu_selesai)}, untuk jam tepi
+        self._per_jam = {}      # datetime awal jam -> [total, jumlah]
+        self._per_hari = {}     # datetime awal hari -> [total, jumlah]
+        self._arsip = {}        # datetime awal jam -> [total, jumlah] dari pesanan yang sudah diarsipkan
+        self.arsip = None       # ArsipPesanan; waktu selesai pesanan yang sudah diarsipkan dibaca dari indeksnya
+
+    def _ubah(self, total, jam, tanda):
+        for buckets, kunci in ((self._per_jam, jam), (self._per_hari, _awal_hari(jam))):
+            b = buckets.setdefault(kunci, [0, 0])
+            b[0] += tanda * total
+            b[1] += tanda
+            if b[1] == 0:
+                del buckets[kunci]
+        self.total_penjualan += tanda * total
+        self.jumlah_pesanan += tanda
+
+    def catat(self, pesanan):
+        # aman dipanggil ulang: kontribusi lama diganti (mis. total berubah)
+        self.batalkan(pesanan)
+        waktu = pesanan.waktu_selesai or datetime.now()
+        jam = _awal_jam(waktu)
+        kontribusi = (pesanan.total_harga, waktu)
+        self._kontribusi[pesanan.id_pesanan] = kontribusi
+        self._isi_jam.setdefault(jam, {})[pesanan.id_pesanan] = kontribusi
+        self._ubah(pesanan.total_harga, jam, 1)
+
+    def _lupakan(self, id_pesanan):
+        lama = self._kontribusi.pop(id_pesanan, None)
+        if lama is not None:
+            jam = _awal_jam(lama[1])
+            isi = self._isi_jam[jam]
+            del isi[id_pesanan]
+            if not isi:
+                del self._isi_jam[jam]
+        return lama
+
+    def batalkan(self, pesanan):
+        lama = self._lupakan(pesanan.id_pesanan)
+        if lama is not None:
+            self._ubah(lama[0], _awal_jam(lama[1]), -1)
+
+    def lepas(self, pesanan):
+        # pesanan pindah ke arsip dingin: tetap terhitung, tapi kontribusinya tidak lagi disimpan per id
+        lama = self._lupakan(pesanan.id_pesanan)
+        if lama is not None:
+            b = self._arsip.setdefault(_awal_jam(lama[1]), [0, 0])
+            b[0] += lama[0]
+            b[1] += 1
+
+    def tambah_arsip(self, jam, total, jumlah):
+        # bucket arsip dari snapshot (pesanannya sendiri tidak dimuat)
+        for buckets, kunci in ((self._per_jam, jam), (self._per_hari, _awal_hari(jam)), (self._arsip, jam)):
+            b = buckets.setdefault(kunci, [0, 0])
+            b[0] += total
+            b[1] += jumlah
+        self.total_penjualan += total
+        self.jumlah_pesanan += jumlah
+
+    def per_jam_arsip(self):
+        return sorted((k, b[0], b[1]) for k, b in self._arsip.items())
+
+    def _jumlahkan(self, buckets, langkah, mulai, sampai):
+        # jalan per bucket atau per kunci yang ada, mana yang lebih sedikit
+        total = jumlah = 0
+        n_langkah = (sampai - mulai) // langkah
+        if n_langkah <= len(buckets):
+            t = mulai
+            while t < sampai:
+                b = buckets.get(t)
+                if b:
+                    total += b[0]
+                    jumlah += b[1]
+                t += langkah
+        else:
+            for kunci, b in buckets.items():
+                if mulai <= kunci < sampai:
+                    total += b[0]
+                    jumlah += b[1]
+        return total, jumlah
+
+    def _tepat(self, mulai, sampai):
+        # [mulai, sampai) di dalam satu jam: dihitung per pesanan, bukan dari bucket
+        jam = _awal_jam(mulai)
+        total = jumlah = 0
+        for t, waktu in self._isi_jam.get(jam, {}).values():
+            if mulai <= waktu < sampai:
+                total += t
+                jumlah += 1
+        if self.arsip is not None and jam in self._arsip:
+            t, n = self._tepat_arsip(mulai, sampai)
+            total += t
+            jumlah += n
+        return total, jumlah
+
+    def _tepat_arsip(self, mulai, sampai):
+        # indeks arsip menyimpan waktu per detik; nota di detik batas dibaca untuk waktu lengkapnya
+        a, b = int(mulai.timestamp()), int(sampai.timestamp())
+        awal = self.arsip.cari_waktu(a)
+        total = jumlah = 0
+        for i, (_, waktu, _, t) in enumerate(self.arsip.rentang(awal, self.arsip.cari_waktu(b + 1)), awal):
+            if waktu in (a, b) and not mulai <= datetime.fromisoformat(self.arsip.baca(i)["waktu_selesai"]) < sampai:
+                continue
+            total += t
+            jumlah += 1
+        return total, jumlah
+
+    def rentang(self, mulai=None, sampai=None):
+        """Total & jumlah pesanan selesai dalam [mulai, sampai), tepat walau batasnya tidak pas di awal jam."""
+        if mulai is None and sampai is None:
+            return self.total_penjualan, self.jumlah_pesanan
+        if not self._per_jam:
+            return 0, 0
+        mulai = mulai or min(self._per_jam)
+        sampai = sampai or max(self._per_jam) + timedelta(hours=1)
+        if sampai <= mulai:
+            return 0, 0
+        # jam penuh di tengah dari bucket; sisa jam yang terpotong di kedua tepi dihitung per pesanan
+        jam_awal = _awal_jam(mulai)
+        if jam_awal < mulai:
+            jam_awal += timedelta(hours=1)
+        jam_akhir = _awal_jam(sampai)
+        if jam_awal > jam_akhir:
+            return self._tepat(mulai, sampai)
+        hasil = [self._jam_penuh(jam_awal, jam_akhir)]
+        if mulai < jam_awal:
+            hasil.append(self._tepat(mulai, jam_awal))
+        if jam_akhir < sampai:
+            hasil.append(self._tepat(jam_akhir, sampai))
+        return sum(h[0] for h in hasil), sum(h[1] for h in hasil)
+
+    def _jam_penuh(self, mulai, sampai):
+        # mulai & sampai di awal jam; tepi pakai bucket jam, hari-hari penuh di tengah pakai bucket hari
+        if sampai <= mulai:
+            return 0, 0
+        hari_awal = _awal_hari(mulai)
+        if hari_awal < mulai:
+            hari_awal += timedelta(days=1)
+        hari_akhir = _awal_hari(sampai)
+        if hari_awal >= hari_akhir:
+            return self._jumlahkan(self._per_jam, timedelta(hours=1), mulai, sampai)
+        hasil = (
+            self._jumlahkan(self._per_jam, timedelta(hours=1), mulai, hari_awal),
+            self._jumlahkan(self._per_hari, timedelta(days=1), hari_awal, hari_akhir),
+            self._jumlahkan(self._per_jam, timedelta(hours=1), hari_akhir, sampai),
+        )
+        return sum(h[0] for h in hasil), sum(h[1] for h in hasil)
+
+    def per_jam(self):
+        return sorted((k, b[0], b[1]) for k, b in self._per_jam.items())
+
+    def per_hari(self):
+        return sorted((k, b[0], b[1]) for k, b in self._per_hari.items())
+
+# ===============================
+#  Antrian Dapur (queue engine)
+# ===============================
+class AntrianDapur:
+    """
+    Antrian FIFO berbasis deque + indeks handle per id pesanan.
+    enqueue/dequeue O(1), hapus & prioritaskan berdasarkan id juga O(1)
+    (entri lama hanya ditandai mati, dibuang saat dequeue / kompaksi).
+    """
+    def __init__(self):
+        self._antrian = deque()   # entri: [pesanan, hidup]
+        self._handle = {}         # id_pesanan -> entri
+        self._mati = 0
+
+    def __len__(self):
+        return len(self._handle)
+
+    def __bool__(self):
+        return bool(self._handle)
+
+    def __iter__(self):
+        for entri in self._antrian:
+            if entri[1]:
+                yield entri[0]
+
+    def __contains__(self, pesanan):
+        return pesanan.id_pesanan in self._handle
+
+    def enqueue(self, pesanan):
+        if pesanan.id_pesanan in self._handle:
+            return False
+        entri = [pesanan, True]
+        self._handle[pesanan.id_pesanan] = entri
+        self._antrian.append(entri)
+        return True
+
+    def dequeue(self):
+        while self._antrian:
+            pesanan, hidup = self._antrian.popleft()
+            if hidup:
+                del self._handle[pesanan.id_pesanan]
+                return pesanan
+            self._mati -= 1
+        return None
+
+    def lihat_depan(self):
+        for pesanan in self:
+            return pesanan
+        return None
+
+    def hapus(self, id_pesanan):
+        # batalkan tiket berdasarkan id, O(1)
+        entri = self._handle.pop(id_pesanan, None)
+        if entri is None:
+            return None
+        entri[1] = False
+        self._mati += 1
+        self._kompaksi()
+        return entri[0]
+
+    def prioritaskan(self, id_pesanan):
+        # pindahkan tiket ke depan antrian, O(1)
+        pesanan = self.hapus(id_pesanan)
+        if pesanan is None:
+            return False
+        entri = [pesanan, True]
+        self._handle[id_pesanan] = entri
+        self._antrian.appendleft(entri)
+        return True
+
+    def _kompaksi(self):
+        # buang entri mati kalau sudah lebih banyak dari entri hidup
+        if self._mati > 32 and self._mati > len(self._handle):
+            self._antrian = deque(e for e in self._antrian if e[1])
+            self._mati = 0
 
 # ===============================
 #  Manajer Restoran (data & logika)
 # ===============================
 class ManajerRestoran:
-    def __init__(self):
+    def __init__(self, penyimpanan=None):
         self.menu_items = []
+        self.indeks_menu = IndeksMenu()   # id, kategori, dan pencarian nama
         self.meja = []
-        self.pesanan = []
+        self.alokasi_meja = AlokasiMeja()   # meja kosong per kapasitas (penempatan otomatis)
+        self.pesanan = RepositoriPesanan()
 
         # Tambahan: struktur data Stack & Queue
-        self.riwayat_aksi = []    # STACK (list, push/pop dari akhir)
-        self.antrian_pesanan = [] # QUEUE (list, enqueue di akhir, dequeue di index 0)
-
-        self.load_sample_data()
+        self.penjualan = AgregatPenjualan()  # total berjalan + rollup per jam/hari
+        self.riwayat_aksi = RiwayatAksi()  # STACK (ring buffer objek Aksi + redo)
+        self.antrian_pesanan = AntrianDapur() # QUEUE (deque + indeks handle per id pesanan)
+
+        # pendengar perubahan: fungsi(jenis, objek), jenis salah satu dari
+        # "meja" (Meja), "antrian" / "pesanan" / "nota" (Pesanan), "stok" / "menu" (MenuItem)
+        self._pendengar = []
+
+        # persistensi: jurnal event domain + snapshot (default: hanya di memori)
+        self.penyimpanan = penyimpanan or Penyimpanan()
+        # baca-saja (ekspor, analitik, laporan cabang): pulihkan state tanpa menulis apa pun ke folder data
+        self.baca_saja = getattr(self.penyimpanan, "baca_saja", False)
+        self._sinkron_state = getattr(self.penyimpanan, "perlu_state", False) and not self.baca_saja
+        # arsip dingin nota lama (None = semua pesanan tetap di memori, mis. tanpa penyimpanan / SQLite)
+        self.arsip = self.penyimpanan.buka_arsip()
+        self.penjualan.arsip = self.arsip
+        self.batas_nota_panas = BATAS_NOTA_PANAS
+        self._memulihkan = False
+        self._waktu_paksa = None
+        self._event_sejak_snapshot = 0
+
+        snapshot, events = self.penyimpanan.pulihkan()
+        if snapshot:
+            self._dari_snapshot(snapshot)
+        else:
+            if self.arsip is not None:
+                self.arsip.potong(0)
+            self.load_sample_data()
+        self._replay(events)
+        if penyimpanan is not None and not self.baca_saja and (not snapshot or events):
+            self.buat_snapshot()
 
     def load_sample_data(self):
         # Meja 1-10
         for i in range(1, 11):
             kapasitas = 2 if i <= 5 else 4
-            self.meja.append(Meja(i, kapasitas))
+            self.tambah_meja(Meja(i, kapasitas))
 
         # Menu
-        self.menu_items.extend([
+        for item in [
             Makanan(1, "Ayam Balap", 15000, 15, 2),
             Makanan(2, "Ayam Bali", 15000, 10, 1),
             Makanan(3, "Mie Dok Dok", 18000, 8, 0),
             Minuman(101, "Es Teh Manis", 5000, 20),
             Minuman(102, "Jus Jeruk", 12000, 15),
             Minuman(103, "Kopi Latte", 18000, 12, "large", False)
-        ])
-
-    def buat_pesanan(self, nomor_meja):
-        id_pesanan = len(self.pesanan) + 1
-        pesanan_baru = Pesanan(id_pesanan, nomor_meja)
-        self.pesanan.append(pesanan_baru)
-        meja = self.meja[nomor_meja - 1]
-        meja.status = "terisi"
-        meja.pesanan = pesanan_baru
+        ]:
+            self.tambah_menu(item)
+
+    def tambah_meja(self, meja):
+        self.meja.append(meja)
+        self.alokasi_meja.daftar(meja)
+
+    def tambah_menu(self, item):
+        self.menu_items.append(item)
+        self.indeks_menu.tambah(item)
+
+    def tambah_menu_banyak(self, items):
+        self.menu_items.extend(items)
+        self.indeks_menu.tambah_banyak(items)
+
+    def perbarui_katalog(self, data):
+        """
+        Upsert katalog dari list dict (format MenuItem.ke_dict): id baru
+        ditambahkan, id lama hanya field yang berbeda yang diubah di tempat
+        (pesanan yang merujuk item tetap valid). Satu event jurnal per panggilan.
+        Kembalikan (jumlah_baru, jumlah_berubah).
+        """
+        baru, berubah = [], []
+        with self._waktu_aksi():
+            for d in data:
+                item = self.get_menu(d["id"])
+                if item is None:
+                    baru.append(menu_dari_dict(d))
+                elif self._ubah_menu(item, d):
+                    berubah.append(item)
+            self.tambah_menu_banyak(baru)
+            if berubah:
+                cache_teks.bersihkan()   # nama menu ikut tercetak di teks pesanan/nota yang sudah dirender
+            if baru or berubah:
+                self._catat("katalog", menu=[item.ke_dict() for item in baru + berubah])
+        for item in baru + berubah:
+            self._beritahu("menu", item)
+        return len(baru), len(berubah)
+
+    def _ubah_menu(self, item, d):
+        ubah = {k: d[k] for k in MENU_FIELD if k in d and hasattr(item, k) and getattr(item, k) != d[k]}
+        if not ubah:
+            return False
+        terindeks = "nama" in ubah or "kategori" in ubah
+        if terindeks:
+            self.indeks_menu.hapus(item.id)
+        with kunci_stok(item):
+            for k, v in ubah.items():
+                setattr(item, k, v)
+        if terindeks:
+            self.indeks_menu.tambah(item)
+        return True
+
+    def get_menu(self, id_menu):
+        return self.indeks_menu.get(id_menu)
+
+    def cari_menu(self, teks, batas=50):
+        return self.indeks_menu.cari(teks, batas)
+
+    def buat_pesanan(self, nomor_meja, meja_gabungan=()):
+        id_pesanan = self.pesanan.alokasi_id()
+        pesanan_baru = Pesanan(id_pesanan, nomor_meja, self.sekarang(), meja_gabungan)
+        self.pesanan.tambah(pesanan_baru)
+        for meja in self.meja_pesanan(pesanan_baru):
+            self.set_meja(meja, "terisi", pesanan_baru)
+        self._beritahu("pesanan", pesanan_baru)
         return pesanan_baru
 
+    def meja_pesanan(self, pesanan):
+        return [self.meja[nomor - 1] for nomor in pesanan.semua_meja]
+
+    def cari_meja(self, jumlah_orang):
+        """Meja kosong terkecil yang cukup, atau meja bersebelahan yang digabung (list Meja); None jika penuh."""
+        return self.alokasi_meja.cari(jumlah_orang)
+
+    def _lepas_meja(self, pesanan):
+        for meja in self.meja_pesanan(pesanan):
+            if meja.pesanan == pesanan:
+                self.set_meja(meja, "kosong", None)
+
+    # ------------------
+    # Notifikasi perubahan
+    # ------------------
+    def tambah_pendengar(self, fungsi):
+        self._pendengar.append(fungsi)
+
+    def hapus_pendengar(self, fungsi):
+        if fungsi in self._pendengar:
+            self._pendengar.remove(fungsi)
+
+    def _beritahu(self, jenis, objek=None):
+        if self._sinkron_state and not self._memulihkan:
+            self._sinkron_penyimpanan(jenis, objek)
+        for fungsi in self._pendengar:
+            fungsi(jenis, objek)
+
+    def _sinkron_penyimpanan(self, jenis, objek):
+        # backend yang menyimpan state terkini (mis. SQLite) ikut diperbarui per baris
+        if jenis == "meja":
+            self.penyimpanan.perbarui("meja", [objek.nomor, objek.kapasitas, objek.status,
+                                               objek.pesanan.id_pesanan if objek.pesanan else None])
+        elif jenis == "stok":
+            self.penyimpanan.perbarui("stok", [objek.id, objek.stok])
+        elif jenis == "menu":
+            self.penyimpanan.perbarui("menu", objek.ke_dict())
+        elif jenis in ("pesanan", "nota"):
+            if objek in self.pesanan:
+                self.penyimpanan.perbarui("pesanan", objek.ke_dict())
+            else:
+                self.penyimpanan.perbarui("hapus_pesanan", [objek.id_pesanan])
+
+    def set_meja(self, meja, status, pesanan):
+        # satu-satunya jalur perubahan meja, supaya tampilan tahu meja mana yang berubah
+        if meja.status == status and meja.pesanan is pesanan:
+            return
+        meja.status = status
+        meja.pesanan = pesanan
+        self.alokasi_meja.perbarui(meja)
+        self._beritahu("meja", meja)
+
+    def get_pesanan(self, id_pesanan):
+        return self.pesanan.get(id_pesanan)
+
+    def get_pesanan_selesai(self):
+        # hanya set panas; nota yang sudah diarsipkan lewat iter_nota / get_nota
+        return self.pesanan.by_status("selesai")
+
+    def get_nota(self, id_pesanan):
+        """Pesanan dari set panas, atau salinan baca-saja dari arsip dingin."""
+        pesanan = self.pesanan.get(id_pesanan)
+        if pesanan is None and self.arsip is not None:
+            d = self.arsip.ambil(id_pesanan)
+            if d is not None:
+                pesanan = Pesanan.dari_dict(d, self.get_menu)
+        return pesanan
+
+    def _nota_panas(self):
+        return sorted(self.pesanan.iter_status("selesai"), key=lambda p: (p.waktu_selesai, p.id_pesanan))
+
+    def jumlah_nota(self):
+        if hasattr(self.penyimpanan, "daftar_nota"):
+            return self.penjualan.jumlah_pesanan
+        return (len(self.arsip) if self.arsip is not None else 0) + self.pesanan.jumlah_status("selesai")
+
+    def daftar_nota(self, offset=0, batas=None):
+        """[(id, label meja, total, waktu_selesai)] pesanan selesai urut waktu selesai, mulai dari nota ke-offset."""
+        if hasattr(self.penyimpanan, "daftar_nota"):
+            return [(id_p, meja, total, datetime.fromisoformat(waktu) if waktu else None)
+                    for id_p, meja, total, waktu in self.penyimpanan.daftar_nota(offset, batas)]
+        n_arsip = len(self.arsip) if self.arsip is not None else 0
+        akhir = self.jumlah_nota() if batas is None else offset + batas
+        hasil = []
+        if offset < n_arsip:
+            # hanya rekaman indeks arsip di rentang ini yang dibaca, isi nota tidak
+            hasil = [(id_p, meja, total, datetime.fromtimestamp(waktu))
+                     for id_p, waktu, meja, total in self.arsip.rentang(offset, min(akhir, n_arsip))]
+        if akhir > n_arsip:
+            hasil += [(p.id_pesanan, p.label_meja, p.total_harga, p.waktu_selesai)
+                      for p in self._nota_panas()[max(offset - n_arsip, 0):akhir - n_arsip]]
+        return hasil
+
+    def jumlah_halaman_nota(self, ukuran=100):
+        return max(1, -(-self.jumlah_nota() // ukuran))
+
+    def halaman_nota(self, nomor, ukuran=100):
+        # halaman 1 = nota terbaru; hanya nota di halaman itu yang dibaca
+        akhir = max(self.jumlah_nota() - (nomor - 1) * ukuran, 0)
+        awal = max(akhir - ukuran, 0)
+        return self.daftar_nota(awal, akhir - awal)[::-1]
+
+    def iter_nota(self, mulai=None, sampai=None):
+        """Pesanan selesai dengan mulai <= waktu_selesai < sampai (batas None = terbuka), urut waktu selesai."""
+        if self.arsip is not None:
+            # arsip urut waktu: rentang dicari dengan bisect, nota dibaca satu per satu (memori konstan)
+            awal = self.arsip.cari_waktu(int(mulai.timestamp())) if mulai else 0
+            akhir = self.arsip.cari_waktu(int(sampai.timestamp()) + 1) if sampai else len(self.arsip)
+            for i in range(awal, akhir):
+                p = Pesanan.dari_dict(self.arsip.baca(i), self.get_menu)
+                if (mulai is None or p.waktu_selesai >= mulai) and (sampai is None or p.waktu_selesai < sampai):
+                    yield p
+        for p in self._nota_panas():
+            waktu = p.waktu_selesai
+            if mulai is not None and (waktu is None or waktu < mulai):
+                continue
+            if sampai is not None and (waktu is None or waktu >= sampai):
+                continue
+            yield p
+
+    def _arsipkan_nota(self):
+        # nota tertua pindah ke arsip dingin per batch, supaya set panas (memori, snapshot, scan) tetap kecil.
+        # Dipanggil di titik yang sama saat operasi normal dan replay jurnal, jadi hasilnya deterministik.
+        if (self.arsip is None or self.baca_saja
+                or self.pesanan.jumlah_status("selesai") <= self.batas_nota_panas + BATCH_ARSIP_NOTA):
+            return
+        # pesanan yang masih dirujuk undo/redo tetap panas; arsip berhenti di situ supaya tetap urut waktu
+        terikat = set()
+        for a in list(self.riwayat_aksi) + self.riwayat_aksi.daftar_redo():
+            p = getattr(a, "pesanan", None)
+            if p is not None:
+                terikat.add(p.id_pesanan)
+        nota = self._nota_panas()
+        pindah = []
+        for p in nota[:len(nota) - self.batas_nota_panas]:
+            if p.id_pesanan in terikat:
+                break
+            pindah.append(p)
+        if not pindah:
+            return
+        self.arsip.tambah([(p.id_pesanan, int(p.waktu_selesai.timestamp()), p.nomor_meja, p.total_harga, p.ke_dict())
+                           for p in pindah])
+        for p in pindah:
+            self.pesanan.hapus(p.id_pesanan)
+            self.penjualan.lepas(p)
+
+    def selesaikan_pesanan(self, pesanan):
+        self.pesanan.ubah_status(pesanan, "selesai")
+        pesanan.waktu_selesai = self.sekarang()
+        pesanan.komit_stok()
+        self.penjualan.catat(pesanan)
+        # kosongkan meja (termasuk meja gabungan) setelah pesanan selesai
+        self._lepas_meja(pesanan)
+        self._beritahu("pesanan", pesanan)
+        self._beritahu("nota", pesanan)
+
+    def batal_selesaikan_pesanan(self, pesanan):
+        # kebalikan selesaikan_pesanan: status aktif lagi, agregat dikurangi
+        self.penjualan.batalkan(pesanan)
+        pesanan.batal_komit_stok()
+        self.pesanan.ubah_status(pesanan, "aktif")
+        pesanan.waktu_selesai = None
+        for meja in self.meja_pesanan(pesanan):
+            self.set_meja(meja, "terisi", pesanan)
+        self._beritahu("pesanan", pesanan)
+        self._beritahu("nota", pesanan)
+
+    def pesanan_berubah(self, pesanan, menu_berubah=()):
+        # dipanggil setelah item pesanan berubah; koreksi agregat jika sudah selesai
+        if pesanan.status == "selesai":
+            self.penjualan.catat(pesanan)
+            self._beritahu("nota", pesanan)
+        self._beritahu("pesanan", pesanan)
+        for menu_item in menu_berubah:
+            self._beritahu("stok", menu_item)
+
+    def hapus_pesanan(self, id_pesanan):
+        pesanan = self.pesanan.hapus(id_pesanan)
+        if pesanan is None:
+            return None
+        self.penjualan.batalkan(pesanan)
+        self.batalkan_antrian(id_pesanan)
+        self._lepas_meja(pesanan)
+        self._beritahu("pesanan", pesanan)
+        if pesanan.status == "selesai":
+            self._beritahu("nota", pesanan)
+        return pesanan
+
     def get_menu_by_kategori(self, kategori):
-        return [m for m in self.menu_items if m.kategori == kategori]
+        return self.indeks_menu.by_kategori(kategori)
 
-    def get_laporan_penjualan(self):
-        total_penjualan = sum(p.total_harga for p in self.pesanan if p.status == "selesai")
-        jumlah = sum(1 for p in self.pesanan if p.status == "selesai")
+    def get_laporan_penjualan(self, mulai=None, sampai=None):
+        # total keseluruhan dari agregat berjalan (O(1)); rentang waktu dijawab
+        # query SQL berindeks jika backend mendukung, selain itu dari bucket per jam
+        if (mulai or sampai) and hasattr(self.penyimpanan, "laporan_penjualan"):
+            total_penjualan, jumlah = self.penyimpanan.laporan_penjualan(mulai, sampai)
+        else:
+            total_penjualan, jumlah = self.penjualan.rentang(mulai, sampai)
         return {"total_penjualan": total_penjualan, "jumlah_pesanan": jumlah, "rata_rata": (total_penjualan / jumlah) if jumlah else 0}
 
     # ------------------
     # STACK (riwayat aksi)
     # ------------------
     def push_aksi(self, aksi):
-        # aksi: string yang menjelaskan aksi, misal "Tambah Ayam Balap x2" atau "Buat pesanan #3"
-        self.riwayat_aksi.append(aksi)
+        # aksi: objek Aksi (AksiBuatPesanan, AksiTambahItem, AksiTambahBanyak, AksiProsesPesanan)
+        self.riwayat_aksi.push(aksi)
 
     def pop_aksi(self):
-        if len(self.riwayat_aksi) > 0:
-            return self.riwayat_aksi.pop()
-        return None
+        return self.riwayat_aksi.pop()
+
+    def undo_aksi(self):
+        """Undo aksi terakhir. Kembalikan (aksi, berhasil, pesan) atau None jika kosong."""
+        with self._waktu_aksi():
+            aksi = self.pop_aksi()
+            if aksi is None:
+                return None
+            ok, pesan = aksi.undo(self)
+            if ok:
+                self.riwayat_aksi.push_redo(aksi)
+            # undo yang gagal tetap membuang aksi dari stack, jadi tetap dicatat
+            self._catat("undo")
+        return aksi, ok, pesan
+
+    def redo_aksi(self):
+        with self._waktu_aksi():
+            aksi = self.riwayat_aksi.pop_redo()
+            if aksi is None:
+                return None
+            ok, pesan = aksi.redo(self)
+            if ok:
+                # stack redo sisanya tetap dipertahankan
+                self.riwayat_aksi.push(aksi, hapus_redo=False)
+            self._catat("redo")
+        return aksi, ok, pesan
+
+    # ------------------
+    # Aksi tingkat tinggi (tercatat di riwayat & jurnal)
+    # ------------------
+    def buat_pesanan_baru(self, nomor_meja, meja_gabungan=()):
+        with self._waktu_aksi():
+            pesanan = self.buat_pesanan(nomor_meja, meja_gabungan)
+            # masukkan ke antrian (queue) untuk diproses dapur
+            self.enqueue_pesanan(pesanan)
+            self.push_aksi(AksiBuatPesanan(pesanan))
+            if pesanan.meja_gabungan:
+                self._catat("buat", id=pesanan.id_pesanan, meja=nomor_meja, gabungan=list(pesanan.meja_gabungan))
+            else:
+                self._catat("buat", id=pesanan.id_pesanan, meja=nomor_meja)
+        return pesanan
+
+    def buat_pesanan_rombongan(self, jumlah_orang):
+        """Pilih meja otomatis (best-fit) lalu buat pesanan. None jika tidak ada meja yang cukup."""
+        meja = self.cari_meja(jumlah_orang)
+        if meja is None:
+            return None
+        return self.buat_pesanan_baru(meja[0].nomor, [m.nomor for m in meja[1:]])
+
+    def tambah_item_pesanan(self, pesanan, menu_item, jumlah, catatan=""):
+        with self._waktu_aksi():
+            if not pesanan.tambah_item(menu_item, jumlah, catatan):
+                return False
+            self.push_aksi(AksiTambahItem(pesanan, len(pesanan.items) - 1, menu_item, jumlah, catatan))
+            self.pesanan_berubah(pesanan, [menu_item])
+            self._catat("tambah", id=pesanan.id_pesanan, menu=menu_item.id, jumlah=jumlah, catatan=catatan)
+        return True
+
+    def tambah_items_pesanan(self, pesanan, baris):
+        """Tambah banyak baris dalam satu transaksi: satu entri undo, satu event jurnal."""
+        with self._waktu_aksi():
+            index = len(pesanan.items)
+            baris = [(m, j, c or "") for m, j, c in baris]
+            if not pesanan.tambah_items(baris):
+                return False
+            self.push_aksi(AksiTambahBanyak(pesanan, index, baris))
+            self.pesanan_berubah(pesanan, list(dict.fromkeys(m for m, _, _ in baris)))
+            self._catat("tambah_banyak", id=pesanan.id_pesanan, baris=[[m.id, j, c] for m, j, c in baris])
+        return True
+
+    def proses_pesanan_dequeue(self):
+        with self._waktu_aksi():
+            pesanan = self.dequeue_pesanan()
+            if pesanan is None:
+                return None
+            self.selesaikan_pesanan(pesanan)
+            self.push_aksi(AksiProsesPesanan(pesanan))
+            self._arsipkan_nota()   # sebelum _catat: snapshot yang mungkin dibuat di sana sudah mencakup arsip ini
+            self._catat("proses", id=pesanan.id_pesanan)
+        return pesanan
+
+    def proses_pesanan(self, id_pesanan):
+        """Selesaikan pesanan tertentu dari antrian, tidak harus yang terdepan (mis. saat dapur selesai memasak)."""
+        with self._waktu_aksi():
+            pesanan = self.batalkan_antrian(id_pesanan)
+            if pesanan is None:
+                return None
+            self.selesaikan_pesanan(pesanan)
+            self.push_aksi(AksiProsesPesanan(pesanan))
+            self._arsipkan_nota()
+            self._catat("proses", id=pesanan.id_pesanan)
+        return pesanan
+
+    # ------------------
+    # JURNAL & SNAPSHOT (pemulihan setelah crash)
+    # ------------------
+    def sekarang(self):
+        # saat replay jurnal, waktu diambil dari event supaya hasilnya identik
+        return self._waktu_paksa or datetime.now()
+
+    def atur_waktu(self, waktu):
+        """Jam tetap untuk aksi berikutnya (simulasi, benchmark, tes); None = kembali ke jam dinding."""
+        self._waktu_paksa = waktu
+
+    @contextmanager
+    def _waktu_aksi(self):
+        # satu aksi tercatat = satu cap waktu, dipakai oleh aksi dan event jurnalnya
+        if self._memulihkan or self._waktu_paksa is not None:
+            yield
+            return
+        self._waktu_paksa = datetime.now()
+        try:
+            yield
+        finally:
+            self._waktu_paksa = None
+
+    def _catat(self, tipe, **data):
+        if self._memulihkan or self.baca_saja:
+            return
+        data["tipe"] = tipe
+        data["waktu"] = self.sekarang().isoformat()
+        self.penyimpanan.catat(data)
+        self._event_sejak_snapshot += 1
+        if self.penyimpanan.snapshot_setiap and self._event_sejak_snapshot >= self.penyimpanan.snapshot_setiap:
+            self.buat_snapshot()
+
+    def buat_snapshot(self):
+        self.penyimpanan.simpan_snapshot(self.ke_snapshot())
+        self._event_sejak_snapshot = 0
+
+    def ke_snapshot(self):
+        riwayat = [a.ke_dict() for a in self.riwayat_aksi]
+        redo = [a.ke_dict() for a in self.riwayat_aksi.daftar_redo()]
+        # pesanan yang sudah dihapus tapi masih dirujuk riwayat (mis. undo buat pesanan)
+        lepas = {}
+        for a in list(self.riwayat_aksi) + self.riwayat_aksi.daftar_redo():
+            p = getattr(a, "pesanan", None)
+            if p is not None and p not in self.pesanan:
+                lepas[p.id_pesanan] = p.ke_dict()
+        snap = {
+            "versi": 1,
+            "id_terakhir": self.pesanan._id_terakhir,
+            "menu": [m.ke_dict() for m in self.menu_items],
+            "meja": [[m.nomor, m.kapasitas, m.status, m.pesanan.id_pesanan if m.pesanan else None] for m in self.meja],
+            "pesanan": [p.ke_dict() for p in self.pesanan],
+            "pesanan_lepas": list(lepas.values()),
+            "antrian": [p.id_pesanan for p in self.antrian_pesanan],
+            "kapasitas_riwayat": self.riwayat_aksi.kapasitas,
+            "riwayat": riwayat,
+            "redo": redo,
+        }
+        if self.arsip is not None:
+            # panjang arsip yang disahkan snapshot ini + total nota di dalamnya untuk agregat penjualan
+            snap["arsip"] = {"jumlah": len(self.arsip),
+                             "per_jam": [[jam.isoformat(), total, n] for jam, total, n in self.penjualan.per_jam_arsip()]}
+        return snap
+
+    def _dari_snapshot(self, snap):
+        self.tambah_menu_banyak([menu_dari_dict(d) for d in snap["menu"]])
+        if self.arsip is not None:
+            # arsip setelah snapshot belum sah: dibuang, replay jurnal mengarsipkannya lagi
+            arsip = snap.get("arsip", {})
+            self.arsip.potong(arsip.get("jumlah", 0))
+            for jam, total, n in arsip.get("per_jam", ()):
+                self.penjualan.tambah_arsip(datetime.fromisoformat(jam), total, n)
+        pesanan_by_id = {}
+        for d in snap["pesanan"]:
+            p = Pesanan.dari_dict(d, self.get_menu)
+            self.pesanan.tambah(p)
+            pesanan_by_id[p.id_pesanan] = p
+            if p.status == "selesai":
+                self.penjualan.catat(p)
+            else:
+                # reservasi tidak disimpan di snapshot; dihitung ulang dari pesanan aktif
+                p.batal_komit_stok()
+        for d in snap["pesanan_lepas"]:
+            pesanan_by_id[d["id"]] = Pesanan.dari_dict(d, self.get_menu)
+        self.pesanan._id_terakhir = snap["id_terakhir"]
+        for nomor, kapasitas, status, id_p in snap["meja"]:
+            meja = Meja(nomor, kapasitas)
+            meja.status = status
+            meja.pesanan = pesanan_by_id.get(id_p)
+            self.tambah_meja(meja)
+        for id_p in snap["antrian"]:
+            self.antrian_pesanan.enqueue(pesanan_by_id[id_p])
+        self.riwayat_aksi = RiwayatAksi(snap["kapasitas_riwayat"])
+        for d in snap["riwayat"]:
+            self.riwayat_aksi.push(aksi_dari_dict(d, pesanan_by_id, self.get_menu), hapus_redo=False)
+        for d in snap["redo"]:
+            self.riwayat_aksi.push_redo(aksi_dari_dict(d, pesanan_by_id, self.get_menu))
+
+    def _replay(self, events):
+        # terapkan ulang event jurnal lewat method yang sama dengan operasi normal
+        self._memulihkan = True
+        try:
+            for ev in events:
+                self._waktu_paksa = datetime.fromisoformat(ev["waktu"])
+                self._terapkan_event(ev)
+        finally:
+            self._waktu_paksa = None
+            self._memulihkan = False
+
+    def _terapkan_event(self, ev):
+        tipe = ev["tipe"]
+        if tipe == "buat":
+            pesanan = self.buat_pesanan_baru(ev["meja"], ev.get("gabungan", ()))
+            if pesanan.id_pesanan != ev["id"]:
+                raise ValueError(f"Jurnal tidak konsisten: pesanan #{ev['id']} menjadi #{pesanan.id_pesanan}")
+        elif tipe == "tambah":
+            self.tambah_item_pesanan(self.get_pesanan(ev["id"]), self.get_menu(ev["menu"]), ev["jumlah"], ev["catatan"])
+        elif tipe == "tambah_banyak":
+            self.tambah_items_pesanan(self.get_pesanan(ev["id"]), [(self.get_menu(m), j, c) for m, j, c in ev["baris"]])
+        elif tipe == "proses":
+            # id selalu tercatat, jadi pesanan yang diselesaikan dapur di luar urutan antrian ikut terulang benar
+            self.proses_pesanan(ev["id"])
+        elif tipe == "undo":
+            self.undo_aksi()
+        elif tipe == "redo":
+            self.redo_aksi()
+        elif tipe == "prioritas":
+            self.prioritaskan_pesanan(ev["id"])
+        elif tipe == "katalog":
+            self.perbarui_katalog(ev["menu"])
+        else:
+            raise ValueError(f"Tipe event jurnal tidak dikenal: {tipe}")
+
+    def tutup(self):
+        self.penyimpanan.tutup()
 
     # ------------------
     # QUEUE (antrian pesanan untuk dapur)
     # ------------------
     def enqueue_pesanan(self, pesanan):
-        self.antrian_pesanan.append(pesanan)
+        if self.antrian_pesanan.enqueue(pesanan):
+            self._beritahu("antrian", pesanan)
 
     def dequeue_pesanan(self):
-        if len(self.antrian_pesanan) > 0:
-            return self.antrian_pesanan.pop(0)
-        return None
+        pesanan = self.antrian_pesanan.dequeue()
+        if pesanan is not None:
+            self._beritahu("antrian", pesanan)
+        return pesanan
+
+    def batalkan_antrian(self, id_pesanan):
+        pesanan = self.antrian_pesanan.hapus(id_pesanan)
+        if pesanan is not None:
+            self._beritahu("antrian", pesanan)
+        return pesanan
+
+    def prioritaskan_pesanan(self, id_pesanan):
+        ok = self.antrian_pesanan.prioritaskan(id_pesanan)
+        if ok:
+            self._beritahu("antrian", self.antrian_pesanan.lihat_depan())
+            self._catat("prioritas", id=id_pesanan)
+        return ok
+
+# ===============================
+#  Penjadwal refresh tampilan (dirty flag)
+# ===============================
+class PenjadwalTampilan:
+    """
+    Kumpulkan tampilan yang "kotor" dan gambar ulang semuanya sekali
+    dalam satu callback root.after_idle. Rentetan aksi (mis. pesanan massal)
+    hanya memicu satu kali redraw per tampilan.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._tampilan = {}    # nama -> fungsi redraw (urutan daftar = urutan gambar)
+        self._kotor = set()
+        self._terjadwal = False
+
+    def daftar(self, nama, fungsi):
+        self._tampilan[nama] = fungsi
+
+    def tandai(self, *nama):
+        self._kotor.update(nama)
+        if not self._terjadwal:
+            self._terjadwal = True
+            self.root.after_idle(self._gambar_ulang)
+
+    def _gambar_ulang(self):
+        self._terjadwal = False
+        kotor, self._kotor = self._kotor, set()
+        for nama, fungsi in self._tampilan.items():
+            if nama in kotor:
+                fungsi()
 
 # ===============================
 #  GUI Application
 # ===============================
 class AplikasiRestoran:
-    def __init__(self, root):
+    # method yang diukur saat instrumentasi aktif (--diagnostik)
+    AKSI_GUI = ("buat_pesanan_baru", "buat_pesanan_otomatis", "tambah_item_pesanan", "tambah_ke_draft", "kirim_draft",
+                "kosongkan_draft", "undo_aksi", "redo_aksi", "tampilkan_riwayat", "proses_pesanan_dequeue", "prioritaskan_antrian",
+                "tampilkan_nota", "geser_halaman_nota", "simpan_nota_file", "ekspor_semua_nota", "tampilkan_info_meja",
+                "_filter_menu")
+    TAMPILAN_GUI = ("update_tampilan_pesanan", "refresh_antrian", "render_meja_buttons", "refresh_menu_values",
+                    "refresh_nota")
+
+    def __init__(self, root, penyimpanan=None, instrumentasi=None, dapur=None):
         self.root = root
         self.root.title("Sistem Manajemen Restoran - Berwarna")
         self.root.geometry("1000x700")
         self.root.configure(bg=COLOR_BG)
 
-        self.manajer = ManajerRestoran()
+        self.manajer = None          # diisi setelah jurnal/snapshot selesai dimuat (lihat _data_siap)
         self.pesanan_aktif = None
+        self.penjadwal = PenjadwalTampilan(self.root)
+        self._meja_kotor = set()     # nomor meja yang berubah sejak render terakhir
+        self._menu_kotor = set()     # id menu yang stoknya berubah
+        self.waktu_startup = {}      # tahap -> ms sejak modul dimuat
+        # PenjadwalDapur (opsional): "Proses Pesanan" mengirim ke dapur, pesanan selesai saat semua tiketnya matang
+        self.dapur = dapur
+
+        # dipasang sebelum tombol dan tampilan didaftarkan, supaya semua jalur memanggil versi yang terukur
+        self.instrumentasi = instrumentasi
+        if instrumentasi is not None:
+            instrumentasi.pasang(self, "aksi", self.AKSI_GUI)
+            instrumentasi.pasang(self, "tampilan", self.TAMPILAN_GUI)
+            instrumentasi.pasang(self, "pendengar", ["_on_perubahan"])
+            instrumentasi.pasang(self.penjadwal, "frame", ["_gambar_ulang"])
+            self.watchdog = WatchdogTk(self.root, instrumentasi).mulai()
 
         self.setup_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.tutup)
+        self.root.after_idle(self._catat_startup, "jendela")
+
+        # katalog + riwayat dimuat di thread latar, jendela sudah tampil selama pemulihan berjalan
+        self._hasil_muat = None
+        self._thread_muat = threading.Thread(target=self._muat_manajer, args=(penyimpanan,), daemon=True)
+        self._thread_muat.start()
+        self._cek_muat()
+
+    # ==================== Startup (data di latar, tab malas) ====================
+    def _catat_startup(self, tahap):
+        self.waktu_startup[tahap] = (time.perf_counter() - WAKTU_MULAI) * 1000
+
+    def _muat_manajer(self, penyimpanan):
+        # tanpa akses Tk: hanya membangun model dari snapshot + jurnal
+        try:
+            self._hasil_muat = ManajerRestoran(penyimpanan)
+        except Exception as e:
+            self._hasil_muat = e
+
+    def _cek_muat(self):
+        if self._thread_muat.is_alive():
+            self.root.after(20, self._cek_muat)
+            return
+        if isinstance(self._hasil_muat, Exception):
+            messagebox.showerror("Error", f"Gagal memuat data restoran: {self._hasil_muat}")
+            self.root.destroy()
+            return
+        self._data_siap(self._hasil_muat)
+
+    def _data_siap(self, manajer):
+        self.manajer = manajer
+        if self.instrumentasi is not None:
+            self.instrumentasi.pasang_publik(self.manajer, "manajer")
+        self.manajer.tambah_pendengar(self._on_perubahan)
+        self.pemantau_stok = PemantauStok().ikuti(self.manajer)
+        self.pemantau_stok.tambah_pendengar(self._on_peringatan_stok)
+        self.isi_beranda()
+        # tab yang dipilih selama data dimuat langsung dibangun
+        self._bangun_tab(self.notebook.select())
+        self._flush_berkala()
+        if self.dapur is not None:
+            self._cek_dapur()
+        self._catat_startup("siap")
 
     def setup_gui(self):
         style = ttk.Style()
         style.theme_use('default')
 
+        # bilah peringatan stok (selalu terlihat, di tab mana pun kasir berada)
+        self.label_stok = tk.Label(self.root, text="", anchor='w', bg=COLOR_BG, fg=COLOR_TEXT, padx=10)
+        self.label_stok.pack(side='bottom', fill='x')
+
         notebook = ttk.Notebook(self.root)
         notebook.pack(expand=True, fill='both')
+        self.notebook = notebook
 
+        # isi tab selain Beranda baru dibangun saat tab pertama kali dibuka
+        self._tab_belum_dibangun = {}   # path frame -> (fungsi setup, frame)
         frame_beranda = tk.Frame(notebook, bg=COLOR_BG)
-        frame_pesanan = tk.Frame(notebook, bg=COLOR_BG)
-        frame_menu = tk.Frame(notebook, bg=COLOR_BG)
-        frame_meja = tk.Frame(notebook, bg=COLOR_BG)
-        frame_nota = tk.Frame(notebook, bg=COLOR_BG)
-        frame_antrian = tk.Frame(notebook, bg=COLOR_BG)
-
         notebook.add(frame_beranda, text="🏠 Beranda")
-        notebook.add(frame_pesanan, text="🧾 Pesanan")
-        notebook.add(frame_menu, text="🍽 Menu")
-        notebook.add(frame_meja, text="🪑 Meja")
-        notebook.add(frame_nota, text="🧾 Nota")  # <-- mengganti Laporan menjadi Nota
-        notebook.add(frame_antrian, text="🛎 Antrian")
+        for teks, setup in [("🧾 Pesanan", self.setup_pesanan), ("🍽 Menu", self.setup_menu),
+                            ("🪑 Meja", self.setup_meja),
+                            ("🧾 Nota", self.setup_nota),  # <-- mengganti Laporan menjadi Nota
+                            ("🛎 Antrian", self.setup_antrian)]:
+            frame = tk.Frame(notebook, bg=COLOR_BG)
+            notebook.add(frame, text=teks)
+            self._tab_belum_dibangun[str(frame)] = (setup, frame)
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_berubah)
 
         self.setup_beranda(frame_beranda)
-        self.setup_pesanan(frame_pesanan)
-        self.setup_menu(frame_menu)
-        self.setup_meja(frame_meja)
-        self.setup_nota(frame_nota)
-        self.setup_antrian(frame_antrian)
+
+        if self.instrumentasi is not None:
+            # tab tersembunyi; tampilkan dengan Ctrl+Shift+D
+            self.frame_diagnostik = tk.Frame(notebook, bg=COLOR_BG)
+            notebook.add(self.frame_diagnostik, text="🩺 Diagnostik", state="hidden")
+            self.setup_diagnostik(self.frame_diagnostik)
+            self.root.bind("<Control-Shift-D>", self.tampilkan_diagnostik)
+
+    def _on_tab_berubah(self, event=None):
+        self._bangun_tab(self.notebook.select())
+
+    def _bangun_tab(self, path):
+        if self.manajer is None:
+            return   # dibangun oleh _data_siap
+        tab = self._tab_belum_dibangun.pop(str(path), None)
+        if tab is not None:
+            setup, frame = tab
+            setup(frame)
 
     def setup_beranda(self, frame):
         tk.Label(frame, text=f"Selamat Datang di {nama_restoran}", font=("Arial", 20, "bold"), bg=COLOR_BG, fg=COLOR_HEADER).pack(pady=12)
@@ -256,10 +1923,16 @@ class AplikasiRestoran:
         stats_frame = tk.LabelFrame(frame, text="Statistik Hari Ini", bg=COLOR_FRAME, fg=COLOR_TEXT, padx=10, pady=10)
         stats_frame.pack(fill='x', padx=20, pady=8)
 
-        tk.Label(stats_frame, text=f"Total Meja: {len(self.manajer.meja)}", bg=COLOR_FRAME, fg=COLOR_TEXT).pack(anchor='w')
-        tk.Label(stats_frame, text=f"Total Menu: {len(self.manajer.menu_items)}", bg=COLOR_FRAME, fg=COLOR_TEXT).pack(anchor='w')
+        self.label_total_meja = tk.Label(stats_frame, text="Total Meja: memuat...", bg=COLOR_FRAME, fg=COLOR_TEXT)
+        self.label_total_meja.pack(anchor='w')
+        self.label_total_menu = tk.Label(stats_frame, text="Total Menu: memuat...", bg=COLOR_FRAME, fg=COLOR_TEXT)
+        self.label_total_menu.pack(anchor='w')
         tk.Label(stats_frame, text=f"Rating: {rating_restoran} ⭐", bg=COLOR_FRAME, fg=COLOR_TEXT).pack(anchor='w')
 
+    def isi_beranda(self):
+        self.label_total_meja.config(text=f"Total Meja: {len(self.manajer.meja)}")
+        self.label_total_menu.config(text=f"Total Menu: {len(self.manajer.menu_items)}")
+
     def setup_pesanan(self, frame):
         input_frame = tk.Frame(frame, bg=COLOR_BG)
         input_frame.pack(pady=10, padx=20, anchor='w')
@@ -271,12 +1944,24 @@ class AplikasiRestoran:
         btn_buat = tk.Button(input_frame, text="Buat Pesanan", bg=COLOR_BTN_PRIMARY, fg='white', command=self.buat_pesanan_baru)
         btn_buat.grid(row=0, column=2, padx=8)
 
+        tk.Label(input_frame, text="Jumlah Orang:", bg=COLOR_BG, fg=COLOR_TEXT).grid(row=0, column=3, padx=5)
+        self.entry_orang = tk.Entry(input_frame, width=6)
+        self.entry_orang.grid(row=0, column=4, padx=5)
+
+        btn_otomatis = tk.Button(input_frame, text="Pilih Meja Otomatis", bg=COLOR_BTN_SUCCESS, fg='white', command=self.buat_pesanan_otomatis)
+        btn_otomatis.grid(row=0, column=5, padx=8)
+
         # Pilih menu
         menu_frame = tk.LabelFrame(frame, text="Tambah Item ke Pesanan", bg=COLOR_FRAME, padx=10, pady=10)
         menu_frame.pack(fill='both', padx=20, pady=10)
 
         tk.Label(menu_frame, text="Pilih Menu:", bg=COLOR_FRAME).grid(row=0, column=0, sticky='w')
         self.combo_menu = ttk.Combobox(menu_frame, width=60)
+        self._info_menu = {}         # id menu -> teks baris combobox (cache)
+        self._menu_kotor.clear()     # cache baru dibangun di bawah
+        self._menu_tampil_ids = []   # id menu sesuai urutan values combobox
+        self._teks_cari_menu = ""
+        self.combo_menu.bind('<KeyRelease>', self._filter_menu)
         self.refresh_menu_values()
         self.combo_menu.grid(row=1, column=0, columnspan=3, pady=5, sticky='w')
 
@@ -292,45 +1977,99 @@ class AplikasiRestoran:
         btn_tambah = tk.Button(menu_frame, text="Tambah ke Pesanan", bg=COLOR_BTN_SUCCESS, fg='white', command=self.tambah_item_pesanan)
         btn_tambah.grid(row=4, column=0, pady=8, sticky='w')
 
+        # draft: kumpulkan banyak baris (pesanan rombongan), lalu kirim sekaligus
+        self._draft = []
+        btn_draft = tk.Button(menu_frame, text="Tambah ke Draft", bg=COLOR_BTN_PRIMARY, fg='white', command=self.tambah_ke_draft)
+        btn_draft.grid(row=5, column=0, pady=4, sticky='w')
+        btn_kirim = tk.Button(menu_frame, text="Kirim Draft", bg=COLOR_BTN_SUCCESS, fg='white', command=self.kirim_draft)
+        btn_kirim.grid(row=5, column=1, pady=4, sticky='w')
+        btn_kosongkan = tk.Button(menu_frame, text="Kosongkan Draft", bg=COLOR_BTN_WARNING, fg='black', command=self.kosongkan_draft)
+        btn_kosongkan.grid(row=5, column=2, pady=4, sticky='w')
+        self.label_draft = tk.Label(menu_frame, text="Draft: 0 baris", bg=COLOR_FRAME)
+        self.label_draft.grid(row=6, column=0, columnspan=3, sticky='w')
+
         btn_undo = tk.Button(menu_frame, text="Undo Aksi Terakhir", bg=COLOR_BTN_WARNING, fg='black', command=self.undo_aksi)
         btn_undo.grid(row=4, column=1, pady=8, sticky='w')
 
+        btn_redo = tk.Button(menu_frame, text="Redo", bg=COLOR_BTN_PRIMARY, fg='white', command=self.redo_aksi)
+        btn_redo.grid(row=4, column=2, pady=8, sticky='w')
+
         self.text_pesanan = tk.Text(frame, height=12)
         self.text_pesanan.pack(fill='both', padx=20, pady=10)
 
+        # tampilan didaftarkan saat tab dibangun, lalu hanya digambar ulang bila ditandai kotor
+        self.penjadwal.daftar("pesanan", self.update_tampilan_pesanan)
+        self.penjadwal.daftar("menu", self.refresh_menu_values)
+        self.update_tampilan_pesanan()
+
     def setup_menu(self, frame):
         tk.Label(frame, text="Daftar Menu", font=("Arial", 14, "bold"), bg=COLOR_BG, fg=COLOR_HEADER).pack(pady=8)
-        menu_list = tk.Frame(frame, bg=COLOR_BG)
-        menu_list.pack(fill='both', padx=20)
-
-        for item in self.manajer.menu_items:
-            tk.Label(menu_list, text=item.get_info(), bg=COLOR_BG, fg=COLOR_TEXT).pack(anchor='w', pady=2)
+        # satu Listbox untuk seluruh katalog (bukan satu Label per item)
+        menu_list = tk.Listbox(frame, bg=COLOR_BG, fg=COLOR_TEXT, relief='flat', highlightthickness=0)
+        menu_list.pack(fill='both', expand=True, padx=20)
+        menu_list.insert(tk.END, *[item.get_info() for item in self.manajer.menu_items])
 
     def setup_meja(self, frame):
         tk.Label(frame, text="Status Meja", font=("Arial", 14, "bold"), bg=COLOR_BG, fg=COLOR_HEADER).pack(pady=8)
         self.grid_meja = tk.Frame(frame, bg=COLOR_BG)
         self.grid_meja.pack(padx=20, pady=10)
+        self.tombol_meja = {}        # nomor meja -> tk.Button (dibuat sekali)
+        self._meja_kotor.clear()     # tombol dibuat dengan status terbaru
         self.render_meja_buttons()
+        self.penjadwal.daftar("meja", self.render_meja_buttons)
 
-    def render_meja_buttons(self):
-        # Hapus semua widget di grid_meja dan buat ulang (dipakai saat update)
-        for widget in self.grid_meja.winfo_children():
-            widget.destroy()
+    def _style_meja(self, meja):
+        if meja.status == 'kosong':
+            return dict(text=f"Meja {meja.nomor}\n{meja.status}", bg=COLOR_BTN_SUCCESS, fg='white')
+        elif meja.status == 'terisi':
+            return dict(text=f"Meja {meja.nomor}\n{meja.status}", bg=COLOR_BTN_DANGER, fg='white')
+        return dict(text=f"Meja {meja.nomor}\n{meja.status}", bg=COLOR_BTN_WARNING, fg='black')
 
+    def render_meja_buttons(self):
+        # Satu tombol per meja; hanya meja yang berubah (dari notifikasi manajer) yang dikonfigurasi ulang
         for i, meja in enumerate(self.manajer.meja):
-            if meja.status == 'kosong':
-                warna = COLOR_BTN_SUCCESS
-                teks_warna = 'white'
-            elif meja.status == 'terisi':
-                warna = COLOR_BTN_DANGER
-                teks_warna = 'white'
-            else:
-                warna = COLOR_BTN_WARNING
-                teks_warna = 'black'
-
-            btn = tk.Button(self.grid_meja, text=f"Meja {meja.nomor}\n{meja.status}", bg=warna, fg=teks_warna, width=12, height=4,
-                            command=lambda m=meja: self.tampilkan_info_meja(m))
-            btn.grid(row=i//5, column=i%5, padx=6, pady=6)
+            if meja.nomor not in self.tombol_meja:
+                btn = tk.Button(self.grid_meja, width=12, height=4, command=lambda m=meja: self.tampilkan_info_meja(m),
+                                **self._style_meja(meja))
+                btn.grid(row=i//5, column=i%5, padx=6, pady=6)
+                self.tombol_meja[meja.nomor] = btn
+
+        for nomor in self._meja_kotor:
+            self.tombol_meja[nomor].configure(**self._style_meja(self.manajer.meja[nomor - 1]))
+        self._meja_kotor.clear()
+
+    def _on_perubahan(self, jenis, objek):
+        # notifikasi model -> tandai tampilan yang terdampak
+        if jenis == "meja":
+            self._meja_kotor.add(objek.nomor)
+            self.penjadwal.tandai("meja")
+        elif jenis == "antrian":
+            if self.dapur is not None and objek not in self.manajer.antrian_pesanan:
+                # keluar dari antrian tanpa lewat dapur (undo buat pesanan, hapus): tiketnya dibatalkan
+                self.dapur.batalkan(objek.id_pesanan)
+            self.penjadwal.tandai("antrian")
+        elif jenis == "pesanan":
+            if self.dapur is not None and objek.status == "aktif":
+                # item berubah setelah dikirim ke dapur: tiketnya dipecah ulang (no-op jika belum di dapur)
+                self.dapur.perbarui(objek)
+            # jumlah item & total juga tampil di daftar antrian
+            self.penjadwal.tandai("antrian")
+            if objek is self.pesanan_aktif:
+                self.penjadwal.tandai("pesanan")
+        elif jenis in ("stok", "menu"):
+            self._menu_kotor.add(objek.id)
+            self.penjadwal.tandai("menu")
+        elif jenis == "nota":
+            self.penjadwal.tandai("nota")
+
+    def _on_peringatan_stok(self, p):
+        # dipanggil dari pendengar manajer (thread Tk); cukup ubah teks bilah
+        tidak_aman = len(self.pemantau_stok.daftar_peringatan())
+        teks = teks_peringatan(p)
+        if tidak_aman > 1 or (tidak_aman == 1 and p.tingkat == "aman"):
+            teks += f"   |   {tidak_aman} menu perlu restock"
+        warna = {"habis": COLOR_BTN_DANGER, "menipis": COLOR_BTN_WARNING}.get(p.tingkat, COLOR_BG)
+        self.label_stok.config(text=teks, bg=warna if tidak_aman else COLOR_BG)
 
     # ==================== NOTA (pengganti Laporan) ====================
     def setup_nota(self, frame):
@@ -344,28 +2083,54 @@ class AplikasiRestoran:
         tk.Button(btn_frame, text="Refresh Nota", bg=COLOR_BTN_PRIMARY, fg='white', command=self.refresh_nota).grid(row=0, column=0, padx=6)
         tk.Button(btn_frame, text="Tampilkan Nota", bg=COLOR_BTN_SUCCESS, fg='white', command=self.tampilkan_nota).grid(row=0, column=1, padx=6)
         tk.Button(btn_frame, text="Simpan Nota ke File", bg=COLOR_BTN_WARNING, fg='black', command=self.simpan_nota_file).grid(row=0, column=2, padx=6)
+        tk.Button(btn_frame, text="Ekspor Semua Nota", bg=COLOR_BTN_PRIMARY, fg='white', command=self.ekspor_semua_nota).grid(row=0, column=3, padx=6)
+
+        # nota dibaca per halaman (halaman 1 = terbaru), nota lama diambil dari arsip hanya saat dibuka
+        halaman_frame = tk.Frame(frame, bg=COLOR_BG)
+        halaman_frame.pack(pady=4)
+        tk.Button(halaman_frame, text="◀ Lebih Baru", command=lambda: self.geser_halaman_nota(-1)).grid(row=0, column=0, padx=6)
+        self.label_halaman_nota = tk.Label(halaman_frame, text="", bg=COLOR_BG, fg=COLOR_TEXT)
+        self.label_halaman_nota.grid(row=0, column=1, padx=6)
+        tk.Button(halaman_frame, text="Lebih Lama ▶", command=lambda: self.geser_halaman_nota(1)).grid(row=0, column=2, padx=6)
 
+        self._halaman_nota = 1
         self.refresh_nota()
+        self.penjadwal.daftar("nota", self.refresh_nota)
 
     def refresh_nota(self):
+        total_halaman = self.manajer.jumlah_halaman_nota(UKURAN_HALAMAN_NOTA)
+        self._halaman_nota = min(self._halaman_nota, total_halaman)
         self.list_nota.delete(0, tk.END)
-        for p in self.manajer.pesanan:
-            if p.status == "selesai":
-                waktu = p.waktu_selesai.strftime('%Y-%m-%d %H:%M:%S') if p.waktu_selesai else "-"
-                self.list_nota.insert(tk.END, f"#{p.id_pesanan} - Meja {p.nomor_meja} - Total Rp {p.total_harga:,} - {waktu}")
+        self._nota_ids = []
+        for id_p, label_meja, total, waktu_selesai in self.manajer.halaman_nota(self._halaman_nota, UKURAN_HALAMAN_NOTA):
+            self._nota_ids.append(id_p)
+            waktu = waktu_selesai.strftime('%Y-%m-%d %H:%M:%S') if waktu_selesai else "-"
+            self.list_nota.insert(tk.END, f"#{id_p} - Meja {label_meja} - Total Rp {total:,} - {waktu}")
+        self.label_halaman_nota.config(
+            text=f"Halaman {self._halaman_nota}/{total_halaman} ({self.manajer.jumlah_nota():,} nota)")
+
+    def geser_halaman_nota(self, langkah):
+        self._halaman_nota = max(1, self._halaman_nota + langkah)
+        self.refresh_nota()
+
+    def _nota_terpilih(self):
+        # ambil pesanan dari baris listbox lewat indeks id (tanpa scan)
+        idx = self.list_nota.curselection()[0]
+        p = None
+        if idx < len(self._nota_ids):
+            p = self.manajer.get_nota(self._nota_ids[idx])
+        if p is None:
+            messagebox.showerror("Error", "Indeks nota tidak valid.")
+        return p
 
     def tampilkan_nota(self):
         sel = self.list_nota.curselection()
         if not sel:
             messagebox.showinfo("Nota", "Pilih nota terlebih dahulu.")
             return
-        idx = sel[0]
-        # cari pesanan selesai ke idx
-        selesai = [p for p in self.manajer.pesanan if p.status == "selesai"]
-        if idx >= len(selesai):
-            messagebox.showerror("Error", "Indeks nota tidak valid.")
+        p = self._nota_terpilih()
+        if not p:
             return
-        p = selesai[idx]
         messagebox.showinfo(f"Nota #{p.id_pesanan}", p.get_nota_text())
 
     def simpan_nota_file(self):
@@ -373,12 +2138,9 @@ class AplikasiRestoran:
         if not sel:
             messagebox.showinfo("Simpan Nota", "Pilih nota terlebih dahulu.")
             return
-        idx = sel[0]
-        selesai = [p for p in self.manajer.pesanan if p.status == "selesai"]
-        if idx >= len(selesai):
-            messagebox.showerror("Error", "Indeks nota tidak valid.")
+        p = self._nota_terpilih()
+        if not p:
             return
-        p = selesai[idx]
 
         # default filename
         default_name = f"nota_{p.id_pesanan}_{p.waktu_selesai.strftime('%Y%m%d_%H%M%S') if p.waktu_selesai else datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
@@ -393,6 +2155,19 @@ class AplikasiRestoran:
         except Exception as e:
             messagebox.showerror("Error", f"Gagal menyimpan nota: {e}")
 
+    def ekspor_semua_nota(self):
+        default_name = f"nota_{datetime.now().strftime('%Y%m%d')}.csv"
+        filepath = filedialog.asksaveasfilename(defaultextension=".csv", initialfile=default_name,
+                                                filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"),
+                                                           ("Arsip Teks", "*.txt"), ("Gzip", "*.gz"), ("All Files", "*.*")])
+        if not filepath:
+            return
+        try:
+            jumlah = ekspor_nota(self.manajer, filepath)
+            messagebox.showinfo("Ekspor Nota", f"{jumlah} nota diekspor ke:\n{filepath}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Gagal mengekspor nota: {e}")
+
     # ==================== ANTRIAN (Queue) UI ====================
     def setup_antrian(self, frame):
         tk.Label(frame, text="Antrian Pesanan - Untuk Dapur", font=("Arial", 14, "bold"), bg=COLOR_BG, fg=COLOR_HEADER).pack(pady=8)
@@ -405,13 +2180,31 @@ class AplikasiRestoran:
         tk.Button(btn_frame, text="Refresh Antrian", bg=COLOR_BTN_PRIMARY, fg='white', command=self.refresh_antrian).grid(row=0, column=0, padx=6)
         tk.Button(btn_frame, text="Proses Pesanan", bg=COLOR_BTN_SUCCESS, fg='white', command=self.proses_pesanan_dequeue).grid(row=0, column=1, padx=6)
         tk.Button(btn_frame, text="Lihat Riwayat Aksi", bg=COLOR_BTN_WARNING, fg='black', command=self.tampilkan_riwayat).grid(row=0, column=2, padx=6)
+        tk.Button(btn_frame, text="Prioritaskan", bg=COLOR_BTN_DANGER, fg='white', command=self.prioritaskan_antrian).grid(row=0, column=3, padx=6)
 
         self.refresh_antrian()
+        self.penjadwal.daftar("antrian", self.refresh_antrian)
 
     def refresh_antrian(self):
         self.list_antrian.delete(0, tk.END)
+        self._antrian_ids = []
+        eta = self.dapur.perkiraan() if self.dapur is not None else {}
         for p in self.manajer.antrian_pesanan:
-            self.list_antrian.insert(tk.END, f"#{p.id_pesanan} - Meja {p.nomor_meja} - Items: {len(p.items)} - Total Rp {p.total_harga:,}")
+            self._antrian_ids.append(p.id_pesanan)
+            teks = f"#{p.id_pesanan} - Meja {p.label_meja} - Items: {len(p.items)} - Total Rp {p.total_harga:,}"
+            if p.id_pesanan in eta:
+                teks += f" - Dapur: siap ±{eta[p.id_pesanan] / 60:.0f} mnt"
+            self.list_antrian.insert(tk.END, teks)
+
+    def prioritaskan_antrian(self):
+        sel = self.list_antrian.curselection()
+        if not sel:
+            messagebox.showinfo("Antrian", "Pilih pesanan terlebih dahulu.")
+            return
+        id_p = self._antrian_ids[sel[0]]
+        self.manajer.prioritaskan_pesanan(id_p)
+        if self.dapur is not None and self.dapur.prioritaskan(id_p):
+            self.penjadwal.tandai("antrian")
 
     # ==================== Actions ====================
     def buat_pesanan_baru(self):
@@ -428,51 +2221,94 @@ class AplikasiRestoran:
             messagebox.showerror('Error', f"Meja {nomor_meja} sudah terisi.")
             return
 
-        self.pesanan_aktif = self.manajer.buat_pesanan(nomor_meja)
-        # masukkan ke antrian (queue) untuk diproses dapur
-        self.manajer.enqueue_pesanan(self.pesanan_aktif)
-        # catat ke riwayat (stack)
-        self.manajer.push_aksi(f"Buat pesanan #{self.pesanan_aktif.id_pesanan}")
+        # buat pesanan, masukkan ke antrian dapur, dan catat ke riwayat (stack)
+        self.pesanan_aktif = self.manajer.buat_pesanan_baru(nomor_meja)
 
         messagebox.showinfo('Sukses', f'Pesanan dibuat untuk meja {nomor_meja}\nID Pesanan: #{self.pesanan_aktif.id_pesanan}')
-        self.update_tampilan_pesanan()
-        self.refresh_antrian()
-        self.render_meja_buttons()
-        self.refresh_menu_values()
+        # pesanan aktif berganti; tampilan lain ditandai lewat notifikasi manajer
+        self.penjadwal.tandai("pesanan")
 
-    def tambah_item_pesanan(self):
-        if not self.pesanan_aktif:
-            messagebox.showerror('Error', 'Buat pesanan terlebih dahulu')
+    def buat_pesanan_otomatis(self):
+        try:
+            jumlah_orang = int(self.entry_orang.get())
+            if jumlah_orang <= 0:
+                raise ValueError
+        except Exception:
+            messagebox.showerror('Error', 'Jumlah orang tidak valid')
+            return
+
+        # meja kosong terkecil yang cukup; rombongan besar mendapat meja bersebelahan yang digabung
+        pesanan = self.manajer.buat_pesanan_rombongan(jumlah_orang)
+        if pesanan is None:
+            messagebox.showerror('Error', f'Tidak ada meja kosong untuk {jumlah_orang} orang.')
             return
+        self.pesanan_aktif = pesanan
 
+        messagebox.showinfo('Sukses', f'Pesanan dibuat untuk meja {pesanan.label_meja} ({jumlah_orang} orang)\nID Pesanan: #{pesanan.id_pesanan}')
+        self.penjadwal.tandai("pesanan")
+
+    def _baca_input_item(self):
         selected = self.combo_menu.current()
         if selected == -1:
             messagebox.showerror('Error', 'Pilih menu terlebih dahulu')
-            return
-
+            return None
         try:
             jumlah = int(self.entry_jumlah.get())
             if jumlah <= 0:
                 raise ValueError
         except Exception:
             messagebox.showerror('Error', 'Masukkan jumlah valid (angka > 0)')
+            return None
+        return self.manajer.get_menu(self._menu_tampil_ids[selected]), jumlah, self.entry_catatan.get()
+
+    def _update_label_draft(self):
+        total = sum(m.harga * j for m, j, _ in self._draft)
+        self.label_draft.config(text=f"Draft: {len(self._draft)} baris - Rp {total:,}")
+
+    def tambah_ke_draft(self):
+        # belum menyentuh stok; validasi & reservasi dilakukan saat draft dikirim
+        baris = self._baca_input_item()
+        if baris is None:
+            return
+        self._draft.append(baris)
+        self._update_label_draft()
+
+    def kosongkan_draft(self):
+        self._draft.clear()
+        self._update_label_draft()
+
+    def kirim_draft(self):
+        if not self.pesanan_aktif:
+            messagebox.showerror('Error', 'Buat pesanan terlebih dahulu')
+            return
+        if not self._draft:
+            messagebox.showerror('Error', 'Draft masih kosong')
+            return
+        # satu transaksi: semua baris masuk atau tidak sama sekali
+        if not self.manajer.tambah_items_pesanan(self.pesanan_aktif, self._draft):
+            messagebox.showerror('Error', 'Stok tidak mencukupi untuk salah satu item di draft.\nTidak ada item yang ditambahkan.')
+            return
+        jumlah_baris = len(self._draft)
+        self.kosongkan_draft()
+        messagebox.showinfo('Sukses', f'{jumlah_baris} baris ditambahkan ke pesanan')
+
+    def tambah_item_pesanan(self):
+        if not self.pesanan_aktif:
+            messagebox.showerror('Error', 'Buat pesanan terlebih dahulu')
             return
 
-        menu_item = self.manajer.menu_items[selected]
-        catatan = self.entry_catatan.get()
+        baris = self._baca_input_item()
+        if baris is None:
+            return
+        menu_item, jumlah, catatan = baris
 
-        is_ok = self.pesanan_aktif.tambah_item(menu_item, jumlah, catatan)
+        # tambah item sekaligus catat AksiTambahItem ke stack
+        is_ok = self.manajer.tambah_item_pesanan(self.pesanan_aktif, menu_item, jumlah, catatan)
         if not is_ok:
             messagebox.showerror('Error', 'Stok tidak mencukupi')
             return
 
-        # catat aksi ke stack (misal: "Tambah Ayam Balap x2")
-        self.manajer.push_aksi(f"Tambah {menu_item.nama} x{jumlah}")
-
         messagebox.showinfo('Sukses', f'{menu_item.nama} x{jumlah} ditambahkan ke pesanan')
-        self.update_tampilan_pesanan()
-        self.refresh_antrian()
-        self.refresh_menu_values()
 
     def update_tampilan_pesanan(self):
         if not self.pesanan_aktif:
@@ -489,155 +2325,187 @@ class AplikasiRestoran:
 
     # ------------------ Stack (Undo) ------------------
     def undo_aksi(self):
-        aksi = self.manajer.pop_aksi()
-        if not aksi:
+        hasil = self.manajer.undo_aksi()
+        if hasil is None:
             messagebox.showinfo("Undo", "Tidak ada aksi untuk di-undo")
             return
-
-        # Kita coba handling dua pola aksi: "Tambah {nama} x{jumlah}" dan "Buat pesanan #{id}"
-        if aksi.startswith("Tambah "):
-            # contoh: "Tambah Ayam Balap x2"
-            try:
-                # split by ' x' dari kanan
-                left, xpart = aksi.rsplit(" x", 1)
-                jumlah = int(xpart)
-                _, nama_item = left.split(" ", 1)  # remove "Tambah "
-            except Exception:
-                messagebox.showinfo("Undo", f"Aksi dibatalkan: {aksi}\n(Tidak dapat melakukan undo otomatis detail item)")
-                return
-
-            # coba hapus item terakhir yang cocok pada pesanan aktif (atau di meja terkait)
-            # Preferensi: jika pesanan aktif punya item cocok -> hapus sana, else cari pesanan terakhir
-            berhasil = False
-            subtotal = 0
-            if self.pesanan_aktif:
-                ok, subtotal = self.pesanan_aktif.hapus_item_terakhir(nama_item, jumlah)
-                berhasil = ok
-            if not berhasil:
-                # cari di semua pesanan (reverse order)
-                for p in reversed(self.manajer.pesanan):
-                    ok, subtotal = p.hapus_item_terakhir(nama_item, jumlah)
-                    if ok:
-                        berhasil = True
-                        break
-
-            if berhasil:
-                messagebox.showinfo("Undo", f"Aksi undo berhasil: {aksi}\nSubtotal dikembalikan: Rp {subtotal:,}")
-                self.update_tampilan_pesanan()
-                self.refresh_antrian()
-                self.refresh_menu_values()
-                self.render_meja_buttons()
-                return
-            else:
-                messagebox.showinfo("Undo", f"Aksi dibatalkan: {aksi}\n(Tidak menemukan item yang cocok untuk di-undo)")
-                return
-
-        elif aksi.startswith("Buat pesanan #"):
-            # contoh: "Buat pesanan #3"
-            try:
-                parts = aksi.split("#", 1)
-                id_p = int(parts[1])
-            except Exception:
-                messagebox.showinfo("Undo", f"Aksi dibatalkan: {aksi}\n(Tidak dapat memproses undo)")
-                return
-
-            # cari pesanan dengan id tersebut
-            target = None
-            for p in self.manajer.pesanan:
-                if p.id_pesanan == id_p:
-                    target = p
-                    break
-            if not target:
-                messagebox.showinfo("Undo", f"Aksi dibatalkan: {aksi}\n(Tidak menemukan pesanan #{id_p})")
-                return
-
-            # hanya bisa undo jika pesanan masih aktif dan belum selesai & masih di antrian
-            if target.status != "aktif":
-                messagebox.showinfo("Undo", f"Tidak bisa undo pesanan #{id_p} karena statusnya bukan aktif ({target.status})")
-                return
-
-            # Cek apakah pesanan masih ada di antrian
-            if target in self.manajer.antrian_pesanan:
-                try:
-                    self.manajer.antrian_pesanan.remove(target)
-                except ValueError:
-                    pass
-
-            # restore stok untuk semua item yang ada di pesanan (jika ada)
-            for it in target.items:
-                it['menu_item'].tambah_stok(it['jumlah'])
-
-            # ubah meja jadi kosong jika meja itu merujuk pada pesanan ini
-            meja = self.manajer.meja[target.nomor_meja - 1]
-            if meja.pesanan == target:
-                meja.pesanan = None
-                meja.status = "kosong"
-
-            # hapus dari daftar pesanan
-            try:
-                self.manajer.pesanan.remove(target)
-            except ValueError:
-                pass
-
-            messagebox.showinfo("Undo", f"Pesanan #{id_p} dibatalkan dan stok dikembalikan.")
-            # update UI
-            if self.pesanan_aktif and self.pesanan_aktif.id_pesanan == id_p:
-                self.pesanan_aktif = None
-                self.update_tampilan_pesanan()
-            self.refresh_antrian()
-            self.refresh_menu_values()
-            self.render_meja_buttons()
+        aksi, ok, pesan = hasil
+        messagebox.showinfo("Undo", pesan)
+        if not ok:
             return
-
-        else:
-            # aksi lain — kita hanya memberitahu dan tidak membalikkan otomatis
-            messagebox.showinfo("Undo", f"Aksi dibatalkan: {aksi}\n(Tidak ada handler undo otomatis untuk tipe aksi ini)")
+        # pesanan yang dibatalkan tidak lagi jadi pesanan aktif
+        if isinstance(aksi, AksiBuatPesanan) and self.pesanan_aktif is aksi.pesanan:
+            self.pesanan_aktif = None
+            self.penjadwal.tandai("pesanan")
+
+    def redo_aksi(self):
+        hasil = self.manajer.redo_aksi()
+        if hasil is None:
+            messagebox.showinfo("Redo", "Tidak ada aksi untuk di-redo")
             return
+        aksi, ok, pesan = hasil
+        messagebox.showinfo("Redo", pesan)
 
     def tampilkan_riwayat(self):
-        if not self.manajer.riwayat_aksi:
+        riwayat = self.manajer.riwayat_aksi
+        if not riwayat:
             messagebox.showinfo("Riwayat Aksi", "Belum ada riwayat aksi.")
             return
-        teks = "Riwayat Aksi (Top = terakhir):\n\n"
-        for i, a in enumerate(reversed(self.manajer.riwayat_aksi), start=1):
-            teks += f"{i}. {a}\n"
-        messagebox.showinfo("Riwayat Aksi", teks)
+        ukuran = 20
+        total_halaman = riwayat.jumlah_halaman(ukuran)
+        # baca per halaman, hanya entri halaman aktif yang diformat
+        for halaman in range(1, total_halaman + 1):
+            teks = f"Riwayat Aksi (Top = terakhir) - Halaman {halaman}/{total_halaman}:\n\n"
+            nomor_awal = (halaman - 1) * ukuran + 1
+            teks += "".join(f"{i}. {a}\n" for i, a in enumerate(riwayat.halaman(halaman, ukuran), start=nomor_awal))
+            if halaman == total_halaman:
+                messagebox.showinfo("Riwayat Aksi", teks)
+            elif not messagebox.askyesno("Riwayat Aksi", teks + "\nTampilkan halaman berikutnya?"):
+                break
 
     # ------------------ Queue processing ------------------
     def proses_pesanan_dequeue(self):
-        pesanan = self.manajer.dequeue_pesanan()
+        if self.dapur is not None:
+            self.kirim_ke_dapur()
+            return
+        # dequeue, tandai selesai (meja dikosongkan), dan catat AksiProsesPesanan
+        pesanan = self.manajer.proses_pesanan_dequeue()
         if not pesanan:
             messagebox.showinfo("Proses Antrian", "Tidak ada pesanan dalam antrian.")
             return
 
-        # tandai pesanan sebagai selesai
-        pesanan.status = "selesai"
-        pesanan.waktu_selesai = datetime.now()
-        # kamar/meja: kosongkan meja setelah pesanan selesai
-        meja = self.manajer.meja[pesanan.nomor_meja - 1]
-        if meja.pesanan == pesanan:
-            meja.pesanan = None
-            meja.status = "kosong"
-
-        # catat aksi bahwa pesanan diproses (opsional)
-        self.manajer.push_aksi(f"Proses pesanan #{pesanan.id_pesanan}")
-
         messagebox.showinfo("Proses Antrian", f"Pesanan #{pesanan.id_pesanan} diproses dan ditandai selesai.\nTotal: Rp {pesanan.total_harga:,}")
-        self.refresh_antrian()
-        self.render_meja_buttons()
-        # update nota list
-        self.refresh_nota()
-        # jika pesanan yang sedang ditampilkan adalah pesanan ini, update tampilan
-        if self.pesanan_aktif and self.pesanan_aktif.id_pesanan == pesanan.id_pesanan:
-            self.update_tampilan_pesanan()
+
+    def kirim_ke_dapur(self):
+        # pesanan terdepan yang sudah berisi item dan belum dimasak; tetap di antrian sampai dapur selesai
+        for pesanan in self.manajer.antrian_pesanan:
+            if pesanan.items and pesanan.id_pesanan not in self.dapur:
+                break
+        else:
+            messagebox.showinfo("Proses Antrian", "Tidak ada pesanan berisi item yang belum dikirim ke dapur.")
+            return
+        self.dapur.kirim(pesanan)
+        eta = self.dapur.perkiraan().get(pesanan.id_pesanan, 0)
+        self.penjadwal.tandai("antrian")
+        messagebox.showinfo("Proses Antrian", f"Pesanan #{pesanan.id_pesanan} dikirim ke dapur.\nPerkiraan siap: ±{eta / 60:.0f} menit")
 
     # ==================== Utility ====================
     def refresh_menu_values(self):
-        # refresh data values di combobox menu (agar stok terbaru terlihat)
-        values = [item.get_info() for item in self.manajer.menu_items]
+        # refresh values combobox sesuai filter; hanya baris yang stoknya berubah yang diformat ulang
+        for id_menu in self._menu_kotor:
+            self._info_menu.pop(id_menu, None)
+        self._menu_kotor.clear()
+        items = self.manajer.cari_menu(self._teks_cari_menu, batas=200)
+        values = []
+        for item in items:
+            info = self._info_menu.get(item.id)
+            if info is None:
+                info = self._info_menu[item.id] = item.get_info()
+            values.append(info)
+        self._menu_tampil_ids = [item.id for item in items]
         self.combo_menu['values'] = values
 
+    def _filter_menu(self, event=None):
+        # saring daftar saat kasir mengetik (abaikan tombol navigasi)
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        teks = self.combo_menu.get()
+        if teks in self._info_menu.values():
+            return
+        self._teks_cari_menu = teks
+        self.refresh_menu_values()
+
+    # ==================== DIAGNOSTIK (instrumentasi) ====================
+    def setup_diagnostik(self, frame):
+        tk.Label(frame, text="Diagnostik Kinerja", font=("Arial", 14, "bold"), bg=COLOR_BG, fg=COLOR_HEADER).pack(pady=8)
+        self.label_event_loop = tk.Label(frame, text="", bg=COLOR_BG, fg=COLOR_TEXT, justify='left')
+        self.label_event_loop.pack(padx=20, anchor='w')
+
+        kolom = ("jumlah", "total", "rata", "p50", "p99", "maks", "frame")
+        self.tree_diagnostik = ttk.Treeview(frame, columns=kolom, height=18)
+        self.tree_diagnostik.heading("#0", text="Operasi")
+        self.tree_diagnostik.column("#0", width=300)
+        for k, judul in zip(kolom, ("Panggilan", "Total ms", "Rata µs", "p50 ≤µs", "p99 ≤µs", "Maks µs", "% frame")):
+            self.tree_diagnostik.heading(k, text=judul)
+            self.tree_diagnostik.column(k, width=85, anchor='e')
+        self.tree_diagnostik.pack(fill='both', expand=True, padx=20, pady=10)
+
+        btn_frame = tk.Frame(frame, bg=COLOR_BG)
+        btn_frame.pack(pady=6)
+        tk.Button(btn_frame, text="Refresh", bg=COLOR_BTN_PRIMARY, fg='white', command=self.refresh_diagnostik).grid(row=0, column=0, padx=6)
+        tk.Button(btn_frame, text="Reset", bg=COLOR_BTN_WARNING, fg='black', command=self.reset_diagnostik).grid(row=0, column=1, padx=6)
+        tk.Button(btn_frame, text="Simpan JSON", bg=COLOR_BTN_SUCCESS, fg='white', command=self.simpan_diagnostik).grid(row=0, column=2, padx=6)
+
+    def tampilkan_diagnostik(self, event=None):
+        self.notebook.tab(self.frame_diagnostik, state="normal")
+        self.notebook.select(self.frame_diagnostik)
+        self.refresh_diagnostik()
+
+    def refresh_diagnostik(self):
+        data = dict(self.instrumentasi.ringkasan())
+        # porsi tiap tampilan terhadap total waktu redraw (callback penjadwal)
+        total_frame = data.get("frame._gambar_ulang", {}).get("total_ms", 0)
+        self.tree_diagnostik.delete(*self.tree_diagnostik.get_children())
+        for nama, h in data.items():
+            porsi = f"{h['total_ms'] / total_frame:.0%}" if total_frame and nama.startswith("tampilan.") else ""
+            self.tree_diagnostik.insert("", tk.END, text=nama, values=(
+                h["jumlah"], f"{h['total_ms']:.1f}", f"{h['rata_us']:.0f}", h["p50_us"], h["p99_us"],
+                f"{h['maks_us']:.0f}", porsi))
+        lag = data.get("tk.lag")
+        stall = data.get("tk.stall")
+        if lag:
+            self.label_event_loop.config(text=(
+                f"Event loop: lag p50 ≤ {lag['p50_us'] / 1000:.1f} ms, p99 ≤ {lag['p99_us'] / 1000:.1f} ms, "
+                f"maks {lag['maks_us'] / 1000:.1f} ms; stall ≥ 100 ms: {stall['jumlah'] if stall else 0}x"))
+
+    def reset_diagnostik(self):
+        self.instrumentasi.reset()
+        self.refresh_diagnostik()
+
+    def simpan_diagnostik(self):
+        filepath = filedialog.asksaveasfilename(defaultextension=".json", initialfile="diagnostik.json",
+                                                filetypes=[("JSON", "*.json"), ("All Files", "*.*")])
+        if not filepath:
+            return
+        try:
+            self.instrumentasi.simpan_json(filepath)
+            messagebox.showinfo("Diagnostik", f"Diagnostik disimpan ke:\n{filepath}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Gagal menyimpan diagnostik: {e}")
+
     # ==================== Run helpers / finalizations ====================
+    def _cek_dapur(self):
+        # thread pekerja dapur tidak menyentuh model/Tk; hasilnya diambil di sini, di thread Tk
+        for id_pesanan in self.dapur.ambil_selesai():
+            self.manajer.proses_pesanan(id_pesanan)
+        if len(self.dapur):
+            self.penjadwal.tandai("antrian")   # ETA berjalan mundur
+        self.root.after(1000, self._cek_dapur)
+
+    def _flush_berkala(self):
+        # fsync sisa batch jurnal walau kasir sedang diam
+        self.manajer.penyimpanan.flush()
+        self.root.after(1000, self._flush_berkala)
+
+    def tutup(self):
+        if self.instrumentasi is not None:
+            # dump otomatis supaya sesi kasir yang lambat bisa dianalisis belakangan
+            try:
+                os.makedirs(DIREKTORI_DATA, exist_ok=True)
+                self.instrumentasi.simpan_json(os.path.join(DIREKTORI_DATA, "diagnostik.json"))
+            except OSError:
+                pass
+        if self.manajer is None:
+            # ditutup saat data masih dimuat: tunggu pemulihan selesai supaya penyimpanan ditutup rapi
+            self._thread_muat.join()
+            if isinstance(self._hasil_muat, ManajerRestoran):
+                self._hasil_muat.tutup()
+        else:
+            self.manajer.tutup()
+        if self.dapur is not None:
+            self.dapur.berhenti(tunggu=False)
+        self.root.destroy()
+
     def run(self):
         self.root.mainloop()
 
@@ -645,6 +2513,35 @@ class AplikasiRestoran:
 #  RUN
 # ===============================
 if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Sistem Manajemen Restoran")
+    parser.add_argument("--sqlite", action="store_true", help="simpan ke SQLite (restoran.db) alih-alih jurnal")
+    parser.add_argument("--data", default=DIREKTORI_DATA, help="folder data (jurnal/snapshot/restoran.db)")
+    # --diagnostik: aktifkan instrumentasi + tab Diagnostik tersembunyi (Ctrl+Shift+D)
+    parser.add_argument("--diagnostik", action="store_true", default=bool(os.environ.get("RESTORAN_DIAGNOSTIK")))
+    parser.add_argument("--ukur-startup", action="store_true", help="cetak waktu cold start lalu keluar")
+    parser.add_argument("--dapur", choices=sorted(KEBIJAKAN), help="simulasikan dapur multi-stasiun dengan kebijakan ini")
+    parser.add_argument("--skala-dapur", type=float, default=0.01, help="detik nyata per detik waktu masak")
+    args = parser.parse_args()
+
+    try:
+        if args.sqlite:
+            penyimpanan = PenyimpananSQLite(os.path.join(args.data, "restoran.db"))
+        else:
+            penyimpanan = PenyimpananJurnal(args.data)
+    except DataSedangDipakai as e:
+        sys.exit(str(e))
     root = tk.Tk()
-    app = AplikasiRestoran(root)
+    dapur = PenjadwalDapur(kebijakan=args.dapur, skala_waktu=args.skala_dapur) if args.dapur else None
+    app = AplikasiRestoran(root, penyimpanan, Instrumentasi() if args.diagnostik else None, dapur)
+
+    if args.ukur_startup:
+        def _laporkan_startup():
+            if "siap" not in app.waktu_startup or "jendela" not in app.waktu_startup:
+                root.after(10, _laporkan_startup)
+                return
+            w = app.waktu_startup
+            print(f"startup jendela_ms={w['jendela']:.1f} siap_ms={w['siap']:.1f} target_ms={TARGET_COLD_START_MS}")
+            app.tutup()
+        root.after(10, _laporkan_startup)
     app.run()  
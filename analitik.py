@@ -0,0 +1,288 @@
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:   # numpy opsional: aplikasi kasir tetap jalan tanpa modul analitik
+    np = None
+
+# ===============================
+#  GUDANG ANALITIK KOLOMNAR (NumPy)
+# ===============================
+# Riwayat pesanan selesai disimpan sebagai kolom array NumPy, bukan objek:
+#   baris item : id_pesanan, waktu (selesai), jam, meja, kode_menu, jumlah, subtotal
+#   pesanan    : id, meja, waktu_buat, waktu_selesai, total, jumlah_baris
+# Baris baru ditampung di list lalu dipindah ke array per chunk; array tumbuh
+# 2x sehingga query cukup memakai view [:n] tanpa menyalin. Semua laporan
+# memakai operasi vektor (bincount, mask), jadi 10 juta baris item tetap
+# di bawah satu detik.
+#
+# Waktu disimpan sebagai detik sejak 1970-01-01 waktu lokal (naif). Jam dalam
+# sehari ikut disimpan (int8) supaya laporan per jam tidak perlu membagi
+# 10 juta angka int64 di setiap query.
+# Pesanan yang dibatalkan/diubah setelah selesai ditandai mati (tombstone)
+# lalu dicatat ulang; baris mati diabaikan oleh semua query.
+
+UKURAN_CHUNK = 1 << 16
+KAPASITAS_AWAL = 1 << 16
+EPOCH = datetime(1970, 1, 1)
+
+KOLOM_BARIS = (("id_pesanan", "int64"), ("waktu", "int64"), ("jam", "int8"), ("meja", "int32"),
+               ("kode_menu", "int32"), ("jumlah", "int32"), ("subtotal", "int64"))
+KOLOM_PESANAN = (("id", "int64"), ("meja", "int32"), ("waktu_buat", "int64"),
+                 ("waktu_selesai", "int64"), ("total", "int64"), ("jumlah_baris", "int32"))
+
+
+def _detik(waktu):
+    return (waktu - EPOCH) // timedelta(seconds=1)
+
+
+def _waktu(detik):
+    return EPOCH + timedelta(seconds=int(detik))
+
+
+class TabelKolom:
+    """Sekumpulan kolom NumPy sepanjang n, tumbuh 2x; baris baru ditampung dulu per chunk."""
+    def __init__(self, kolom):
+        self.nama = [k for k, _ in kolom]
+        self.n = 0
+        self._data = {k: np.empty(KAPASITAS_AWAL, dtype=t) for k, t in kolom}
+        self._tampung = []
+        self.hidup = np.ones(KAPASITAS_AWAL, dtype=bool)
+        self.jumlah_mati = 0
+
+    def __len__(self):
+        return self.n + len(self._tampung)
+
+    def tambah(self, baris):
+        # baris: tuple sesuai urutan kolom; kembalikan indeks barisnya
+        self._tampung.append(baris)
+        if len(self._tampung) >= UKURAN_CHUNK:
+            self.flush()
+        return len(self) - 1
+
+    def tambah_array(self, kolom):
+        """Tambah banyak baris sekaligus dari dict nama -> array (panjang sama)."""
+        self.flush()
+        panjang = len(kolom[self.nama[0]])
+        self._siapkan(self.n + panjang)
+        for k in self.nama:
+            self._data[k][self.n:self.n + panjang] = kolom[k]
+        self.n += panjang
+
+    def flush(self):
+        if not self._tampung:
+            return
+        panjang = len(self._tampung)
+        self._siapkan(self.n + panjang)
+        for k, nilai in zip(self.nama, zip(*self._tampung)):
+            self._data[k][self.n:self.n + panjang] = nilai
+        self.n += panjang
+        self._tampung = []
+
+    def _siapkan(self, kapasitas):
+        lama = len(self.hidup)
+        if kapasitas <= lama:
+            return
+        baru = max(kapasitas, lama * 2)
+        for k, arr in self._data.items():
+            a = np.empty(baru, dtype=arr.dtype)
+            a[:self.n] = arr[:self.n]
+            self._data[k] = a
+        hidup = np.ones(baru, dtype=bool)
+        hidup[:lama] = self.hidup
+        self.hidup = hidup
+
+    def matikan(self, awal, akhir):
+        self.flush()
+        self.jumlah_mati += int(self.hidup[awal:akhir].sum())
+        self.hidup[awal:akhir] = False
+
+    def kolom(self, nama):
+        self.flush()
+        return self._data[nama][:self.n]
+
+    def mask(self):
+        # None = semua baris hidup (query tidak perlu menyaring)
+        self.flush()
+        return self.hidup[:self.n] if self.jumlah_mati else None
+
+
+class GudangAnalitik:
+    def __init__(self):
+        if np is None:
+            raise RuntimeError("Modul analitik membutuhkan numpy (pip install numpy)")
+        self.baris = TabelKolom(KOLOM_BARIS)
+        self.pesanan = TabelKolom(KOLOM_PESANAN)
+        self._posisi = {}      # id_pesanan -> (indeks di tabel pesanan, awal baris, akhir baris)
+        self._kode_menu = {}   # id menu -> kode padat 0..k-1 (untuk bincount)
+        self.id_menu = []      # kode -> id menu
+        self._manajer = None
+
+    # ------------------
+    # Pengisian
+    # ------------------
+    def kode_menu(self, id_menu):
+        kode = self._kode_menu.get(id_menu)
+        if kode is None:
+            kode = self._kode_menu[id_menu] = len(self.id_menu)
+            self.id_menu.append(id_menu)
+        return kode
+
+    def catat(self, pesanan):
+        """Catat (atau ganti) satu pesanan selesai."""
+        self.hapus(pesanan.id_pesanan)
+        selesai = _detik(pesanan.waktu_selesai or datetime.now())
+        jam = selesai // 3600 % 24
+        awal = len(self.baris)
+        for it in pesanan.items:
+            self.baris.tambah((pesanan.id_pesanan, selesai, jam, pesanan.nomor_meja, self.kode_menu(it.menu_item.id),
+                               it.jumlah, it.subtotal))
+        i = self.pesanan.tambah((pesanan.id_pesanan, pesanan.nomor_meja, _detik(pesanan.waktu_buat), selesai,
+                                 pesanan.total_harga, len(pesanan.items)))
+        self._posisi[pesanan.id_pesanan] = (i, awal, len(self.baris))
+
+    def hapus(self, id_pesanan):
+        posisi = self._posisi.pop(id_pesanan, None)
+        if posisi is None:
+            return False
+        i, awal, akhir = posisi
+        self.pesanan.matikan(i, i + 1)
+        self.baris.matikan(awal, akhir)
+        return True
+
+    def ikuti(self, manajer):
+        """Muat semua pesanan selesai lalu ikuti perubahan nota dari manajer."""
+        self._manajer = manajer
+        for p in manajer.iter_nota():
+            self.catat(p)
+        manajer.tambah_pendengar(self._on_perubahan)
+        return self
+
+    def _on_perubahan(self, jenis, objek):
+        # "nota": pesanan selesai, batal selesai, berubah setelah selesai, atau dihapus
+        if jenis != "nota":
+            return
+        if objek.status == "selesai" and objek in self._manajer.pesanan:
+            self.catat(objek)
+        else:
+            self.hapus(objek.id_pesanan)
+
+    # ------------------
+    # Query (vektor)
+    # ------------------
+    def _pilih(self, tabel, kolom_waktu, mulai, sampai, *nama):
+        # kolom yang diminta, sudah disaring baris mati & rentang waktu (satu mask untuk semua kolom)
+        m = tabel.mask()
+        if mulai is not None or sampai is not None:
+            w = tabel.kolom(kolom_waktu)
+            if mulai is not None:
+                m = (w >= _detik(mulai)) if m is None else m & (w >= _detik(mulai))
+            if sampai is not None:
+                m = (w < _detik(sampai)) if m is None else m & (w < _detik(sampai))
+        return [tabel.kolom(k) if m is None else tabel.kolom(k)[m] for k in nama]
+
+    def _per_menu(self, mulai, sampai):
+        kode, jumlah, subtotal = self._pilih(self.baris, "waktu", mulai, sampai, "kode_menu", "jumlah", "subtotal")
+        k = len(self.id_menu)
+        return np.bincount(kode, weights=jumlah, minlength=k), np.bincount(kode, weights=subtotal, minlength=k)
+
+    def terlaris(self, n=10, mulai=None, sampai=None, urut="jumlah", per_menu=None):
+        """[(id_menu, jumlah, pendapatan)] teratas menurut jumlah terjual (atau pendapatan)."""
+        jumlah, pendapatan = per_menu or self._per_menu(mulai, sampai)
+        kunci = jumlah if urut == "jumlah" else pendapatan
+        n = min(n, len(kunci))
+        if n <= 0:
+            return []
+        teratas = np.argpartition(-kunci, n - 1)[:n]
+        teratas = teratas[np.argsort(-kunci[teratas], kind="stable")]
+        return [(self.id_menu[i], int(jumlah[i]), int(pendapatan[i])) for i in teratas if jumlah[i]]
+
+    def pendapatan_per_jam(self, mulai=None, sampai=None):
+        """Array 24 elemen: total pendapatan menurut jam dalam sehari (0-23)."""
+        jam, subtotal = self._pilih(self.baris, "waktu", mulai, sampai, "jam", "subtotal")
+        return np.bincount(jam, weights=subtotal, minlength=24).astype(np.int64)
+
+    def pendapatan_per_kategori(self, kategori_menu=None, mulai=None, sampai=None, per_menu=None):
+        """
+        {kategori: pendapatan}. kategori_menu: fungsi id_menu -> kategori
+        (default: kategori menu terkini dari manajer yang diikuti).
+        """
+        if kategori_menu is None:
+            def kategori_menu(id_menu):
+                item = self._manajer.get_menu(id_menu) if self._manajer else None
+                return item.kategori if item is not None else "lainnya"
+        if per_menu is None:
+            kode, subtotal = self._pilih(self.baris, "waktu", mulai, sampai, "kode_menu", "subtotal")
+            pendapatan = np.bincount(kode, weights=subtotal, minlength=len(self.id_menu))
+        else:
+            pendapatan = per_menu[1]
+        hasil = {}
+        for kode in np.flatnonzero(pendapatan):
+            kat = kategori_menu(self.id_menu[kode])
+            hasil[kat] = hasil.get(kat, 0) + int(pendapatan[kode])
+        return hasil
+
+    def rata_rata_nota(self, mulai=None, sampai=None):
+        total, baris = self._pilih(self.pesanan, "waktu_selesai", mulai, sampai, "total", "jumlah_baris")
+        if not len(total):
+            return {"jumlah_pesanan": 0, "rata_total": 0.0, "rata_baris": 0.0}
+        return {"jumlah_pesanan": int(len(total)), "rata_total": float(total.mean()), "rata_baris": float(baris.mean())}
+
+    def perputaran_meja(self, mulai=None, sampai=None):
+        """{nomor_meja: (jumlah_pesanan, rata_rata_menit)} dari waktu_buat -> waktu_selesai."""
+        meja, buat, selesai = self._pilih(self.pesanan, "waktu_selesai", mulai, sampai,
+                                          "meja", "waktu_buat", "waktu_selesai")
+        jumlah = np.bincount(meja)
+        total = np.bincount(meja, weights=selesai - buat)
+        return {int(i): (int(jumlah[i]), float(total[i] / jumlah[i] / 60)) for i in np.flatnonzero(jumlah)}
+
+    def laporan(self, mulai=None, sampai=None, n_terlaris=10):
+        # agregat per menu dihitung sekali, dipakai terlaris & per kategori
+        per_menu = self._per_menu(mulai, sampai)
+        return {
+            "terlaris": self.terlaris(n_terlaris, per_menu=per_menu),
+            "per_jam": self.pendapatan_per_jam(mulai, sampai).tolist(),
+            "per_kategori": self.pendapatan_per_kategori(per_menu=per_menu),
+            "nota": self.rata_rata_nota(mulai, sampai),
+            "meja": self.perputaran_meja(mulai, sampai),
+        }
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    import time
+    # diimpor di sini supaya Tugasakhir tidak ikut termuat saat modul ini dipakai sebagai pustaka
+    from Tugasakhir import ManajerRestoran, DIREKTORI_DATA
+    from penyimpanan import PenyimpananJurnal, PenyimpananSQLite
+
+    parser = argparse.ArgumentParser(description="Laporan analitik riwayat pesanan (NumPy)")
+    parser.add_argument("--mulai", type=datetime.fromisoformat, help="ISO, inklusif")
+    parser.add_argument("--sampai", type=datetime.fromisoformat, help="ISO, eksklusif")
+    parser.add_argument("--data", default=DIREKTORI_DATA, help="folder jurnal + snapshot")
+    parser.add_argument("--sqlite", action="store_true", help="baca dari restoran.db di folder data")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        penyimpanan = PenyimpananSQLite(os.path.join(args.data, "restoran.db"), baca_saja=True)
+    else:
+        penyimpanan = PenyimpananJurnal(args.data, baca_saja=True)
+    manajer = ManajerRestoran(penyimpanan)
+    try:
+        gudang = GudangAnalitik().ikuti(manajer)
+        t0 = time.perf_counter()
+        lap = gudang.laporan(args.mulai, args.sampai)
+        durasi = (time.perf_counter() - t0) * 1000
+    finally:
+        manajer.tutup()
+
+    print(f"{len(gudang.baris):,} baris item, laporan dalam {durasi:.1f} ms")
+    print("Terlaris:")
+    for id_menu, jumlah, pendapatan in lap["terlaris"]:
+        item = manajer.get_menu(id_menu)
+        print(f"  {item.nama if item else id_menu:<24} {jumlah:>8,}  Rp {pendapatan:,}")
+    print("Per kategori:", ", ".join(f"{k}: Rp {v:,}" for k, v in lap["per_kategori"].items()))
+    print("Per jam:", ", ".join(f"{j:02d}: {v:,}" for j, v in enumerate(lap["per_jam"]) if v))
+    nota = lap["nota"]
+    print(f"Rata-rata nota: Rp {nota['rata_total']:,.0f}, {nota['rata_baris']:.1f} baris ({nota['jumlah_pesanan']:,} pesanan)")
+    print("Perputaran meja:", ", ".join(f"{m}: {n}x/{menit:.0f} mnt" for m, (n, menit) in lap["meja"].items()))
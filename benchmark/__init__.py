@@ -0,0 +1,2 @@
+# Benchmark headless (tanpa Tk) untuk inti Sistem Manajemen Restoran.
+# Jalankan dari root repo, mis.: python -m benchmark.stok
@@ -0,0 +1,122 @@
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from analitik import GudangAnalitik, _detik
+from Tugasakhir import BarisPesanan, Makanan, Minuman, Pesanan
+
+# ===============================
+#  BENCHMARK GUDANG ANALITIK
+# ===============================
+# Mengisi GudangAnalitik dengan jutaan baris item sintetis (langsung sebagai
+# array, mewakili riwayat berbulan-bulan), lalu mengukur setiap query
+# laporan. Pengisian lewat catat() (jalur yang dipakai aplikasi saat
+# pesanan selesai) diukur terpisah dengan objek Pesanan sungguhan.
+#
+#   python -m benchmark.analitik --baris 10000000
+
+
+def isi_sintetis(gudang, jumlah_baris, jumlah_menu, jumlah_meja, seed):
+    rng = np.random.default_rng(seed)
+    for id_menu in range(1, jumlah_menu + 1):
+        gudang.kode_menu(id_menu)
+    harga = rng.integers(10, 120, jumlah_menu) * 500
+    baris_per_pesanan = 4
+    n_pesanan = jumlah_baris // baris_per_pesanan
+    n = n_pesanan * baris_per_pesanan
+
+    awal = _detik(datetime(2024, 1, 1, 10))
+    # pesanan tersebar 90 hari, jam buka 10:00-22:00
+    selesai = awal + rng.integers(0, 90, n_pesanan) * 86400 + rng.integers(0, 12 * 3600, n_pesanan)
+    buat = selesai - rng.integers(15 * 60, 90 * 60, n_pesanan)
+    meja = rng.integers(1, jumlah_meja + 1, n_pesanan).astype(np.int32)
+    kode = rng.integers(0, jumlah_menu, n).astype(np.int32)
+    jumlah = rng.integers(1, 4, n).astype(np.int32)
+    subtotal = harga[kode] * jumlah
+    total = subtotal.reshape(n_pesanan, baris_per_pesanan).sum(axis=1)
+    ids = np.arange(1, n_pesanan + 1, dtype=np.int64)
+
+    gudang.baris.tambah_array({
+        "id_pesanan": np.repeat(ids, baris_per_pesanan), "waktu": np.repeat(selesai, baris_per_pesanan),
+        "jam": np.repeat(selesai // 3600 % 24, baris_per_pesanan),
+        "meja": np.repeat(meja, baris_per_pesanan), "kode_menu": kode, "jumlah": jumlah, "subtotal": subtotal,
+    })
+    gudang.pesanan.tambah_array({
+        "id": ids, "meja": meja, "waktu_buat": buat, "waktu_selesai": selesai, "total": total,
+        "jumlah_baris": np.full(n_pesanan, baris_per_pesanan, dtype=np.int32),
+    })
+
+
+def ukur(fungsi, *args, ulang=3):
+    terbaik = None
+    for _ in range(ulang):
+        t0 = time.perf_counter()
+        fungsi(*args)
+        d = (time.perf_counter() - t0) * 1000
+        terbaik = d if terbaik is None else min(terbaik, d)
+    return terbaik
+
+
+def ukur_catat(jumlah_pesanan):
+    gudang = GudangAnalitik()
+    menu = [Makanan(i, f"Makanan {i}", 15000, 10**9) for i in range(1, 51)] + \
+           [Minuman(i, f"Minuman {i}", 5000, 10**9) for i in range(101, 151)]
+    waktu = datetime(2024, 1, 1, 10)
+    daftar = []
+    for i in range(1, jumlah_pesanan + 1):
+        p = Pesanan(i, i % 20 + 1, waktu)
+        for j in range(4):
+            m = menu[(i * 7 + j) % len(menu)]
+            p.items.append(BarisPesanan.baru(m, 1 + j % 3))
+            p.total_harga += p.items[-1].subtotal
+        p.waktu_selesai = waktu + timedelta(minutes=40)
+        daftar.append(p)
+    t0 = time.perf_counter()
+    for p in daftar:
+        gudang.catat(p)
+    gudang.baris.flush()
+    return jumlah_pesanan / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ukur query laporan GudangAnalitik pada riwayat besar")
+    parser.add_argument("--baris", type=int, default=10_000_000, help="jumlah baris item")
+    parser.add_argument("--menu", type=int, default=500)
+    parser.add_argument("--meja", type=int, default=40)
+    parser.add_argument("--catat", type=int, default=100_000, help="jumlah pesanan untuk mengukur catat()")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    gudang = GudangAnalitik()
+    t0 = time.perf_counter()
+    isi_sintetis(gudang, args.baris, args.menu, args.meja, args.seed)
+    print(f"{len(gudang.baris):,} baris item / {len(gudang.pesanan):,} pesanan dibuat dalam "
+          f"{time.perf_counter() - t0:.1f} s")
+
+    mulai = datetime(2024, 2, 1)
+    sampai = datetime(2024, 3, 1)
+    hasil = [
+        ("terlaris", ukur(gudang.terlaris, 10)),
+        ("terlaris (1 bulan)", ukur(gudang.terlaris, 10, mulai, sampai)),
+        ("pendapatan_per_jam", ukur(gudang.pendapatan_per_jam)),
+        ("pendapatan_per_kategori", ukur(gudang.pendapatan_per_kategori, lambda i: "makanan" if i % 2 else "minuman")),
+        ("rata_rata_nota", ukur(gudang.rata_rata_nota)),
+        ("perputaran_meja", ukur(gudang.perputaran_meja)),
+    ]
+    # satu pesanan dibatalkan: query berikutnya harus menyaring baris mati
+    gudang.baris.matikan(0, 4)
+    gudang.pesanan.matikan(0, 1)
+    hasil.append(("terlaris (ada baris mati)", ukur(gudang.terlaris, 10)))
+    hasil.append(("laporan lengkap", ukur(gudang.laporan)))
+
+    for nama, ms in hasil:
+        print(f"{nama:<28} {ms:>9.1f} ms")
+    print(f"catat() pesanan selesai: {ukur_catat(args.catat):,.0f} pesanan/detik")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from Tugasakhir import Makanan, ManajerRestoran, Meja, Minuman
+from penyimpanan import PenyimpananJurnal, PenyimpananSQLite
+
+# ===============================
+#  LOAD GENERATOR + BENCHMARK INTI RESTORAN (tanpa Tk)
+# ===============================
+# Mensimulasikan satu shift: pesanan datang dengan laju tetap (jam simulasi,
+# bukan jam dinding), tiap pesanan berisi beberapa item, sebagian aksi
+# di-undo, dapur memproses antrian, dan laporan penjualan diminta berkala.
+# Setiap operasi diukur latensinya; hasil disimpan sebagai JSON supaya bisa
+# dibandingkan antar versi:
+#
+#   python -m benchmark.beban --pesanan 20000 --output lama.json
+#   python -m benchmark.beban --pesanan 20000 --bandingkan lama.json
+
+OPERASI = ("buat_pesanan", "tambah_item", "dequeue_pesanan", "undo", "laporan", "laporan_rentang")
+DIREKTORI_HASIL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hasil")
+
+
+class ManajerBeban(ManajerRestoran):
+    """
+    Manajer dengan meja & menu sintetis sesuai konfigurasi sebagai pengganti
+    data contoh. Dimuat di load_sample_data, jadi sudah tercakup snapshot
+    pertama dan jurnal hanya merujuk menu yang ada di state tersimpan.
+    """
+    def __init__(self, args, penyimpanan=None):
+        self.args = args
+        super().__init__(penyimpanan)
+
+    def load_sample_data(self):
+        for i in range(1, self.args.meja + 1):
+            self.tambah_meja(Meja(i, 2 if i % 3 else 4))
+        rng = random.Random(self.args.seed)
+        menu = []
+        for i in range(1, self.args.menu + 1):
+            harga = rng.randrange(5000, 60000, 500)
+            if i % 3:
+                menu.append(Makanan(i, f"Makanan {i}", harga, 10**9, rng.randint(0, 3)))
+            else:
+                menu.append(Minuman(i, f"Minuman {i}", harga, 10**9))
+        self.perbarui_katalog([item.ke_dict() for item in menu])
+
+
+def buat_manajer(args, penyimpanan=None):
+    return ManajerBeban(args, penyimpanan)
+
+
+class Pengukur:
+    def __init__(self):
+        self.latensi = {op: [] for op in OPERASI}
+
+    def ukur(self, op, fungsi, *args):
+        t0 = time.perf_counter_ns()
+        hasil = fungsi(*args)
+        self.latensi[op].append(time.perf_counter_ns() - t0)
+        return hasil
+
+    def ringkasan(self):
+        hasil = {}
+        for op, data in self.latensi.items():
+            if not data:
+                continue
+            data.sort()
+            total = sum(data)
+            hasil[op] = {
+                "jumlah": len(data),
+                "ops_per_detik": len(data) / (total / 1e9) if total else 0.0,
+                "p50_us": data[len(data) // 2] / 1000,
+                "p99_us": data[min(len(data) - 1, int(len(data) * 0.99))] / 1000,
+                "maks_us": data[-1] / 1000,
+            }
+        return hasil
+
+
+def jalankan(args, penyimpanan=None):
+    m = buat_manajer(args, penyimpanan)
+    rng = random.Random(args.seed)
+    ukur = Pengukur()
+    jam = datetime(2024, 1, 1, 8, 0)
+    jeda = timedelta(seconds=3600 / args.pesanan_per_jam)
+    menu = m.menu_items
+    batas_antrian = max(1, args.meja // 2)
+
+    t_mulai = time.perf_counter()
+    for n in range(args.pesanan):
+        # waktu simulasi dipakai untuk semua aksi (bucket laporan per jam/hari ikut bergerak)
+        m.atur_waktu(jam)
+        jam += jeda
+
+        kosong = [x.nomor for x in m.meja if x.status == "kosong"]
+        if not kosong:
+            ukur.ukur("dequeue_pesanan", m.proses_pesanan_dequeue)
+            continue
+        pesanan = ukur.ukur("buat_pesanan", m.buat_pesanan_baru, rng.choice(kosong))
+
+        for _ in range(max(1, round(rng.gauss(args.item_per_pesanan, args.item_per_pesanan / 3)))):
+            ukur.ukur("tambah_item", m.tambah_item_pesanan, pesanan, rng.choice(menu), rng.randint(1, 3),
+                      rng.choice(("", "", "pedas", "tanpa es")))
+            if rng.random() < args.rasio_undo:
+                ukur.ukur("undo", m.undo_aksi)
+
+        while len(m.antrian_pesanan) > batas_antrian:
+            ukur.ukur("dequeue_pesanan", m.proses_pesanan_dequeue)
+
+        if n % args.laporan_setiap == 0:
+            ukur.ukur("laporan", m.get_laporan_penjualan)
+            ukur.ukur("laporan_rentang", m.get_laporan_penjualan, jam - timedelta(days=1), jam)
+
+    while m.antrian_pesanan:
+        ukur.ukur("dequeue_pesanan", m.proses_pesanan_dequeue)
+    m.atur_waktu(None)
+    durasi = time.perf_counter() - t_mulai
+    m.tutup()
+    return durasi, ukur.ringkasan(), m.get_laporan_penjualan()
+
+
+def _versi_git():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(DIREKTORI_HASIL), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def bandingkan(hasil, path_dasar):
+    with open(path_dasar, encoding="utf-8") as f:
+        dasar = json.load(f)["hasil"]
+    print(f"\nDibanding {path_dasar} (negatif = lebih lambat):")
+    for op, h in hasil.items():
+        if op not in dasar:
+            continue
+        d = dasar[op]
+        print(f"{op:<16} ops/detik {h['ops_per_detik'] / d['ops_per_detik'] - 1:>+7.1%}   "
+              f"p99 {d['p99_us'] / h['p99_us'] - 1 if h['p99_us'] else 0:>+7.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator & benchmark inti Sistem Manajemen Restoran")
+    parser.add_argument("--meja", type=int, default=40)
+    parser.add_argument("--menu", type=int, default=200)
+    parser.add_argument("--pesanan", type=int, default=20000, help="jumlah pesanan yang disimulasikan")
+    parser.add_argument("--pesanan-per-jam", type=float, default=120)
+    parser.add_argument("--item-per-pesanan", type=float, default=4)
+    parser.add_argument("--rasio-undo", type=float, default=0.05, help="peluang undo setelah tambah item")
+    parser.add_argument("--laporan-setiap", type=int, default=50, help="minta laporan setiap N pesanan")
+    parser.add_argument("--penyimpanan", choices=("memori", "jurnal", "sqlite"), default="memori")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help=f"file JSON hasil (default: {DIREKTORI_HASIL}/beban-<waktu>.json)")
+    parser.add_argument("--bandingkan", metavar="JSON", help="hasil sebelumnya sebagai pembanding")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.penyimpanan == "jurnal":
+            penyimpanan = PenyimpananJurnal(tmp)
+        elif args.penyimpanan == "sqlite":
+            penyimpanan = PenyimpananSQLite(os.path.join(tmp, "restoran.db"))
+        else:
+            penyimpanan = None
+        durasi, hasil, laporan = jalankan(args, penyimpanan)
+
+    print(f"{args.pesanan:,} pesanan dalam {durasi:.2f} s; {laporan['jumlah_pesanan']:,} terjual, "
+          f"total Rp {laporan['total_penjualan']:,}")
+    print(f"{'operasi':<16} {'jumlah':>9} {'ops/detik':>12} {'p50 us':>9} {'p99 us':>9} {'maks us':>10}")
+    for op, h in hasil.items():
+        print(f"{op:<16} {h['jumlah']:>9,} {h['ops_per_detik']:>12,.0f} {h['p50_us']:>9.1f} "
+              f"{h['p99_us']:>9.1f} {h['maks_us']:>10.1f}")
+
+    data = {
+        "versi": 1,
+        "waktu": datetime.now().isoformat(timespec="seconds"),
+        "git": _versi_git(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "konfigurasi": vars(args),
+        "durasi_detik": durasi,
+        "hasil": hasil,
+    }
+    output = args.output or os.path.join(DIREKTORI_HASIL, f"beban-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"Hasil disimpan ke {output}")
+    if args.bandingkan:
+        bandingkan(hasil, args.bandingkan)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from dapur import KEBIJAKAN, STASIUN, PenjadwalDapur, pecah_tiket, simulasikan
+from Tugasakhir import BarisPesanan, Makanan, MenuItem, Minuman, Pesanan
+
+# ===============================
+#  BENCHMARK KEBIJAKAN DAPUR
+# ===============================
+# Membuat satu shift pesanan sintetis (kedatangan Poisson, campuran makanan,
+# minuman, dan menu lain, sebagian pesanan VIP berprioritas), lalu
+# membandingkan throughput dan waktu tunggu per kebijakan dengan simulasi
+# event diskret (deterministik). --thread menjalankan juga PenjadwalDapur
+# sungguhan (thread + sleep berskala) untuk memeriksa ketepatan ETA.
+#
+#   python -m benchmark.dapur --pesanan 5000 --per-jam 16 --thread 200
+
+
+def buat_menu():
+    return ([Makanan(i, f"Makanan {i}", 20000, 10**9) for i in range(1, 11)]
+            + [Minuman(i, f"Minuman {i}", 8000, 10**9) for i in range(101, 111)]
+            + [MenuItem(i, f"Cemilan {i}", "cemilan", 10000, 10**9) for i in range(201, 206)])
+
+
+def buat_pesanan(args):
+    """[(waktu_datang, Pesanan, prioritas)] terurut waktu (detik dapur)."""
+    rng = random.Random(args.seed)
+    menu = buat_menu()
+    bobot = [3] * 10 + [2] * 10 + [1] * 5
+    waktu = 0.0
+    hasil = []
+    for id_p in range(1, args.pesanan + 1):
+        waktu += rng.expovariate(args.per_jam / 3600)
+        p = Pesanan(id_p, 1)
+        for m in rng.choices(menu, bobot, k=rng.randint(1, 5)):
+            p.items.append(BarisPesanan.baru(m, rng.randint(1, 3)))
+        hasil.append((waktu, p, 1 if rng.random() < args.rasio_vip else 0))
+    return hasil
+
+
+def ringkas(statistik, durasi, tunggu, vip):
+    data = sorted(tunggu.values())
+    tunggu_vip = [tunggu[i] for i in vip if i in tunggu]
+    return {
+        "pesanan_per_jam": statistik.pesanan_selesai / (durasi / 3600) if durasi else 0.0,
+        "rata_tunggu_mnt": statistics.fmean(data) / 60 if data else 0.0,
+        "p95_tunggu_mnt": data[int(len(data) * 0.95)] / 60 if data else 0.0,
+        "maks_tunggu_mnt": data[-1] / 60 if data else 0.0,
+        "rata_tunggu_vip_mnt": statistics.fmean(tunggu_vip) / 60 if tunggu_vip else 0.0,
+    }
+
+
+def jalankan_simulasi(pesanan, kebijakan):
+    kedatangan = [(w, pecah_tiket(p, prioritas)) for w, p, prioritas in pesanan]
+    vip = {p.id_pesanan for _, p, prioritas in pesanan if prioritas}
+    return ringkas(*simulasikan(kedatangan, STASIUN, kebijakan), vip)
+
+
+def jalankan_thread(pesanan, kebijakan, skala):
+    """Jalankan PenjadwalDapur sungguhan; kembalikan (pesanan/jam dapur, galat ETA rata-rata dalam menit)."""
+    dapur = PenjadwalDapur(STASIUN, kebijakan, skala_waktu=skala)
+    perkiraan = {}
+    selesai = {}
+    t0 = time.monotonic()
+    for waktu, p, prioritas in pesanan:
+        jeda = waktu * skala - (time.monotonic() - t0)
+        if jeda > 0:
+            time.sleep(jeda)
+        dapur.kirim(p, prioritas)
+        perkiraan[p.id_pesanan] = dapur.jam() + dapur.perkiraan().get(p.id_pesanan, 0.0)
+        for id_p in dapur.ambil_selesai():
+            selesai[id_p] = dapur.jam()
+    while len(selesai) < len(pesanan):
+        time.sleep(skala)
+        for id_p in dapur.ambil_selesai():
+            selesai[id_p] = dapur.jam()
+    durasi = dapur.jam()
+    dapur.berhenti()
+    # waktu selesai dicatat saat polling, jadi galat termasuk jeda polling
+    galat = statistics.fmean(abs(selesai[i] - perkiraan[i]) for i in selesai) / 60
+    return len(selesai) / (durasi / 3600), galat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bandingkan kebijakan penjadwalan dapur (throughput & waktu tunggu)")
+    parser.add_argument("--pesanan", type=int, default=5000)
+    parser.add_argument("--per-jam", type=float, default=16, help="laju kedatangan pesanan per jam")
+    parser.add_argument("--rasio-vip", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--thread", type=int, default=0, metavar="N",
+                        help="jalankan juga PenjadwalDapur ber-thread untuk N pesanan pertama")
+    parser.add_argument("--skala", type=float, default=0.0002, help="detik nyata per detik dapur (mode --thread)")
+    args = parser.parse_args(argv)
+
+    pesanan = buat_pesanan(args)
+    print(f"{args.pesanan:,} pesanan, {args.per_jam:g}/jam, stasiun {STASIUN}")
+    print(f"{'kebijakan':<10} {'pesanan/jam':>11} {'rata mnt':>9} {'p95 mnt':>8} {'maks mnt':>9} {'VIP mnt':>8}")
+    for kebijakan in KEBIJAKAN:
+        h = jalankan_simulasi(pesanan, kebijakan)
+        print(f"{kebijakan:<10} {h['pesanan_per_jam']:>11.1f} {h['rata_tunggu_mnt']:>9.1f} {h['p95_tunggu_mnt']:>8.1f} "
+              f"{h['maks_tunggu_mnt']:>9.1f} {h['rata_tunggu_vip_mnt']:>8.1f}")
+
+    if args.thread:
+        print(f"\nPenjadwalDapur ber-thread, {args.thread:,} pesanan (1 detik dapur = {args.skala * 1000:g} ms):")
+        for kebijakan in KEBIJAKAN:
+            per_jam, galat = jalankan_thread(buat_pesanan(args)[:args.thread], kebijakan, args.skala)
+            print(f"{kebijakan:<10} {per_jam:>11.1f} pesanan/jam, galat ETA rata-rata {galat:.1f} mnt")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
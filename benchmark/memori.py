@@ -0,0 +1,96 @@
+import argparse
+import gc
+import random
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+
+from Tugasakhir import BarisPesanan, ManajerRestoran, Pesanan
+
+# ===============================
+#  BENCHMARK MEMORI: representasi lama vs ringkas
+# ===============================
+# Membangun N baris item (default 1 juta) dalam pesanan berisi rata-rata
+# 5 baris, sekali dengan representasi lama (objek ber-__dict__ + baris dict
+# 4 kunci + catatan baru per input) dan sekali dengan representasi sekarang
+# (__slots__ + BarisPesanan + catatan di-intern). Memori diukur dengan
+# tracemalloc, hanya untuk objek yang dibuat selama pembangunan.
+
+CATATAN = ["", "", "", "pedas", "tidak pedas", "tanpa es", "es sedikit", "bungkus", "tanpa bawang"]
+
+
+class _PesananLama:
+    # salinan struktur Pesanan sebelum __slots__/BarisPesanan
+    def __init__(self, id_pesanan, nomor_meja, waktu_buat=None):
+        self.id_pesanan = id_pesanan
+        self.nomor_meja = nomor_meja
+        self.items = []
+        self.status = "aktif"
+        self.total_harga = 0
+        self.waktu_buat = waktu_buat or datetime.now()
+        self.waktu_selesai = None
+        self._kunci = threading.Lock()
+
+
+def _catatan_input(rng):
+    # teks dari Entry Tk / JSON selalu objek string baru, walau isinya sama
+    c = rng.choice(CATATAN)
+    return (c + ".")[:-1] if c else ""
+
+
+def _bangun(jumlah_baris, menu, lama, seed=1):
+    rng = random.Random(seed)
+    kelas = _PesananLama if lama else Pesanan
+    daftar = []
+    dibuat = 0
+    id_pesanan = 0
+    while dibuat < jumlah_baris:
+        id_pesanan += 1
+        p = kelas(id_pesanan, id_pesanan % 20 + 1)
+        for _ in range(min(rng.randint(1, 9), jumlah_baris - dibuat)):
+            m = rng.choice(menu)
+            jumlah = rng.randint(1, 4)
+            catatan = _catatan_input(rng)
+            subtotal = m.harga * jumlah
+            if lama:
+                p.items.append({"menu_item": m, "jumlah": jumlah, "catatan": catatan, "subtotal": subtotal})
+            else:
+                p.items.append(BarisPesanan.baru(m, jumlah, catatan, subtotal))
+            p.total_harga += subtotal
+            dibuat += 1
+        daftar.append(p)
+    return daftar
+
+
+def ukur(jumlah_baris, lama):
+    manajer = ManajerRestoran()
+    gc.collect()
+    tracemalloc.start()
+    daftar = _bangun(jumlah_baris, manajer.menu_items, lama)
+    terpakai, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    jumlah_pesanan = len(daftar)
+    del daftar
+    gc.collect()
+    return {"representasi": "lama" if lama else "ringkas", "baris": jumlah_baris,
+            "pesanan": jumlah_pesanan, "byte": terpakai, "puncak": puncak,
+            "byte_per_baris": terpakai / jumlah_baris}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bandingkan memori representasi pesanan lama vs ringkas")
+    parser.add_argument("--baris", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    hasil = [ukur(args.baris, lama=True), ukur(args.baris, lama=False)]
+    print(f"{'representasi':<12} {'baris':>10} {'pesanan':>9} {'MiB':>9} {'byte/baris':>11}")
+    for h in hasil:
+        print(f"{h['representasi']:<12} {h['baris']:>10,} {h['pesanan']:>9,} "
+              f"{h['byte'] / 2**20:>9.1f} {h['byte_per_baris']:>11.1f}")
+    print(f"hemat: {1 - hasil[1]['byte'] / hasil[0]['byte']:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+from Tugasakhir import MenuItem, Pesanan, atur_kunci_stok
+
+# ===============================
+#  STRESS TEST RESERVASI STOK (multithread)
+# ===============================
+# Banyak thread (terminal kasir) menambah & membatalkan item secara bersamaan
+# pada katalog yang sama, lalu sebagian pesanan diselesaikan (komit).
+# Setelah semua thread selesai diperiksa:
+#   - stok tidak pernah negatif
+#   - stok + direservasi + terjual == stok awal (tidak ada oversell / stok hilang)
+# Dijalankan dengan beberapa jumlah stripe lock; stripe=1 setara satu lock global.
+#
+# Catatan: di CPython dengan GIL thread Python tidak berjalan paralel, jadi
+# ops/detik tidak akan naik dengan jumlah thread dan tidak dipakai sebagai
+# ukuran skala. Yang dibandingkan antar stripe adalah rebutan lock (akuisisi
+# yang harus menunggu) dan total waktu tunggunya.
+
+
+class _KunciTerukur:
+    # pengganti Lock stripe: hitung akuisisi, yang harus menunggu, dan lama menunggu
+    __slots__ = ("_kunci", "akuisisi", "rebutan", "tunggu")
+
+    def __init__(self):
+        self._kunci = threading.Lock()
+        self.akuisisi = 0
+        self.rebutan = 0
+        self.tunggu = 0.0
+
+    def __enter__(self):
+        if self._kunci.acquire(blocking=False):
+            self.akuisisi += 1   # penghitung diubah sambil memegang lock, jadi aman
+            return self
+        t0 = time.perf_counter()
+        self._kunci.acquire()
+        self.akuisisi += 1
+        self.rebutan += 1
+        self.tunggu += time.perf_counter() - t0
+        return self
+
+    def __exit__(self, *exc):
+        self._kunci.release()
+
+
+def _pekerja(menu, pesanan_list, operasi, seed, mulai, hasil):
+    rng = random.Random(seed)
+    ok = gagal = 0
+    mulai.wait()
+    for _ in range(operasi):
+        pesanan = rng.choice(pesanan_list)
+        if pesanan.items and rng.random() < 0.3:
+            pesanan.hapus_item_index(len(pesanan.items) - 1)
+        elif pesanan.tambah_item(rng.choice(menu), rng.randint(1, 3)):
+            ok += 1
+        else:
+            gagal += 1
+    hasil.append((ok, gagal))
+
+
+def jalankan(jumlah_thread, stripe, jumlah_menu=200, stok_awal=40, operasi=20000, seed=1):
+    kunci = []
+
+    def _buat_kunci():
+        k = _KunciTerukur()
+        kunci.append(k)
+        return k
+
+    atur_kunci_stok(stripe, _buat_kunci)
+    menu = [MenuItem(i, f"Menu {i}", "makanan", 1000, stok_awal) for i in range(1, jumlah_menu + 1)]
+    mulai = threading.Barrier(jumlah_thread + 1)
+    hasil = []
+    semua_pesanan = []
+    threads = []
+    for t in range(jumlah_thread):
+        # setiap terminal punya pesanannya sendiri, katalog dipakai bersama
+        pesanan_list = [Pesanan(t * 100 + i, i + 1) for i in range(8)]
+        semua_pesanan.extend(pesanan_list)
+        threads.append(threading.Thread(target=_pekerja, args=(menu, pesanan_list, operasi // jumlah_thread,
+                                                                  seed + t, mulai, hasil)))
+    for th in threads:
+        th.start()
+    mulai.wait()
+    t0 = time.perf_counter()
+    for th in threads:
+        th.join()
+    durasi = time.perf_counter() - t0
+
+    # separuh pesanan diproses dapur -> reservasi dikomit
+    for p in semua_pesanan[::2]:
+        p.status = "selesai"
+        p.komit_stok()
+
+    terjual = {m.id: 0 for m in menu}
+    for p in semua_pesanan[::2]:
+        for it in p.items:
+            terjual[it.menu_item.id] += it.jumlah
+    invarian = all(m.stok >= 0 and m.stok + m.direservasi + terjual[m.id] == stok_awal for m in menu)
+    akuisisi = sum(k.akuisisi for k in kunci)
+    return {
+        "thread": jumlah_thread,
+        "stripe": stripe,
+        "ops_per_detik": operasi / durasi,
+        "akuisisi_lock": akuisisi,
+        "rebutan": sum(k.rebutan for k in kunci) / akuisisi if akuisisi else 0.0,
+        "tunggu_lock_ms": sum(k.tunggu for k in kunci) * 1000,
+        # rata-rata jumlah thread yang sedang menunggu lock sepanjang run
+        "rata_menunggu": sum(k.tunggu for k in kunci) / durasi,
+        "reservasi_ok": sum(h[0] for h in hasil),
+        "reservasi_gagal": sum(h[1] for h in hasil),
+        "stok_minimum": min(m.stok for m in menu),
+        "invarian_ok": invarian,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress test reservasi stok multithread")
+    parser.add_argument("--thread", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--stripe", type=int, nargs="+", default=[1, 64])
+    parser.add_argument("--menu", type=int, default=200)
+    parser.add_argument("--stok", type=int, default=40)
+    parser.add_argument("--operasi", type=int, default=40000)
+    args = parser.parse_args(argv)
+
+    # pergantian thread sesering mungkin supaya race condition benar-benar teruji
+    interval_lama = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"CPU: {os.cpu_count()}  GIL: {'aktif' if gil else 'nonaktif'}")
+    if gil:
+        print("GIL aktif: thread bergantian, bukan paralel; ops/detik bukan ukuran skala, "
+              "bandingkan rebutan & tunggu lock antar stripe")
+    try:
+        print(f"{'thread':>6} {'stripe':>6} {'ops/detik':>12} {'rebutan':>8} {'tunggu ms':>10} {'menunggu':>9} "
+              f"{'ok':>8} {'gagal':>8} {'stok min':>8}  invarian")
+        semua_ok = True
+        for stripe in args.stripe:
+            for n in args.thread:
+                h = jalankan(n, stripe, args.menu, args.stok, args.operasi)
+                semua_ok &= h["invarian_ok"]
+                print(f"{h['thread']:>6} {h['stripe']:>6} {h['ops_per_detik']:>12,.0f} {h['rebutan']:>8.2%} "
+                      f"{h['tunggu_lock_ms']:>10.1f} {h['rata_menunggu']:>9.2f} {h['reservasi_ok']:>8} "
+                      f"{h['reservasi_gagal']:>8} {h['stok_minimum']:>8}  {'OK' if h['invarian_ok'] else 'GAGAL'}")
+    finally:
+        sys.setswitchinterval(interval_lama)
+    return 0 if semua_ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,333 @@
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from ekspor import _waktu, pesanan_selesai
+
+# ===============================
+#  LAPORAN GABUNGAN MULTI-CABANG
+# ===============================
+# Map/reduce di atas ProcessPoolExecutor: setiap file cabang (hasil ekspor.py
+# csv/jsonl, boleh .gz, atau folder data restoran) dipecah menjadi potongan
+# byte (default 32 MB) yang dibaca dan diringkas oleh proses terpisah, lalu
+# ringkasan potongan digabung di proses utama. Ringkasan yang dikirim antar
+# proses kecil (total, per menu, per jam), jadi biaya pickle tidak bergantung
+# pada ukuran data.
+#
+#   python cabang.py jakarta.csv.gz bandung.jsonl surabaya=data/sby --mulai 2024-05-01 --sampai 2024-06-01
+#
+# Potongan mulai di baris pertama yang diawali di dalam rentangnya dan selesai
+# di baris yang melewati batas akhirnya, jadi setiap baris dibaca tepat sekali.
+# Baris CSV satu pesanan berurutan; pesanan yang terbelah dua potongan dikoreksi
+# saat reduce (id pesanan terakhir potongan sebelumnya == id pertama potongan
+# berikutnya). File .gz dan folder data tidak bisa di-seek, jadi satu file
+# .gz / satu folder = satu tugas (paralel antar file, bukan di dalam file);
+# isinya tetap dibaca per baris, jadi memori pekerja tidak bergantung pada
+# ukuran file. Catatan item bermultibaris (tidak bisa dari GUI) tidak didukung di CSV.
+
+UKURAN_POTONGAN = 32 << 20
+
+
+class Ringkasan:
+    """Agregat yang bisa digabung: total ala get_laporan_penjualan + rincian per menu dan per jam."""
+    __slots__ = ("total_penjualan", "jumlah_pesanan", "per_menu", "per_jam")
+
+    def __init__(self):
+        self.total_penjualan = 0
+        self.jumlah_pesanan = 0
+        self.per_menu = {}          # id menu -> [nama, jumlah, pendapatan]
+        self.per_jam = [0] * 24     # pendapatan per jam selesai (0-23)
+
+    def tambah_item(self, id_menu, nama, jumlah, subtotal, jam):
+        self.total_penjualan += subtotal
+        m = self.per_menu.get(id_menu)
+        if m is None:
+            self.per_menu[id_menu] = [nama, jumlah, subtotal]
+        else:
+            m[1] += jumlah
+            m[2] += subtotal
+        if jam is not None:
+            self.per_jam[jam] += subtotal
+
+    def gabung(self, lain):
+        self.total_penjualan += lain.total_penjualan
+        self.jumlah_pesanan += lain.jumlah_pesanan
+        for id_menu, (nama, jumlah, pendapatan) in lain.per_menu.items():
+            m = self.per_menu.get(id_menu)
+            if m is None:
+                self.per_menu[id_menu] = [nama, jumlah, pendapatan]
+            else:
+                m[1] += jumlah
+                m[2] += pendapatan
+        for j, v in enumerate(lain.per_jam):
+            self.per_jam[j] += v
+        return self
+
+    def laporan(self, top=None):
+        menu = sorted(self.per_menu.items(), key=lambda kv: (-kv[1][1], kv[0]))
+        if top is not None:
+            menu = menu[:top]
+        return {
+            "total_penjualan": self.total_penjualan,
+            "jumlah_pesanan": self.jumlah_pesanan,
+            "rata_rata": (self.total_penjualan / self.jumlah_pesanan) if self.jumlah_pesanan else 0,
+            "per_menu": [{"menu": i, "nama": n, "jumlah": j, "pendapatan": p} for i, (n, j, p) in menu],
+            "per_jam": self.per_jam,
+        }
+
+
+# ------------------
+# MAP: satu potongan -> Ringkasan
+# ------------------
+def _jam(waktu):
+    # "YYYY-MM-DD HH:MM:SS" (format ekspor) -> jam; "" (tanpa waktu) -> None
+    return int(waktu[11:13]) if len(waktu) >= 13 else None
+
+
+def _dalam_rentang(waktu, mulai, sampai):
+    # waktu berformat ISO seragam, jadi perbandingan string == perbandingan waktu
+    if mulai is not None and (not waktu or waktu < mulai):
+        return False
+    if sampai is not None and (not waktu or waktu >= sampai):
+        return False
+    return True
+
+
+def _baris_potongan(path, awal, akhir):
+    """
+    Baris-baris (teks) yang diawali di [awal, akhir); akhir None = sampai habis.
+    Dihasilkan satu per satu, jadi memori tidak bergantung pada ukuran potongan.
+    File .gz tidak bisa di-seek: seluruh file satu potongan, didekompresi sambil jalan.
+    """
+    if path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+            yield from f
+        return
+    with open(path, "rb") as f:
+        if awal:
+            # sisa baris yang dimulai sebelum awal milik potongan sebelumnya
+            f.seek(awal - 1)
+            f.readline()
+        posisi = f.tell()
+        for baris in f:
+            if akhir is not None and posisi >= akhir:
+                break
+            posisi += len(baris)
+            yield baris.decode("utf-8")
+
+
+def _kolom_csv(path):
+    buka = gzip.open if path.endswith(".gz") else open
+    with buka(path, "rt", encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f), [])
+    return {nama: i for i, nama in enumerate(header)}
+
+
+def _ringkas_csv(path, awal, akhir, mulai, sampai):
+    k = _kolom_csv(path)
+    i_id, i_selesai, i_menu, i_nama = k["id_pesanan"], k["waktu_selesai"], k["id_menu"], k["nama_menu"]
+    i_jumlah, i_subtotal = k["jumlah"], k["subtotal"]
+    r = Ringkasan()
+    id_awal = id_akhir = None
+    baris_iter = csv.reader(_baris_potongan(path, awal, akhir))
+    if not awal:
+        next(baris_iter, None)   # header
+    for baris in baris_iter:
+        if not baris:
+            continue
+        waktu = baris[i_selesai]
+        if not _dalam_rentang(waktu, mulai, sampai):
+            continue
+        id_p = baris[i_id]
+        if id_p != id_akhir:
+            r.jumlah_pesanan += 1
+            if id_awal is None:
+                id_awal = id_p
+            id_akhir = id_p
+        r.tambah_item(int(baris[i_menu]), baris[i_nama], int(baris[i_jumlah]), int(baris[i_subtotal]), _jam(waktu))
+    return r, id_awal, id_akhir
+
+
+def _ringkas_jsonl(path, awal, akhir, mulai, sampai):
+    r = Ringkasan()
+    for baris in _baris_potongan(path, awal, akhir):
+        if not baris.strip():
+            continue
+        d = json.loads(baris)
+        waktu = d["waktu_selesai"]
+        if not _dalam_rentang(waktu, mulai, sampai):
+            continue
+        r.jumlah_pesanan += 1
+        jam = _jam(waktu)
+        for it in d["items"]:
+            r.tambah_item(it["menu"], it["nama"], it["jumlah"], it["subtotal"], jam)
+    # satu pesanan = satu baris, tidak pernah terbelah antar potongan
+    return r, None, None
+
+
+def _ringkas_folder(path, mulai, sampai):
+    # diimpor di sini: hanya pekerja yang membaca folder data yang perlu memuat model
+    from Tugasakhir import ManajerRestoran
+    from penyimpanan import PenyimpananJurnal, PenyimpananSQLite
+
+    db = os.path.join(path, "restoran.db")
+    # baca-saja: folder cabang bisa sedang dipakai kasir; jangan snapshot / potong jurnal & arsip
+    if os.path.exists(db):
+        penyimpanan = PenyimpananSQLite(db, baca_saja=True)
+    else:
+        penyimpanan = PenyimpananJurnal(path, baca_saja=True)
+    manajer = ManajerRestoran(penyimpanan)
+    r = Ringkasan()
+    try:
+        for p in pesanan_selesai(manajer, mulai, sampai):
+            r.jumlah_pesanan += 1
+            jam = p.waktu_selesai.hour if p.waktu_selesai else None
+            for it in p.items:
+                r.tambah_item(it.menu_item.id, it.menu_item.nama, it.jumlah, it.subtotal, jam)
+    finally:
+        manajer.tutup()
+    return r, None, None
+
+
+def proses_potongan(tugas):
+    """Pekerja map: (cabang, path, jenis, awal, akhir, mulai, sampai) -> (cabang, path, Ringkasan, id_awal, id_akhir)."""
+    cabang, path, jenis, awal, akhir, mulai, sampai = tugas
+    if jenis == "folder":
+        hasil = _ringkas_folder(path, mulai, sampai)
+    else:
+        ringkas = _ringkas_csv if jenis == "csv" else _ringkas_jsonl
+        hasil = ringkas(path, awal, akhir, mulai and _waktu(mulai), sampai and _waktu(sampai))
+    return (cabang, path) + hasil
+
+
+# ------------------
+# PEMBAGIAN TUGAS + REDUCE
+# ------------------
+def _jenis(path):
+    if os.path.isdir(path):
+        return "folder"
+    nama = path[:-3] if path.endswith(".gz") else path
+    jenis = os.path.splitext(nama)[1].lstrip(".").lower()
+    if jenis not in ("csv", "jsonl"):
+        raise ValueError(f"Format file cabang tidak dikenal: {path} (csv, jsonl, .gz, atau folder data)")
+    return jenis
+
+
+def _nama_cabang(sumber):
+    """"nama=path" atau path saja (nama = nama file tanpa ekstensi / nama folder)."""
+    nama, sep, path = sumber.partition("=")
+    if sep and nama and not os.path.exists(sumber):
+        return nama, path
+    path = sumber.rstrip(os.sep)
+    nama = os.path.basename(path)
+    if nama.endswith(".gz"):
+        nama = nama[:-3]
+    if not os.path.isdir(path):
+        nama = os.path.splitext(nama)[0]
+    return nama, path
+
+
+def bagi_tugas(sumber, mulai=None, sampai=None, ukuran_potongan=UKURAN_POTONGAN):
+    """Potongan byte per file csv/jsonl; satu file .gz atau satu folder = satu tugas."""
+    tugas = []
+    for s in sumber:
+        cabang, path = _nama_cabang(s)
+        jenis = _jenis(path)
+        if jenis == "folder" or path.endswith(".gz"):
+            tugas.append((cabang, path, jenis, 0, None, mulai, sampai))
+            continue
+        ukuran = os.path.getsize(path)
+        for awal in range(0, max(ukuran, 1), ukuran_potongan):
+            tugas.append((cabang, path, jenis, awal, min(awal + ukuran_potongan, ukuran), mulai, sampai))
+    return tugas
+
+
+def gabung_cabang(sumber, mulai=None, sampai=None, proses=None, ukuran_potongan=UKURAN_POTONGAN):
+    """
+    Ringkas semua sumber secara paralel. Kembalikan (total, {cabang: Ringkasan}).
+    proses=1 menjalankan semuanya di proses ini (tanpa pool).
+    """
+    tugas = bagi_tugas(sumber, mulai, sampai, ukuran_potongan)
+    if proses == 1 or len(tugas) <= 1:
+        hasil_iter = map(proses_potongan, tugas)
+        return _reduce(hasil_iter)
+    with ProcessPoolExecutor(max_workers=proses) as pool:
+        # map menjaga urutan tugas: potongan satu file datang berurutan untuk koreksi batas
+        return _reduce(pool.map(proses_potongan, tugas))
+
+
+def _reduce(hasil_iter):
+    per_cabang = {}
+    id_terakhir = {}   # path -> id pesanan terakhir dari potongan sebelumnya
+    for cabang, path, r, id_awal, id_akhir in hasil_iter:
+        if id_awal is not None and id_awal == id_terakhir.get(path):
+            r.jumlah_pesanan -= 1   # pesanan terbelah: sudah dihitung di potongan sebelumnya
+        if id_akhir is not None:
+            id_terakhir[path] = id_akhir
+        if cabang in per_cabang:
+            per_cabang[cabang].gabung(r)
+        else:
+            per_cabang[cabang] = r
+    total = Ringkasan()
+    for r in per_cabang.values():
+        total.gabung(r)
+    return total, per_cabang
+
+
+def _tanggal(teks):
+    return datetime.fromisoformat(teks)
+
+
+def cetak(total, per_cabang, top):
+    print(f"{'cabang':<20} {'pesanan':>10} {'penjualan':>16} {'rata-rata':>12}")
+    for cabang in sorted(per_cabang):
+        lap = per_cabang[cabang].laporan(0)
+        print(f"{cabang:<20} {lap['jumlah_pesanan']:>10,} {lap['total_penjualan']:>16,} {lap['rata_rata']:>12,.0f}")
+    lap = total.laporan(top)
+    print(f"{'TOTAL':<20} {lap['jumlah_pesanan']:>10,} {lap['total_penjualan']:>16,} {lap['rata_rata']:>12,.0f}")
+
+    print(f"\n{top} menu terlaris:")
+    for m in lap["per_menu"]:
+        print(f"  {m['menu']:>6} {m['nama']:<28} {m['jumlah']:>10,} {m['pendapatan']:>16,}")
+
+    print("\nPenjualan per jam:")
+    puncak = max(lap["per_jam"]) or 1
+    for jam, nilai in enumerate(lap["per_jam"]):
+        if nilai:
+            print(f"  {jam:02d}:00 {nilai:>16,} {'#' * round(40 * nilai / puncak)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gabungkan laporan penjualan banyak cabang secara paralel")
+    parser.add_argument("sumber", nargs="+",
+                        help="file ekspor cabang (csv/jsonl, boleh .gz) atau folder data; 'nama=path' untuk menamai cabang")
+    parser.add_argument("--mulai", type=_tanggal, help="ISO, inklusif (mis. 2024-05-01)")
+    parser.add_argument("--sampai", type=_tanggal, help="ISO, eksklusif")
+    parser.add_argument("--proses", type=int, default=os.cpu_count(), help="jumlah proses pekerja (1 = tanpa pool)")
+    parser.add_argument("--potongan-mb", type=float, default=UKURAN_POTONGAN / (1 << 20), help="ukuran potongan file")
+    parser.add_argument("--top", type=int, default=10, help="jumlah menu terlaris yang ditampilkan")
+    parser.add_argument("--json", action="store_true", help="cetak hasil sebagai JSON")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    total, per_cabang = gabung_cabang(args.sumber, args.mulai, args.sampai, args.proses,
+                                      max(1, int(args.potongan_mb * (1 << 20))))
+    durasi = time.perf_counter() - t0
+    if args.json:
+        hasil = total.laporan(args.top)
+        hasil["cabang"] = {c: r.laporan(0) for c, r in sorted(per_cabang.items())}
+        print(json.dumps(hasil, ensure_ascii=False, indent=2))
+    else:
+        cetak(total, per_cabang, args.top)
+        print(f"\n{len(per_cabang)} cabang diringkas dalam {durasi:.2f} s ({args.proses} proses)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
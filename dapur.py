@@ -0,0 +1,385 @@
+import heapq
+import threading
+import time
+from collections import Counter, deque
+from itertools import count
+
+# ===============================
+#  PENJADWAL DAPUR MULTI-STASIUN
+# ===============================
+# Pesanan dipecah menjadi tiket per stasiun (MenuItem.STASIUN: "grill" untuk
+# Makanan, "minuman" untuk Minuman, "dapur" untuk menu lain). Tiap stasiun
+# punya antrian prioritas sendiri dan sekelompok thread pekerja yang
+# "memasak" dengan time.sleep: waktu masak disimulasikan dalam detik dapur,
+# skala_waktu=0.01 berarti 1 menit dapur = 0.6 detik nyata. Pesanan selesai
+# ketika semua tiketnya selesai. Item yang ditambah/dihapus setelah pesanan
+# masuk dapur dipecah ulang lewat perbarui(): tiket yang belum dimasak diubah
+# atau dibatalkan, porsi baru yang stasiunnya sudah mulai memasak jadi tiket
+# tambahan.
+#
+# Kebijakan urutan tiket dalam satu stasiun:
+#   fifo       urutan masuk
+#   sjf        waktu masak terpendek dulu (shortest job first)
+#   prioritas  prioritas pesanan tertinggi dulu, lalu sjf
+
+STASIUN = {"grill": 2, "minuman": 1, "dapur": 1}   # nama -> jumlah pekerja
+# waktu masak satu tiket dalam detik dapur: (dasar, per porsi)
+WAKTU_MASAK = {"grill": (180, 60), "minuman": (20, 15), "dapur": (120, 40)}
+KEBIJAKAN = {
+    "fifo": lambda t: (t.seq,),
+    "sjf": lambda t: (t.durasi, t.seq),
+    "prioritas": lambda t: (-t.prioritas, t.durasi, t.seq),
+}
+
+
+class Tiket:
+    __slots__ = ("id_pesanan", "stasiun", "baris", "durasi", "prioritas", "seq", "kunci",
+                 "masuk", "mulai", "selesai", "batal")
+
+    def __init__(self, id_pesanan, stasiun, baris, durasi, prioritas=0):
+        self.id_pesanan = id_pesanan
+        self.stasiun = stasiun
+        self.baris = baris          # [(nama menu, jumlah)]
+        self.durasi = durasi        # detik dapur
+        self.prioritas = prioritas
+        self.seq = None
+        self.kunci = None           # kunci heap yang berlaku; entri heap dengan kunci lain sudah basi
+        self.masuk = self.mulai = self.selesai = None
+        self.batal = False
+
+    def __repr__(self):
+        return f"Tiket(#{self.id_pesanan} {self.stasiun} {self.durasi}s)"
+
+
+def pecah_tiket(pesanan, prioritas=0, waktu_masak=WAKTU_MASAK):
+    """Satu tiket per stasiun yang dibutuhkan pesanan; durasi = dasar + per porsi * jumlah porsi."""
+    per_stasiun = {}
+    for it in pesanan.items:
+        per_stasiun.setdefault(getattr(it.menu_item, "STASIUN", "dapur"), []).append((it.menu_item.nama, it.jumlah))
+    tiket = []
+    for stasiun, baris in per_stasiun.items():
+        dasar, per_porsi = waktu_masak.get(stasiun, WAKTU_MASAK["dapur"])
+        tiket.append(Tiket(pesanan.id_pesanan, stasiun, baris, dasar + per_porsi * sum(j for _, j in baris), prioritas))
+    return tiket
+
+
+class StatistikDapur:
+    def __init__(self):
+        self.pesanan_selesai = 0
+        self.tiket_selesai = 0
+        self.total_tunggu = 0.0      # masuk dapur -> semua tiket selesai, per pesanan
+        self.maks_tunggu = 0.0
+        self.total_antre = 0.0       # masuk -> mulai dimasak, per tiket
+        self.sibuk = {}              # stasiun -> total detik dapur pekerja memasak
+
+    def catat_tiket(self, tiket):
+        self.tiket_selesai += 1
+        self.total_antre += tiket.mulai - tiket.masuk
+        self.sibuk[tiket.stasiun] = self.sibuk.get(tiket.stasiun, 0) + tiket.durasi
+
+    def catat_pesanan(self, tunggu):
+        self.pesanan_selesai += 1
+        self.total_tunggu += tunggu
+        self.maks_tunggu = max(self.maks_tunggu, tunggu)
+
+    def ke_dict(self):
+        n = self.pesanan_selesai
+        return {
+            "pesanan_selesai": n,
+            "tiket_selesai": self.tiket_selesai,
+            "rata_tunggu": self.total_tunggu / n if n else 0.0,
+            "maks_tunggu": self.maks_tunggu,
+            "rata_antre_tiket": self.total_antre / self.tiket_selesai if self.tiket_selesai else 0.0,
+            "sibuk": dict(self.sibuk),
+        }
+
+
+class PenjadwalDapur:
+    """
+    Penjadwal dapur dengan thread pekerja per stasiun. Semua state dilindungi
+    satu lock; tiap stasiun punya Condition sendiri di atas lock itu, jadi
+    pekerja grill tidak dibangunkan oleh tiket minuman. Pesanan yang selesai
+    dikumpulkan dan diambil lewat ambil_selesai() (GUI memanggilnya dari
+    root.after), atau diteruskan ke saat_selesai(id) dari thread pekerja.
+    """
+    def __init__(self, stasiun=STASIUN, kebijakan="fifo", waktu_masak=WAKTU_MASAK, skala_waktu=0.01,
+                 saat_selesai=None):
+        if kebijakan not in KEBIJAKAN:
+            raise ValueError(f"Kebijakan dapur tidak dikenal: {kebijakan} (pilih {', '.join(KEBIJAKAN)})")
+        if skala_waktu <= 0:
+            raise ValueError("skala_waktu harus > 0")
+        self.stasiun = dict(stasiun)
+        self.kebijakan = kebijakan
+        self.waktu_masak = waktu_masak
+        self.skala_waktu = skala_waktu
+        self.saat_selesai = saat_selesai
+        self.statistik = StatistikDapur()
+
+        self._urut = KEBIJAKAN[kebijakan]
+        self._kunci = threading.Lock()
+        self._cv = {s: threading.Condition(self._kunci) for s in self.stasiun}
+        self._antrian = {s: [] for s in self.stasiun}      # heap (kunci, tiket), bisa berisi entri basi
+        self._dimasak = {s: set() for s in self.stasiun}   # tiket yang sedang dimasak
+        self._tiket = {}       # id_pesanan -> [Tiket] (pesanan yang masih di dapur)
+        self._masuk = {}       # id_pesanan -> jam masuk dapur
+        self._selesai = deque()
+        self._seq = count()
+        self._t0 = time.monotonic()
+        self._berhenti = False
+        self._pekerja = [threading.Thread(target=self._kerja, args=(s,), name=f"dapur-{s}-{i}", daemon=True)
+                         for s, n in self.stasiun.items() for i in range(n)]
+        for t in self._pekerja:
+            t.start()
+
+    def jam(self):
+        """Detik dapur sejak penjadwal dibuat."""
+        return (time.monotonic() - self._t0) / self.skala_waktu
+
+    def __contains__(self, id_pesanan):
+        with self._kunci:
+            return id_pesanan in self._tiket
+
+    def __len__(self):
+        with self._kunci:
+            return len(self._tiket)
+
+    def kirim(self, pesanan, prioritas=0):
+        """Masukkan pesanan ke dapur. False jika pesanan sudah ada di dapur."""
+        tiket = pecah_tiket(pesanan, prioritas, self.waktu_masak)
+        with self._kunci:
+            if pesanan.id_pesanan in self._tiket:
+                return False
+            sekarang = self.jam()
+            self._masuk[pesanan.id_pesanan] = sekarang
+            if not tiket:
+                # pesanan tanpa item langsung dianggap siap
+                self._selesai.append(pesanan.id_pesanan)
+                self.statistik.catat_pesanan(0.0)
+                return True
+            self._tiket[pesanan.id_pesanan] = tiket
+            for t in tiket:
+                self._antrekan(t, sekarang)
+        return True
+
+    def perbarui(self, pesanan):
+        """
+        Pecah ulang pesanan yang itemnya berubah setelah masuk dapur. Per stasiun,
+        porsi yang sudah/sedang dimasak dikurangkan dari isi pesanan; sisanya
+        mengganti tiket yang masih antre, atau jadi tiket baru jika belum ada.
+        Porsi yang dihapus setelah mulai dimasak tidak bisa ditarik lagi.
+        False jika pesanan tidak sedang di dapur.
+        """
+        baru = {}
+        for t in pecah_tiket(pesanan, 0, self.waktu_masak):
+            baru.setdefault(self._stasiun_ada(t.stasiun), []).extend(t.baris)
+        with self._kunci:
+            lama = self._tiket.get(pesanan.id_pesanan)
+            if lama is None:
+                return False
+            sekarang = self.jam()
+            prioritas = max(t.prioritas for t in lama)
+            daftar = []
+            for stasiun in {t.stasiun for t in lama} | set(baru):
+                jalan = [t for t in lama if t.stasiun == stasiun and t.mulai is not None]
+                antre = [t for t in lama if t.stasiun == stasiun and t.mulai is None]
+                sisa = Counter()
+                for nama, jumlah in baru.get(stasiun, ()):
+                    sisa[nama] += jumlah
+                for t in jalan:
+                    for nama, jumlah in t.baris:
+                        sisa[nama] -= jumlah
+                baris = [(nama, jumlah) for nama, jumlah in sisa.items() if jumlah > 0]
+                daftar += jalan
+                if not baris:
+                    for t in antre:
+                        t.batal = True
+                    continue
+                dasar, per_porsi = self.waktu_masak.get(stasiun, WAKTU_MASAK["dapur"])
+                durasi = dasar + per_porsi * sum(j for _, j in baris)
+                if antre:
+                    t = antre[0]
+                    for lain in antre[1:]:
+                        lain.batal = True
+                    t.baris, t.durasi = baris, durasi
+                    kunci = self._urut(t)
+                    if kunci != t.kunci:
+                        # entri heap lama jadi basi (kunci beda), lihat _ambil
+                        t.kunci = kunci
+                        heapq.heappush(self._antrian[stasiun], (kunci, t))
+                else:
+                    t = Tiket(pesanan.id_pesanan, stasiun, baris, durasi, prioritas)
+                    self._antrekan(t, sekarang)
+                daftar.append(t)
+            self._tiket[pesanan.id_pesanan] = daftar
+            if all(t.selesai is not None for t in daftar):
+                # tidak ada yang tersisa untuk dimasak (mis. item yang belum dimasak dihapus)
+                del self._tiket[pesanan.id_pesanan]
+                self.statistik.catat_pesanan(sekarang - self._masuk.pop(pesanan.id_pesanan))
+                self._selesai.append(pesanan.id_pesanan)
+        return True
+
+    def _stasiun_ada(self, stasiun):
+        # stasiun yang tidak dikonfigurasi dimasak di stasiun umum
+        if stasiun in self._antrian:
+            return stasiun
+        return "dapur" if "dapur" in self._antrian else next(iter(self._antrian))
+
+    def _antrekan(self, t, sekarang):
+        # dipanggil dengan self._kunci dipegang
+        t.stasiun = self._stasiun_ada(t.stasiun)
+        t.masuk = sekarang
+        t.seq = next(self._seq)
+        t.kunci = self._urut(t)
+        heapq.heappush(self._antrian[t.stasiun], (t.kunci, t))
+        self._cv[t.stasiun].notify()
+
+    def prioritaskan(self, id_pesanan, prioritas=1):
+        """Naikkan prioritas tiket pesanan yang belum dimasak (berlaku untuk kebijakan 'prioritas')."""
+        with self._kunci:
+            for t in self._tiket.get(id_pesanan, ()):
+                if t.mulai is None and not t.batal:
+                    t.prioritas = prioritas
+                    kunci = self._urut(t)
+                    if kunci != t.kunci:
+                        t.kunci = kunci
+                        heapq.heappush(self._antrian[t.stasiun], (kunci, t))
+            return id_pesanan in self._tiket
+
+    def batalkan(self, id_pesanan):
+        # tiket yang sedang dimasak tetap selesai dimasak, hasilnya diabaikan
+        with self._kunci:
+            tiket = self._tiket.pop(id_pesanan, None)
+            self._masuk.pop(id_pesanan, None)
+            for t in tiket or ():
+                t.batal = True
+            return tiket is not None
+
+    def ambil_selesai(self):
+        """Id pesanan yang sudah selesai dimasak sejak pemanggilan terakhir."""
+        with self._kunci:
+            hasil = list(self._selesai)
+            self._selesai.clear()
+        return hasil
+
+    def _ambil(self, stasiun):
+        heap = self._antrian[stasiun]
+        while heap:
+            kunci, t = heapq.heappop(heap)
+            if not t.batal and t.mulai is None and kunci == t.kunci:
+                return t
+        return None
+
+    def _kerja(self, stasiun):
+        cv = self._cv[stasiun]
+        while True:
+            with cv:
+                tiket = self._ambil(stasiun)
+                while tiket is None:
+                    if self._berhenti:
+                        return
+                    cv.wait()
+                    tiket = self._ambil(stasiun)
+                tiket.mulai = self.jam()
+                self._dimasak[stasiun].add(tiket)
+            time.sleep(tiket.durasi * self.skala_waktu)
+            selesai = False
+            with self._kunci:
+                tiket.selesai = self.jam()
+                self._dimasak[stasiun].discard(tiket)
+                if tiket.batal:
+                    continue
+                self.statistik.catat_tiket(tiket)
+                daftar = self._tiket[tiket.id_pesanan]
+                if all(t.selesai is not None for t in daftar):
+                    del self._tiket[tiket.id_pesanan]
+                    self.statistik.catat_pesanan(tiket.selesai - self._masuk.pop(tiket.id_pesanan))
+                    self._selesai.append(tiket.id_pesanan)
+                    selesai = True
+            if selesai and self.saat_selesai is not None:
+                self.saat_selesai(tiket.id_pesanan)
+
+    def perkiraan(self):
+        """
+        ETA (detik dapur dari sekarang) untuk setiap pesanan di dapur. Tiap
+        stasiun disimulasikan: pekerja bebas saat tiket yang sedang dimasak
+        selesai, lalu tiket antre dibagikan sesuai urutan kebijakan.
+        O(q log q) per stasiun untuk q tiket antre.
+        """
+        eta = {}
+        with self._kunci:
+            sekarang = self.jam()
+            for stasiun, n in self.stasiun.items():
+                bebas = [max(0.0, t.mulai + t.durasi - sekarang) for t in self._dimasak[stasiun] if not t.batal]
+                for t in self._dimasak[stasiun]:
+                    if not t.batal:
+                        eta[t.id_pesanan] = max(eta.get(t.id_pesanan, 0.0), t.mulai + t.durasi - sekarang)
+                bebas += [0.0] * max(0, n - len(bebas))
+                heapq.heapify(bebas)
+                for kunci, t in sorted(self._antrian[stasiun], key=lambda e: e[0]):
+                    if t.batal or t.mulai is not None or kunci != t.kunci:
+                        continue
+                    akhir = heapq.heappop(bebas) + t.durasi
+                    heapq.heappush(bebas, akhir)
+                    eta[t.id_pesanan] = max(eta.get(t.id_pesanan, 0.0), akhir)
+        return eta
+
+    def berhenti(self, tunggu=True):
+        # pekerja keluar setelah tiket yang sedang dimasak; tiket antre ditinggalkan
+        with self._kunci:
+            self._berhenti = True
+            for cv in self._cv.values():
+                cv.notify_all()
+        if tunggu:
+            for t in self._pekerja:
+                t.join()
+
+
+def simulasikan(kedatangan, stasiun=STASIUN, kebijakan="fifo"):
+    """
+    Simulasi event diskret (tanpa thread/sleep, deterministik) dengan aturan
+    yang sama dengan PenjadwalDapur. kedatangan = [(waktu, [Tiket])] terurut
+    waktu. Kembalikan (StatistikDapur, durasi_total, {id_pesanan: tunggu}).
+    """
+    urut = KEBIJAKAN[kebijakan]
+    antre = {s: [] for s in stasiun}
+    bebas = dict(stasiun)
+    kejadian = []      # (waktu selesai, seq, tiket)
+    sisa, masuk, tunggu = {}, {}, {}
+    statistik = StatistikDapur()
+    seq = count()
+    sekarang = 0.0
+
+    def mulai_masak(s):
+        while bebas[s] and antre[s]:
+            _, t = heapq.heappop(antre[s])
+            bebas[s] -= 1
+            t.mulai = sekarang
+            heapq.heappush(kejadian, (sekarang + t.durasi, next(seq), t))
+
+    i = 0
+    while i < len(kedatangan) or kejadian:
+        if kejadian and (i == len(kedatangan) or kejadian[0][0] <= kedatangan[i][0]):
+            sekarang, _, t = heapq.heappop(kejadian)
+            t.selesai = sekarang
+            bebas[t.stasiun] += 1
+            statistik.catat_tiket(t)
+            sisa[t.id_pesanan] -= 1
+            if not sisa[t.id_pesanan]:
+                tunggu[t.id_pesanan] = sekarang - masuk[t.id_pesanan]
+                statistik.catat_pesanan(tunggu[t.id_pesanan])
+            mulai_masak(t.stasiun)
+        else:
+            sekarang, tiket = kedatangan[i]
+            i += 1
+            if not tiket:
+                continue
+            masuk[tiket[0].id_pesanan] = sekarang
+            sisa[tiket[0].id_pesanan] = len(tiket)
+            for t in tiket:
+                t.masuk = sekarang
+                t.seq = next(seq)
+                t.kunci = urut(t)
+                heapq.heappush(antre[t.stasiun], (t.kunci, t))
+            for s in {t.stasiun for t in tiket}:
+                mulai_masak(s)
+    return statistik, sekarang, tunggu
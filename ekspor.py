@@ -0,0 +1,140 @@
+import argparse
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+
+# ===============================
+#  EKSPOR MASSAL NOTA (tanpa GUI)
+# ===============================
+# Pipeline generator: pesanan selesai -> filter tanggal -> format -> file.
+# Hanya satu pesanan yang diproses pada satu waktu, jadi memori tetap
+# konstan berapa pun jumlah nota yang diekspor.
+#
+#   csv    satu baris per item pesanan (cocok untuk spreadsheet/akuntansi)
+#   jsonl  satu objek JSON per pesanan
+#   txt    arsip nota (teks sama dengan "Simpan Nota ke File"), dipisah garis
+#
+# Nama file berakhiran .gz otomatis dikompres gzip.
+
+FORMAT = ("csv", "jsonl", "txt")
+KOLOM_CSV = ["id_pesanan", "meja", "meja_gabungan", "waktu_buat", "waktu_selesai", "id_menu", "nama_menu",
+             "jumlah", "catatan", "subtotal", "total_pesanan"]
+PEMISAH_NOTA = "\n" + "=" * 36 + "\n\n"
+UKURAN_BUFFER = 1 << 20
+
+
+def pesanan_selesai(manajer, mulai=None, sampai=None):
+    """Pesanan selesai dengan mulai <= waktu_selesai < sampai (batas None = terbuka), termasuk nota di arsip."""
+    return manajer.iter_nota(mulai, sampai)
+
+
+def _waktu(w):
+    return w.isoformat(sep=" ", timespec="seconds") if w else ""
+
+
+def baris_csv(pesanan_iter):
+    for p in pesanan_iter:
+        for it in p.items:
+            yield [p.id_pesanan, p.nomor_meja, "+".join(map(str, p.meja_gabungan)),
+                   _waktu(p.waktu_buat), _waktu(p.waktu_selesai),
+                   it.menu_item.id, it.menu_item.nama, it.jumlah, it.catatan, it.subtotal, p.total_harga]
+
+
+def baris_jsonl(pesanan_iter):
+    for p in pesanan_iter:
+        d = {
+            "id": p.id_pesanan, "meja": p.nomor_meja, "label_meja": p.label_meja,
+            "waktu_buat": _waktu(p.waktu_buat), "waktu_selesai": _waktu(p.waktu_selesai),
+            "items": [{"menu": it.menu_item.id, "nama": it.menu_item.nama, "jumlah": it.jumlah,
+                       "catatan": it.catatan, "subtotal": it.subtotal} for it in p.items],
+            "total": p.total_harga,
+        }
+        yield json.dumps(d, ensure_ascii=False) + "\n"
+
+
+def blok_txt(pesanan_iter):
+    # render tanpa mengisi cache nota GUI; ekspor ribuan nota tidak menggeser nota yang sedang dibuka
+    for p in pesanan_iter:
+        yield p.get_nota_text(pakai_cache=False) + PEMISAH_NOTA
+
+
+def _buka(path, kompres):
+    if kompres:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="", buffering=UKURAN_BUFFER)
+
+
+def ekspor_nota(manajer, path, format=None, mulai=None, sampai=None, kompres=None):
+    """
+    Ekspor semua nota (pesanan selesai) ke path. Format dan gzip ditebak dari
+    ekstensi jika tidak diberikan (mis. nota.csv.gz). Ditulis ke file sementara
+    lalu di-rename, jadi file lama tidak pernah setengah tertulis.
+    Kembalikan jumlah pesanan yang diekspor.
+    """
+    nama = path[:-3] if path.endswith(".gz") else path
+    if kompres is None:
+        kompres = path.endswith(".gz")
+    if format is None:
+        format = os.path.splitext(nama)[1].lstrip(".").lower() or "txt"
+    if format not in FORMAT:
+        raise ValueError(f"Format ekspor tidak dikenal: {format} (pilih {', '.join(FORMAT)})")
+
+    jumlah = 0
+
+    def hitung(pesanan_iter):
+        nonlocal jumlah
+        for p in pesanan_iter:
+            jumlah += 1
+            yield p
+
+    sumber = hitung(pesanan_selesai(manajer, mulai, sampai))
+    tmp = path + ".tmp"
+    try:
+        with _buka(tmp, kompres) as f:
+            if format == "csv":
+                w = csv.writer(f)
+                w.writerow(KOLOM_CSV)
+                w.writerows(baris_csv(sumber))
+            elif format == "jsonl":
+                f.writelines(baris_jsonl(sumber))
+            else:
+                f.writelines(blok_txt(sumber))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return jumlah
+
+
+def _tanggal(teks):
+    return datetime.fromisoformat(teks)
+
+
+if __name__ == '__main__':
+    # diimpor di sini supaya GUI (Tugasakhir) bisa memakai ekspor_nota tanpa impor melingkar
+    from Tugasakhir import ManajerRestoran, DIREKTORI_DATA
+    from penyimpanan import PenyimpananJurnal, PenyimpananSQLite
+
+    parser = argparse.ArgumentParser(description="Ekspor semua nota pesanan selesai (CSV/JSONL/arsip teks)")
+    parser.add_argument("output", help="file tujuan, mis. nota.csv, nota.jsonl.gz, arsip.txt")
+    parser.add_argument("--format", choices=FORMAT, help="default: dari ekstensi file")
+    parser.add_argument("--mulai", type=_tanggal, help="ISO, inklusif (mis. 2024-05-01)")
+    parser.add_argument("--sampai", type=_tanggal, help="ISO, eksklusif")
+    parser.add_argument("--gzip", action="store_true", default=None, help="paksa kompres gzip")
+    parser.add_argument("--data", default=DIREKTORI_DATA, help="folder jurnal + snapshot")
+    parser.add_argument("--sqlite", action="store_true", help="baca dari restoran.db di folder data")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        penyimpanan = PenyimpananSQLite(os.path.join(args.data, "restoran.db"), baca_saja=True)
+    else:
+        penyimpanan = PenyimpananJurnal(args.data, baca_saja=True)
+    manajer = ManajerRestoran(penyimpanan)
+    try:
+        n = ekspor_nota(manajer, args.output, args.format, args.mulai, args.sampai, args.gzip)
+    finally:
+        manajer.tutup()
+    print(f"{n} nota diekspor ke {args.output}")
@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+# ===============================
+#  INSTRUMENTASI (opt-in)
+# ===============================
+# Mengukur jumlah panggilan dan latensi setiap method yang dipasangi, dalam
+# histogram log2 (bucket ke-i = durasi < 2^i mikrodetik). Dipasang per
+# instance (bukan per kelas), jadi tanpa --diagnostik tidak ada overhead sama sekali.
+
+JUMLAH_BUCKET = 32
+
+
+class Histogram:
+    def __init__(self):
+        self.jumlah = 0
+        self.total_ns = 0
+        self.maks_ns = 0
+        self.bucket = [0] * JUMLAH_BUCKET
+
+    def catat(self, durasi_ns):
+        self.jumlah += 1
+        self.total_ns += durasi_ns
+        if durasi_ns > self.maks_ns:
+            self.maks_ns = durasi_ns
+        self.bucket[min((durasi_ns // 1000).bit_length(), JUMLAH_BUCKET - 1)] += 1
+
+    def persentil(self, p):
+        """Batas atas (mikrodetik) bucket tempat persentil p jatuh."""
+        if not self.jumlah:
+            return 0
+        target = p * self.jumlah
+        kumulatif = 0
+        for i, n in enumerate(self.bucket):
+            kumulatif += n
+            if kumulatif >= target:
+                return min(1 << i, self.maks_ns // 1000 + 1)
+        return self.maks_ns // 1000 + 1
+
+    def ke_dict(self):
+        return {
+            "jumlah": self.jumlah,
+            "total_ms": self.total_ns / 1e6,
+            "rata_us": self.total_ns / self.jumlah / 1000 if self.jumlah else 0,
+            "p50_us": self.persentil(0.5),
+            "p99_us": self.persentil(0.99),
+            "maks_us": self.maks_ns / 1000,
+            "bucket": self.bucket,
+        }
+
+
+class Instrumentasi:
+    def __init__(self):
+        self.metrik = {}   # nama -> Histogram
+        self._kunci = threading.Lock()
+        self.mulai = time.time()
+
+    def catat(self, nama, durasi_ns):
+        with self._kunci:
+            h = self.metrik.get(nama)
+            if h is None:
+                h = self.metrik[nama] = Histogram()
+            h.catat(durasi_ns)
+
+    def bungkus(self, nama, fungsi):
+        catat = self.catat
+        perf = time.perf_counter_ns
+
+        @wraps(fungsi)
+        def terukur(*args, **kwargs):
+            t0 = perf()
+            try:
+                return fungsi(*args, **kwargs)
+            finally:
+                catat(nama, perf() - t0)
+        return terukur
+
+    def pasang(self, obj, kelompok, nama_method):
+        """Ganti method obj (atribut instance) dengan versi terukur bernama 'kelompok.method'."""
+        for nama in nama_method:
+            setattr(obj, nama, self.bungkus(f"{kelompok}.{nama}", getattr(obj, nama)))
+
+    def pasang_publik(self, obj, kelompok, kecuali=()):
+        # semua method publik yang didefinisikan di kelas obj
+        nama = [n for n in dir(type(obj))
+                if not n.startswith("_") and n not in kecuali and callable(getattr(type(obj), n))]
+        self.pasang(obj, kelompok, nama)
+
+    def reset(self):
+        with self._kunci:
+            self.metrik = {}
+            self.mulai = time.time()
+
+    def ringkasan(self, awalan=None):
+        """[(nama, dict)] terurut dari total waktu terbesar."""
+        with self._kunci:
+            data = [(n, h.ke_dict()) for n, h in self.metrik.items() if awalan is None or n.startswith(awalan)]
+        return sorted(data, key=lambda x: x[1]["total_ms"], reverse=True)
+
+    def ke_dict(self):
+        return {"mulai": self.mulai, "durasi_detik": time.time() - self.mulai,
+                "metrik": dict(self.ringkasan())}
+
+    def simpan_json(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.ke_dict(), f, indent=2)
+        os.replace(tmp, path)
+
+
+class WatchdogTk:
+    """
+    Ukur macetnya event loop Tk: callback root.after dijadwalkan setiap
+    interval_ms, keterlambatannya dicatat sebagai 'tk.lag'. Keterlambatan
+    di atas ambang_ms dihitung sebagai stall ('tk.stall').
+    """
+    def __init__(self, root, instrumentasi, interval_ms=50, ambang_ms=100):
+        self.root = root
+        self.instrumentasi = instrumentasi
+        self.interval_ms = interval_ms
+        self.ambang_ns = ambang_ms * 1_000_000
+        self._berikut = None
+        self._id_after = None
+
+    def mulai(self):
+        self._berikut = time.perf_counter_ns() + self.interval_ms * 1_000_000
+        self._id_after = self.root.after(self.interval_ms, self._detak)
+        return self
+
+    def berhenti(self):
+        if self._id_after is not None:
+            self.root.after_cancel(self._id_after)
+            self._id_after = None
+
+    def _detak(self):
+        sekarang = time.perf_counter_ns()
+        lag = max(0, sekarang - self._berikut)
+        self.instrumentasi.catat("tk.lag", lag)
+        if lag >= self.ambang_ns:
+            self.instrumentasi.catat("tk.stall", lag)
+        self._berikut = sekarang + self.interval_ms * 1_000_000
+        self._id_after = self.root.after(self.interval_ms, self._detak)
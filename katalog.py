@@ -0,0 +1,238 @@
+import argparse
+import csv
+import json
+import os
+from itertools import islice
+
+# ===============================
+#  IMPOR KATALOG MENU (streaming)
+# ===============================
+# Membaca katalog CSV / JSON Lines / JSON array baris demi baris, memvalidasi
+# per batch, lalu meng-upsert ke ManajerRestoran lewat perbarui_katalog
+# (satu event jurnal per batch). Baris tidak valid dilewati dan dilaporkan.
+#
+# Kolom: id, nama, kategori, harga, stok
+#        [jenis (makanan/minuman), tingkat_kepedasan, ukuran, dingin]
+#
+# Mode delta (muat ulang harga/stok): hanya id + kolom yang berubah yang wajib
+# ada; stok "+5" / "-3" berarti relatif terhadap stok sekarang.
+#
+# Stok absolut adalah stok yang masih bisa dipesan (MenuItem.stok), di luar
+# porsi yang sedang direservasi pesanan aktif; reservasi itu tetap berjalan
+# dan dikembalikan ke stok bila pesanannya dibatalkan. Dengan begitu katalog
+# hasil ke_dict bisa diimpor ulang apa adanya. Hasil hitung fisik (porsi
+# yang direservasi masih ada di gudang) dikurangi reservasi dulu, atau
+# dimuat sebagai delta.
+
+UKURAN_BATCH = 1000
+UKURAN_CHUNK = 1 << 16
+BENAR = ("1", "true", "ya", "y", "yes")
+
+
+class ErrorKatalog(ValueError):
+    pass
+
+
+class HasilImpor:
+    def __init__(self):
+        self.dibaca = 0
+        self.baru = 0
+        self.berubah = 0
+        self.ditolak = []   # [(nomor_baris, pesan)], dibatasi supaya memori tetap kecil
+        self.jumlah_ditolak = 0
+
+    def tolak(self, nomor, pesan, batas=100):
+        self.jumlah_ditolak += 1
+        if len(self.ditolak) < batas:
+            self.ditolak.append((nomor, pesan))
+
+    def __str__(self):
+        teks = (f"{self.dibaca} baris dibaca: {self.baru} menu baru, {self.berubah} diperbarui, "
+                f"{self.jumlah_ditolak} ditolak")
+        for nomor, pesan in self.ditolak[:10]:
+            teks += f"\n  baris {nomor}: {pesan}"
+        return teks
+
+
+# ------------------
+# Pembaca (generator (nomor_baris, dict))
+# ------------------
+def _baca_csv(f):
+    for nomor, baris in enumerate(csv.DictReader(f), start=2):
+        yield nomor, {k.strip().lower(): v.strip() for k, v in baris.items() if k and v is not None and v.strip() != ""}
+
+
+def _baca_jsonl(f):
+    for nomor, baris in enumerate(f, start=1):
+        if baris.strip():
+            try:
+                yield nomor, json.loads(baris)
+            except json.JSONDecodeError as e:
+                yield nomor, e
+
+
+def _baca_json_array(f):
+    # array JSON besar dibaca per chunk; tiap elemen di-decode satu per satu
+    dekoder = json.JSONDecoder()
+    buf = f.read(UKURAN_CHUNK).lstrip()
+    if not buf.startswith("["):
+        raise ErrorKatalog("Katalog JSON harus berupa array objek")
+    buf = buf[1:]
+    nomor = 0
+    eof = False
+    while True:
+        buf = buf.lstrip()
+        if buf.startswith(","):
+            buf = buf[1:].lstrip()
+        if buf.startswith("]"):
+            return
+        try:
+            if not buf:
+                raise json.JSONDecodeError("data habis", buf, 0)
+            obj, akhir = dekoder.raw_decode(buf)
+        except json.JSONDecodeError:
+            if eof:
+                raise ErrorKatalog(f"Katalog JSON rusak/terpotong setelah elemen ke-{nomor}")
+            lagi = f.read(UKURAN_CHUNK)
+            eof = not lagi
+            buf += lagi
+            continue
+        nomor += 1
+        yield nomor, obj
+        buf = buf[akhir:]
+
+
+PEMBACA = {"csv": _baca_csv, "jsonl": _baca_jsonl, "ndjson": _baca_jsonl, "json": _baca_json_array}
+
+
+def baca_katalog(path, format=None):
+    format = (format or os.path.splitext(path)[1].lstrip(".")).lower()
+    if format not in PEMBACA:
+        raise ErrorKatalog(f"Format katalog tidak dikenal: {format} (pilih csv, jsonl, json)")
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        yield from PEMBACA[format](f)
+
+
+# ------------------
+# Validasi
+# ------------------
+def _int(nilai, nama, minimum=0):
+    if isinstance(nilai, bool):
+        raise ValueError(f"{nama} harus angka")
+    try:
+        n = int(nilai)
+    except (TypeError, ValueError):
+        raise ValueError(f"{nama} harus angka bulat, bukan {nilai!r}")
+    if n < minimum:
+        raise ValueError(f"{nama} tidak boleh < {minimum}")
+    return n
+
+
+def normalisasi(baris, lama=None):
+    """
+    Ubah satu baris mentah menjadi dict format MenuItem.ke_dict. lama = dict
+    item yang sudah ada (mode delta): kolom yang tidak diisi diambil dari situ.
+    stok absolut = stok yang bisa dipesan, tanpa porsi yang direservasi.
+    Melempar ValueError jika baris tidak valid.
+    """
+    if not isinstance(baris, dict):
+        raise ValueError("baris harus objek")
+    d = dict(lama) if lama else {}
+    d["id"] = _int(baris.get("id"), "id", minimum=1)
+    for kolom in ("nama", "kategori", "ukuran"):
+        if kolom in baris:
+            d[kolom] = str(baris[kolom]).strip()
+    if "harga" in baris:
+        d["harga"] = _int(baris["harga"], "harga")
+    if "stok" in baris:
+        stok = baris["stok"]
+        if lama and isinstance(stok, str) and stok[:1] in "+-":
+            d["stok"] = lama["stok"] + _int(stok, "stok", minimum=-lama["stok"])
+        else:
+            d["stok"] = _int(stok, "stok")
+    if "tingkat_kepedasan" in baris:
+        d["tingkat_kepedasan"] = _int(baris["tingkat_kepedasan"], "tingkat_kepedasan")
+    if "dingin" in baris:
+        dingin = baris["dingin"]
+        d["dingin"] = dingin if isinstance(dingin, bool) else str(dingin).strip().lower() in BENAR
+
+    for kolom in ("nama", "kategori", "harga", "stok"):
+        if d.get(kolom) in (None, ""):
+            raise ValueError(f"kolom {kolom} wajib diisi")
+    if not lama:
+        d["jenis"] = str(baris.get("jenis") or d["kategori"]).strip().lower()
+        if d["jenis"] not in ("makanan", "minuman"):
+            d["jenis"] = "menu"
+    return d
+
+
+def _batch(iterable, ukuran):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, ukuran))
+        if not batch:
+            return
+        yield batch
+
+
+def impor_katalog(manajer, path, format=None, delta=False, ukuran_batch=UKURAN_BATCH, maks_ditolak=None):
+    """
+    Stream katalog dari path ke manajer. delta=True: muat ulang perubahan
+    harga/stok (id yang belum ada tetap ditambahkan bila barisnya lengkap).
+    Memori sebanding ukuran_batch, bukan ukuran file. Setelah impor penuh
+    dibuat snapshot supaya jurnal tidak menyimpan seluruh katalog.
+    """
+    hasil = HasilImpor()
+    for batch in _batch(baca_katalog(path, format), ukuran_batch):
+        valid = {}   # id -> dict; id yang sama dalam satu batch: baris terakhir menang
+        for nomor, baris in batch:
+            hasil.dibaca += 1
+            try:
+                if isinstance(baris, Exception):
+                    raise ValueError(f"JSON tidak valid: {baris}")
+                id_menu = _int(baris.get("id") if isinstance(baris, dict) else None, "id", minimum=1)
+                lama = None
+                if delta:
+                    lama = valid.get(id_menu)
+                    if lama is None and manajer.get_menu(id_menu) is not None:
+                        lama = manajer.get_menu(id_menu).ke_dict()
+                valid[id_menu] = normalisasi(baris, lama)
+            except ValueError as e:
+                hasil.tolak(nomor, str(e))
+        if valid:
+            baru, berubah = manajer.perbarui_katalog(list(valid.values()))
+            hasil.baru += baru
+            hasil.berubah += berubah
+        if maks_ditolak is not None and hasil.jumlah_ditolak > maks_ditolak:
+            raise ErrorKatalog(f"Terlalu banyak baris ditolak, impor dihentikan.\n{hasil}")
+    if not delta and (hasil.baru or hasil.berubah):
+        manajer.buat_snapshot()
+    return hasil
+
+
+if __name__ == '__main__':
+    # diimpor di sini supaya GUI (Tugasakhir) bisa memakai impor_katalog tanpa impor melingkar
+    from Tugasakhir import ManajerRestoran, DIREKTORI_DATA
+    from penyimpanan import DataSedangDipakai, PenyimpananJurnal, PenyimpananSQLite
+
+    parser = argparse.ArgumentParser(description="Impor katalog menu (CSV/JSONL/JSON) ke data restoran")
+    parser.add_argument("katalog", help="file katalog, mis. menu.csv, menu.jsonl, menu.json")
+    parser.add_argument("--format", choices=sorted(PEMBACA))
+    parser.add_argument("--delta", action="store_true", help="muat ulang perubahan harga/stok saja")
+    parser.add_argument("--batch", type=int, default=UKURAN_BATCH)
+    parser.add_argument("--data", default=DIREKTORI_DATA, help="folder jurnal + snapshot")
+    parser.add_argument("--sqlite", action="store_true", help="pakai restoran.db di folder data")
+    args = parser.parse_args()
+
+    try:
+        if args.sqlite:
+            penyimpanan = PenyimpananSQLite(os.path.join(args.data, "restoran.db"))
+        else:
+            penyimpanan = PenyimpananJurnal(args.data)
+    except DataSedangDipakai as e:
+        raise SystemExit(str(e))
+    manajer = ManajerRestoran(penyimpanan)
+    try:
+        print(impor_katalog(manajer, args.katalog, args.format, args.delta, args.batch))
+    finally:
+        manajer.tutup()
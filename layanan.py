@@ -0,0 +1,432 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import traceback
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+
+from Tugasakhir import ManajerRestoran, DIREKTORI_DATA
+from penyimpanan import DataSedangDipakai, PenyimpananJurnal
+from pemantau_stok import PemantauStok
+
+# ===============================
+#  LAYANAN HTTP / WEBSOCKET (tanpa GUI)
+# ===============================
+# Membungkus ManajerRestoran supaya bisa dipakai banyak terminal kasir dan
+# layar dapur sekaligus. Semua operasi berjalan di satu event loop asyncio,
+# jadi ManajerRestoran tidak perlu dikunci.
+#
+#   GET  /menu                      daftar menu + stok
+#   GET  /meja                      status semua meja
+#   GET  /antrian                   antrian dapur
+#   GET  /pesanan/<id>              detail pesanan
+#   POST /pesanan                   {"meja": 3} atau {"orang": 5} (meja dipilih otomatis)
+#   POST /pesanan/<id>/item         {"menu": 1, "jumlah": 2, "catatan": ""}
+#   POST /pesanan/<id>/items        {"items": [{"menu": 1, "jumlah": 2, "catatan": ""}, ...]}
+#   POST /antrian/proses            proses pesanan terdepan
+#   POST /undo, POST /redo
+#   GET  /laporan?mulai=ISO&sampai=ISO
+#   GET  /ws                        WebSocket: push perubahan antrian & meja, peringatan stok
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+STATUS_HTTP = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"}
+
+
+class ErrorLayanan(Exception):
+    def __init__(self, status, pesan):
+        super().__init__(pesan)
+        self.status = status
+        self.pesan = pesan
+
+
+def _catatan(data):
+    # divalidasi sebelum menyentuh stok: catatan bukan teks ditolak, bukan diubah diam-diam
+    catatan = data.get("catatan") or ""
+    if not isinstance(catatan, str):
+        raise ErrorLayanan(400, "Catatan harus berupa teks")
+    return catatan
+
+
+# ------------------
+# Serialisasi ke JSON
+# ------------------
+def _json_pesanan(p):
+    return {
+        "id": p.id_pesanan, "meja": p.nomor_meja, "gabungan": list(p.meja_gabungan), "status": p.status, "total": p.total_harga,
+        "waktu_buat": p.waktu_buat.isoformat(),
+        "waktu_selesai": p.waktu_selesai.isoformat() if p.waktu_selesai else None,
+        "items": [{"menu": it.menu_item.id, "nama": it.menu_item.nama, "jumlah": it.jumlah,
+                   "catatan": it.catatan, "subtotal": it.subtotal} for it in p.items],
+    }
+
+
+def _json_meja(m):
+    return {"nomor": m.nomor, "kapasitas": m.kapasitas, "status": m.status,
+            "pesanan": m.pesanan.id_pesanan if m.pesanan else None}
+
+
+def _json_antrian(manajer):
+    return [{"id": p.id_pesanan, "meja": p.nomor_meja, "gabungan": list(p.meja_gabungan), "label_meja": p.label_meja,
+             "items": len(p.items), "total": p.total_harga}
+            for p in manajer.antrian_pesanan]
+
+
+# ------------------
+# WebSocket frame (RFC 6455, hanya teks + close/ping/pong)
+# ------------------
+def _frame(payload, opcode=0x1, mask=False):
+    header = bytes([0x80 | opcode])
+    n = len(payload)
+    bit_mask = 0x80 if mask else 0
+    if n < 126:
+        header += bytes([bit_mask | n])
+    elif n < 65536:
+        header += bytes([bit_mask | 126]) + struct.pack("!H", n)
+    else:
+        header += bytes([bit_mask | 127]) + struct.pack("!Q", n)
+    if mask:
+        kunci = os.urandom(4)
+        payload = bytes(b ^ kunci[i % 4] for i, b in enumerate(payload))
+        header += kunci
+    return header + payload
+
+
+async def _baca_frame(reader):
+    b1, b2 = await reader.readexactly(2)
+    opcode = b1 & 0x0F
+    n = b2 & 0x7F
+    if n == 126:
+        n = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif n == 127:
+        n = struct.unpack("!Q", await reader.readexactly(8))[0]
+    kunci = await reader.readexactly(4) if b2 & 0x80 else None
+    payload = await reader.readexactly(n)
+    if kunci:
+        payload = bytes(b ^ kunci[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+async def _baca_http(reader):
+    """Baca satu request/response HTTP: (baris_awal, header dict lowercase, body)."""
+    kepala = await reader.readuntil(b"\r\n\r\n")
+    baris = kepala.decode("latin-1").split("\r\n")
+    header = {}
+    for h in baris[1:]:
+        if ":" in h:
+            k, v = h.split(":", 1)
+            header[k.strip().lower()] = v.strip()
+    body = b""
+    if int(header.get("content-length", 0)):
+        body = await reader.readexactly(int(header["content-length"]))
+    return baris[0], header, body
+
+
+class LayananRestoran:
+    def __init__(self, manajer, host="127.0.0.1", port=8080):
+        self.manajer = manajer
+        self.host = host
+        self.port = port
+        self._server = None
+        self._pelanggan = set()       # writer WebSocket yang berlangganan
+        self._koneksi = set()         # task per koneksi, dibatalkan saat berhenti
+        self._antrian_kotor = False   # push antrian digabung per putaran loop
+        manajer.tambah_pendengar(self._on_perubahan)
+        self.pemantau_stok = PemantauStok().ikuti(manajer)
+        self.pemantau_stok.tambah_pendengar(self._on_peringatan_stok)
+
+    async def mulai(self):
+        self._server = await asyncio.start_server(self._tangani_koneksi, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def berhenti(self):
+        if self._server:
+            self._server.close()
+        for tugas in list(self._koneksi):
+            tugas.cancel()
+        await asyncio.gather(*self._koneksi, return_exceptions=True)
+        self._pelanggan.clear()
+        if self._server:
+            await self._server.wait_closed()
+        self.manajer.hapus_pendengar(self._on_perubahan)
+        self.pemantau_stok.lepas()
+
+    # ------------------
+    # Push ke pelanggan
+    # ------------------
+    def _on_perubahan(self, jenis, objek):
+        if not self._pelanggan:
+            return
+        if jenis == "meja":
+            self._broadcast({"jenis": "meja", "data": _json_meja(objek)})
+        elif jenis in ("antrian", "pesanan") and not self._antrian_kotor:
+            # banyak perubahan dalam satu aksi -> satu push antrian
+            self._antrian_kotor = True
+            asyncio.get_running_loop().call_soon(self._push_antrian)
+
+    def _on_peringatan_stok(self, p):
+        if self._pelanggan:
+            self._broadcast({"jenis": "stok", "data": {
+                "menu": p.menu_item.id, "nama": p.menu_item.nama, "tingkat": p.tingkat, "stok": p.stok,
+                "laju_per_jam": p.laju_per_jam, "habis_dalam_menit": p.habis_dalam_menit}})
+
+    def _push_antrian(self):
+        self._antrian_kotor = False
+        self._broadcast({"jenis": "antrian", "data": _json_antrian(self.manajer)})
+
+    def _broadcast(self, pesan):
+        frame = _frame(json.dumps(pesan).encode())
+        for writer in list(self._pelanggan):
+            if writer.is_closing():
+                self._pelanggan.discard(writer)
+            else:
+                writer.write(frame)
+
+    # ------------------
+    # Koneksi
+    # ------------------
+    async def _tangani_koneksi(self, reader, writer):
+        tugas = asyncio.current_task()
+        self._koneksi.add(tugas)
+        try:
+            while True:
+                try:
+                    baris, header, body = await _baca_http(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Content-Length bukan angka / header terlalu panjang: posisi stream tidak bisa dipercaya lagi
+                    await self._kirim(writer, 400, {"error": "Header request tidak valid"})
+                    break
+                bagian_baris = baris.split(" ")
+                if len(bagian_baris) != 3 or not bagian_baris[1].startswith("/"):
+                    await self._kirim(writer, 400, {"error": f"Baris request tidak valid: {baris[:100]!r}"})
+                    break
+                metode, target, _ = bagian_baris
+                url = urlsplit(target)
+                if url.path == "/ws" and header.get("upgrade", "").lower() == "websocket":
+                    # handshake tidak lengkap dijawab 400, bukan exception yang memutus koneksi tanpa jawaban
+                    if not header.get("sec-websocket-key") or header.get("sec-websocket-version") != "13":
+                        await self._kirim(writer, 400, {"error": "Handshake WebSocket tidak valid "
+                                                                 "(perlu Sec-WebSocket-Key dan Sec-WebSocket-Version: 13)"})
+                    else:
+                        await self._websocket(reader, writer, header)
+                    break
+                await self._kirim(writer, *self._tangani(metode, url.path, parse_qs(url.query), body))
+                if header.get("connection", "").lower() == "close":
+                    break
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._koneksi.discard(tugas)
+            writer.close()
+
+    async def _kirim(self, writer, status, data):
+        isi = json.dumps(data, ensure_ascii=False).encode()
+        writer.write(f"HTTP/1.1 {status} {STATUS_HTTP[status]}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(isi)}\r\n\r\n".encode() + isi)
+        await writer.drain()
+
+    async def _websocket(self, reader, writer, header):
+        accept = base64.b64encode(hashlib.sha1((header["sec-websocket-key"] + WS_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        # kirim keadaan awal supaya layar dapur langsung terisi
+        writer.write(_frame(json.dumps({"jenis": "antrian", "data": _json_antrian(self.manajer)}).encode()))
+        writer.write(_frame(json.dumps({"jenis": "meja_semua", "data": [_json_meja(m) for m in self.manajer.meja]}).encode()))
+        await writer.drain()
+        self._pelanggan.add(writer)
+        try:
+            while True:
+                opcode, payload = await _baca_frame(reader)
+                if opcode == 0x8:
+                    writer.write(_frame(payload[:2], 0x8))
+                    break
+                if opcode == 0x9:
+                    writer.write(_frame(payload, 0xA))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._pelanggan.discard(writer)
+
+    # ------------------
+    # Routing
+    # ------------------
+    def _tangani(self, metode, path, query, body):
+        try:
+            data = json.loads(body) if body else {}
+            bagian = [b for b in path.split("/") if b]
+            return self._rute(metode, bagian, query, data)
+        except ErrorLayanan as e:
+            return e.status, {"error": e.pesan}
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {"error": f"Request tidak valid: {e}"}
+        except Exception:
+            # bug di manajer tidak boleh memutus koneksi tanpa jawaban; detailnya hanya ke log server
+            traceback.print_exc()
+            return 500, {"error": "Kesalahan internal server"}
+
+    def _get_pesanan(self, id_teks, termasuk_arsip=False):
+        # nota di arsip dingin hanya bisa dibaca, tidak diubah
+        cari = self.manajer.get_nota if termasuk_arsip else self.manajer.get_pesanan
+        pesanan = cari(int(id_teks))
+        if pesanan is None:
+            raise ErrorLayanan(404, f"Pesanan #{id_teks} tidak ditemukan")
+        return pesanan
+
+    def _rute(self, metode, bagian, query, data):
+        m = self.manajer
+        if metode == "GET":
+            if bagian == ["menu"]:
+                return 200, [it.ke_dict() for it in m.menu_items]
+            if bagian == ["meja"]:
+                return 200, [_json_meja(x) for x in m.meja]
+            if bagian == ["antrian"]:
+                return 200, _json_antrian(m)
+            if len(bagian) == 2 and bagian[0] == "pesanan":
+                return 200, _json_pesanan(self._get_pesanan(bagian[1], termasuk_arsip=True))
+            if bagian == ["laporan"]:
+                mulai = datetime.fromisoformat(query["mulai"][0]) if "mulai" in query else None
+                sampai = datetime.fromisoformat(query["sampai"][0]) if "sampai" in query else None
+                return 200, m.get_laporan_penjualan(mulai, sampai)
+        elif metode == "POST":
+            if bagian == ["pesanan"]:
+                if "orang" in data:
+                    jumlah_orang = int(data["orang"])
+                    if jumlah_orang <= 0:
+                        raise ErrorLayanan(400, "Jumlah orang tidak valid")
+                    pesanan = m.buat_pesanan_rombongan(jumlah_orang)
+                    if pesanan is None:
+                        raise ErrorLayanan(409, f"Tidak ada meja kosong untuk {jumlah_orang} orang.")
+                    return 201, _json_pesanan(pesanan)
+                nomor_meja = int(data["meja"])
+                if not (1 <= nomor_meja <= len(m.meja)):
+                    raise ErrorLayanan(400, "Nomor meja tidak valid")
+                if m.meja[nomor_meja - 1].status == "terisi":
+                    raise ErrorLayanan(409, f"Meja {nomor_meja} sudah terisi.")
+                return 201, _json_pesanan(m.buat_pesanan_baru(nomor_meja))
+            if len(bagian) == 3 and bagian[0] == "pesanan" and bagian[2] == "item":
+                pesanan = self._get_pesanan(bagian[1])
+                menu_item = m.get_menu(int(data["menu"]))
+                jumlah = int(data.get("jumlah", 1))
+                if menu_item is None:
+                    raise ErrorLayanan(400, f"Menu {data['menu']} tidak ditemukan")
+                if jumlah <= 0:
+                    raise ErrorLayanan(400, "Masukkan jumlah valid (angka > 0)")
+                if not m.tambah_item_pesanan(pesanan, menu_item, jumlah, _catatan(data)):
+                    raise ErrorLayanan(409, "Stok tidak mencukupi")
+                return 200, _json_pesanan(pesanan)
+            if len(bagian) == 3 and bagian[0] == "pesanan" and bagian[2] == "items":
+                # batch all-or-nothing: satu entri undo untuk semua baris
+                pesanan = self._get_pesanan(bagian[1])
+                baris = []
+                for d in data["items"]:
+                    menu_item = m.get_menu(int(d["menu"]))
+                    jumlah = int(d.get("jumlah", 1))
+                    if menu_item is None:
+                        raise ErrorLayanan(400, f"Menu {d['menu']} tidak ditemukan")
+                    if jumlah <= 0:
+                        raise ErrorLayanan(400, "Masukkan jumlah valid (angka > 0)")
+                    baris.append((menu_item, jumlah, _catatan(d)))
+                if not baris:
+                    raise ErrorLayanan(400, "Daftar item kosong")
+                if not m.tambah_items_pesanan(pesanan, baris):
+                    raise ErrorLayanan(409, "Stok tidak mencukupi")
+                return 200, _json_pesanan(pesanan)
+            if bagian == ["antrian", "proses"]:
+                pesanan = m.proses_pesanan_dequeue()
+                if pesanan is None:
+                    raise ErrorLayanan(409, "Tidak ada pesanan dalam antrian.")
+                return 200, _json_pesanan(pesanan)
+            if bagian in (["undo"], ["redo"]):
+                hasil = m.undo_aksi() if bagian == ["undo"] else m.redo_aksi()
+                if hasil is None:
+                    raise ErrorLayanan(409, f"Tidak ada aksi untuk di-{bagian[0]}")
+                aksi, ok, pesan = hasil
+                return (200 if ok else 409), {"aksi": str(aksi), "berhasil": ok, "pesan": pesan}
+        else:
+            raise ErrorLayanan(405, f"Metode {metode} tidak didukung")
+        raise ErrorLayanan(404, f"Path /{'/'.join(bagian)} tidak ditemukan")
+
+
+# ===============================
+#  Klien sederhana (terminal kasir / tes localhost)
+# ===============================
+class KlienLayanan:
+    def __init__(self, host="127.0.0.1", port=8080):
+        self.host = host
+        self.port = port
+
+    async def request(self, metode, path, data=None):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            body = json.dumps(data).encode() if data is not None else b""
+            writer.write(f"{metode} {path} HTTP/1.1\r\nHost: {self.host}\r\nConnection: close\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            baris, _, isi = await _baca_http(reader)
+            return int(baris.split(" ")[1]), json.loads(isi)
+        finally:
+            writer.close()
+
+    async def langganan(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        kunci = base64.b64encode(os.urandom(16)).decode()
+        writer.write(f"GET /ws HTTP/1.1\r\nHost: {self.host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     f"Sec-WebSocket-Key: {kunci}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+        await writer.drain()
+        baris, _, _ = await _baca_http(reader)
+        if not baris.startswith("HTTP/1.1 101"):
+            writer.close()
+            raise ConnectionError(f"Upgrade WebSocket ditolak: {baris}")
+        return LanggananWebSocket(reader, writer)
+
+
+class LanggananWebSocket:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def terima(self):
+        while True:
+            opcode, payload = await _baca_frame(self.reader)
+            if opcode == 0x1:
+                return json.loads(payload)
+            if opcode == 0x8:
+                raise ConnectionError("WebSocket ditutup server")
+
+    async def tutup(self):
+        self.writer.write(_frame(struct.pack("!H", 1000), 0x8, mask=True))
+        await self.writer.drain()
+        self.writer.close()
+
+
+async def _main(args):
+    manajer = ManajerRestoran(PenyimpananJurnal(args.data))
+    layanan = await LayananRestoran(manajer, args.host, args.port).mulai()
+    print(f"Layanan restoran berjalan di http://{layanan.host}:{layanan.port}")
+    try:
+        while True:
+            await asyncio.sleep(1)
+            manajer.penyimpanan.flush()
+    finally:
+        await layanan.berhenti()
+        manajer.tutup()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Layanan HTTP/WebSocket Sistem Manajemen Restoran")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data", default=DIREKTORI_DATA, help="folder jurnal + snapshot")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except DataSedangDipakai as e:
+        raise SystemExit(str(e))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,182 @@
+from collections import namedtuple
+
+# ===============================
+#  PEMANTAU STOK (peringatan dini)
+# ===============================
+# Laju pemakaian tiap menu dihitung dari jendela geser (default 60 menit)
+# yang dibagi menjadi bucket tetap (default 12 x 5 menit). Setiap event
+# "stok" dari ManajerRestoran hanya menggeser ring bucket dan menambah satu
+# angka, jadi biayanya O(1) berapa pun jumlah pesanan. Dari laju itu
+# diproyeksikan kapan stok habis; jika kurang dari ambang (atau stok sudah
+# di bawah minimum) peringatan dikirim ke semua pendengar, sekali per
+# perpindahan status (aman -> menipis -> habis), bukan di setiap event.
+#
+# Perubahan stok dari katalog (restock / muat ulang, event "menu") tidak
+# dihitung sebagai pemakaian; hanya menggeser titik acuan stok.
+
+JENDELA_MENIT = 60
+JUMLAH_BUCKET = 12
+AMBANG_MENIT = 30          # peringatan jika diperkirakan habis dalam waktu ini
+STOK_MINIMUM = 3           # ... atau stok tinggal sebanyak ini
+HISTERESIS = 1.5           # status kembali aman setelah proyeksi > AMBANG * HISTERESIS
+
+Peringatan = namedtuple("Peringatan", "menu_item tingkat stok laju_per_jam habis_dalam_menit")
+
+
+class LajuGeser:
+    """Jumlah pemakaian dalam jendela geser berbasis ring bucket; catat/laju O(1) (paling banyak JUMLAH_BUCKET langkah)."""
+    __slots__ = ("lebar", "bucket", "kini", "total", "pertama")
+
+    def __init__(self, lebar_bucket, jumlah_bucket):
+        self.lebar = lebar_bucket
+        self.bucket = [0] * jumlah_bucket
+        self.kini = None       # nomor bucket absolut (waktu // lebar) yang sedang diisi
+        self.total = 0
+        self.pertama = None    # waktu event pertama; laju awal tidak dibagi jendela penuh
+
+    def _geser(self, t):
+        b = int(t // self.lebar)
+        if self.kini is None:
+            self.kini = b
+            return
+        maju = b - self.kini
+        if maju <= 0:
+            return             # waktu mundur (mis. jam diubah): tetap masuk bucket sekarang
+        n = len(self.bucket)
+        if maju >= n:
+            self.bucket = [0] * n
+            self.total = 0
+        else:
+            for i in range(1, maju + 1):
+                j = (self.kini + i) % n
+                self.total -= self.bucket[j]
+                self.bucket[j] = 0
+        self.kini = b
+
+    def catat(self, jumlah, t):
+        self._geser(t)
+        if self.pertama is None:
+            self.pertama = t
+        i = self.kini % len(self.bucket)
+        # pemakaian negatif (undo) tidak boleh membuat bucket < 0
+        jumlah = max(jumlah, -self.bucket[i])
+        self.bucket[i] += jumlah
+        self.total += jumlah
+
+    def laju(self, t):
+        """Pemakaian per detik dalam jendela."""
+        self._geser(t)
+        if self.pertama is None or self.total <= 0:
+            return 0.0
+        rentang = min(self.lebar * len(self.bucket), max(t - self.pertama, self.lebar))
+        return self.total / rentang
+
+
+class _StatusItem:
+    __slots__ = ("laju", "stok", "tingkat")
+
+    def __init__(self, stok):
+        self.laju = None       # LajuGeser, dibuat saat pemakaian pertama (katalog besar jarang terjual semua)
+        self.stok = stok       # stok terakhir yang terlihat
+        self.tingkat = "aman"
+
+
+class PemantauStok:
+    def __init__(self, jendela_menit=JENDELA_MENIT, jumlah_bucket=JUMLAH_BUCKET, ambang_menit=AMBANG_MENIT,
+                 stok_minimum=STOK_MINIMUM):
+        self.lebar_bucket = jendela_menit * 60 / jumlah_bucket
+        self.jumlah_bucket = jumlah_bucket
+        self.ambang_detik = ambang_menit * 60
+        self.stok_minimum = stok_minimum
+        self._status = {}        # id menu -> _StatusItem
+        self._pendengar = []     # fungsi(Peringatan)
+        self._manajer = None
+        self._jam = None
+
+    def tambah_pendengar(self, fungsi):
+        self._pendengar.append(fungsi)
+
+    def hapus_pendengar(self, fungsi):
+        if fungsi in self._pendengar:
+            self._pendengar.remove(fungsi)
+
+    def ikuti(self, manajer):
+        """Pantau semua perubahan stok manajer; waktu diambil dari manajer.sekarang() (ikut jam simulasi)."""
+        self._manajer = manajer
+        self._jam = lambda: manajer.sekarang().timestamp()
+        for item in manajer.menu_items:
+            self._status[item.id] = _StatusItem(item.stok)
+        manajer.tambah_pendengar(self._on_perubahan)
+        return self
+
+    def lepas(self):
+        if self._manajer is not None:
+            self._manajer.hapus_pendengar(self._on_perubahan)
+            self._manajer = None
+
+    def _on_perubahan(self, jenis, objek):
+        if jenis == "stok":
+            self.catat(objek, self._jam())
+        elif jenis == "menu":
+            # restock / perubahan katalog: bukan pemakaian, hanya acuan stok baru
+            s = self._status.get(objek.id)
+            if s is None:
+                s = self._status[objek.id] = _StatusItem(objek.stok)
+            s.stok = objek.stok
+            self._evaluasi(objek, s, self._jam())
+
+    def catat(self, menu_item, t):
+        """Stok menu_item baru saja berubah (pesanan): selisih dari stok terakhir dihitung sebagai pemakaian."""
+        s = self._status.get(menu_item.id)
+        if s is None:
+            # belum pernah terlihat: selisih pertama tidak diketahui, hanya dijadikan acuan
+            s = self._status[menu_item.id] = _StatusItem(menu_item.stok)
+        if s.laju is None:
+            s.laju = LajuGeser(self.lebar_bucket, self.jumlah_bucket)
+        s.laju.catat(s.stok - menu_item.stok, t)
+        s.stok = menu_item.stok
+        self._evaluasi(menu_item, s, t)
+
+    def proyeksi(self, menu_item, t=None):
+        """(laju per jam, menit sampai habis atau None jika tidak ada pemakaian)."""
+        s = self._status.get(menu_item.id)
+        if s is None or s.laju is None:
+            return 0.0, None
+        laju = s.laju.laju(self._jam() if t is None else t)
+        if laju <= 0:
+            return 0.0, None
+        return laju * 3600, menu_item.stok / laju / 60
+
+    def _evaluasi(self, menu_item, s, t):
+        laju = s.laju.laju(t) if s.laju is not None else 0.0
+        habis_dalam = menu_item.stok / laju if laju > 0 else None
+        if menu_item.stok <= 0:
+            tingkat = "habis"
+        elif menu_item.stok <= self.stok_minimum or (habis_dalam is not None and habis_dalam < self.ambang_detik):
+            tingkat = "menipis"
+        elif s.tingkat != "aman" and habis_dalam is not None and habis_dalam < self.ambang_detik * HISTERESIS:
+            tingkat = "menipis"   # belum cukup jauh dari ambang: jangan berkedip aman/menipis
+        else:
+            tingkat = "aman"
+        if tingkat == s.tingkat:
+            return
+        s.tingkat = tingkat
+        p = Peringatan(menu_item, tingkat, menu_item.stok, laju * 3600,
+                       habis_dalam / 60 if habis_dalam is not None else None)
+        for fungsi in self._pendengar:
+            fungsi(p)
+
+    def daftar_peringatan(self):
+        """[(id_menu, tingkat)] untuk menu yang sedang tidak aman."""
+        return [(id_menu, s.tingkat) for id_menu, s in self._status.items() if s.tingkat != "aman"]
+
+
+def teks_peringatan(p):
+    if p.tingkat == "habis":
+        return f"⛔ {p.menu_item.nama} HABIS"
+    if p.tingkat == "aman":
+        return f"✅ Stok {p.menu_item.nama} aman kembali ({p.stok})"
+    teks = f"⚠️ {p.menu_item.nama} menipis: stok {p.stok}"
+    if p.habis_dalam_menit is not None:
+        teks += f", habis ±{p.habis_dalam_menit:.0f} mnt ({p.laju_per_jam:.0f}/jam)"
+    return teks
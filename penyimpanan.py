@@ -0,0 +1,680 @@
+import json
+import mmap
+import os
+import pathlib
+import queue
+import sqlite3
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+# ===============================
+#  PENYIMPANAN (persistensi ManajerRestoran)
+# ===============================
+# ManajerRestoran hanya berbicara dengan antarmuka Penyimpanan:
+#   catat(event)            -> tulis satu event domain (dict JSON-able)
+#   simpan_snapshot(data)   -> tulis snapshot lengkap yang mencakup semua event sebelumnya
+#   pulihkan()              -> (snapshot atau None, [event setelah snapshot])
+#   buka_arsip()            -> ArsipPesanan untuk nota lama, atau None (semua pesanan tetap di memori)
+#   flush() / tutup()
+# Modul ini tidak mengimpor Tugasakhir, jadi bisa dipakai ulang oleh alat lain.
+#
+# Backend yang menulis memegang kunci eksklusif atas folder/file data selama
+# terbuka, jadi GUI, layanan.py, dan importer katalog tidak bisa menulis data
+# yang sama bersamaan. Alat yang hanya membaca (ekspor, analitik, laporan
+# cabang) membuka backend dengan baca_saja=True: tanpa kunci, tanpa snapshot,
+# tanpa memotong jurnal/arsip, sehingga aman dijalankan saat GUI terbuka.
+
+class DataSedangDipakai(RuntimeError):
+    pass
+
+
+def _kunci_eksklusif(path):
+    """Kunci file eksklusif tanpa menunggu; file yang dikembalikan harus tetap terbuka selama kunci dipakai."""
+    f = open(path, "a+b")
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        raise DataSedangDipakai(f"Data {path} sedang dipakai proses lain (GUI / layanan / impor katalog)") from None
+    return f
+
+
+class Penyimpanan:
+    """Penyimpanan kosong (semua di memori, tidak ada yang ditulis)."""
+    snapshot_setiap = 0
+    baca_saja = False
+
+    def catat(self, event):
+        pass
+
+    def simpan_snapshot(self, snapshot):
+        pass
+
+    def pulihkan(self):
+        return None, []
+
+    def buka_arsip(self):
+        return None
+
+    def flush(self):
+        pass
+
+    def tutup(self):
+        pass
+
+
+class PenyimpananJurnal(Penyimpanan):
+    """
+    Write-ahead journal berbentuk file JSON lines + snapshot berkala.
+
+    - Setiap event diberi nomor urut (seq) dan ditulis ke segmen jurnal aktif.
+    - fsync dilakukan per batch: setelah `batch_fsync` event atau setelah
+      `interval_fsync` detik sejak fsync terakhir (mana yang lebih dulu).
+      Crash hanya bisa menghilangkan event dalam batch yang belum di-fsync.
+    - Snapshot ditulis atomik (file sementara + os.replace), lalu segmen
+      jurnal baru dimulai dan segmen lama dihapus. Pemulihan hanya membaca
+      snapshot terakhir + ekor jurnal, jadi waktu startup tidak tumbuh
+      seiring panjang jurnal.
+    - Nota lama disimpan di ArsipPesanan (buka_arsip) di folder yang sama,
+      sehingga snapshot hanya memuat set panas.
+    """
+    NAMA_SNAPSHOT = "snapshot.json"
+    NAMA_KUNCI = "kunci.lock"
+
+    def __init__(self, direktori, batch_fsync=32, interval_fsync=1.0, snapshot_setiap=1000, baca_saja=False):
+        self.direktori = direktori
+        self.batch_fsync = batch_fsync
+        self.interval_fsync = interval_fsync
+        self.snapshot_setiap = snapshot_setiap
+        self.baca_saja = baca_saja
+        self._kunci = None
+        if not baca_saja:
+            os.makedirs(direktori, exist_ok=True)
+            self._kunci = _kunci_eksklusif(self._path(self.NAMA_KUNCI))
+
+        self._seq = 0
+        self._belum_fsync = 0
+        self._fsync_terakhir = time.monotonic()
+        self._file = None
+        self._arsip = None
+
+    # ------------------
+    # Segmen jurnal
+    # ------------------
+    def _path(self, nama):
+        return os.path.join(self.direktori, nama)
+
+    def _segmen(self):
+        # [(seq_awal, nama_file)] terurut
+        hasil = []
+        if not os.path.isdir(self.direktori):
+            return hasil
+        for nama in os.listdir(self.direktori):
+            if nama.startswith("jurnal-") and nama.endswith(".log"):
+                try:
+                    hasil.append((int(nama[7:-4]), nama))
+                except ValueError:
+                    continue
+        return sorted(hasil)
+
+    def _buka_segmen(self, seq_awal):
+        if self._file:
+            self._file.close()
+        self._file = open(self._path(f"jurnal-{seq_awal:012d}.log"), "a", encoding="utf-8")
+
+    def _fsync(self):
+        if self._file and self._belum_fsync:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._belum_fsync = 0
+        self._fsync_terakhir = time.monotonic()
+
+    # ------------------
+    # Antarmuka Penyimpanan
+    # ------------------
+    def _cek_tulis(self):
+        if self.baca_saja:
+            raise PermissionError(f"Data {self.direktori} dibuka baca-saja")
+
+    def catat(self, event):
+        self._cek_tulis()
+        if self._file is None:
+            self._buka_segmen(self._seq + 1)
+        self._seq += 1
+        event = dict(event, seq=self._seq)
+        self._file.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._belum_fsync += 1
+        if (self._belum_fsync >= self.batch_fsync
+                or time.monotonic() - self._fsync_terakhir >= self.interval_fsync):
+            self._fsync()
+
+    def flush(self):
+        self._fsync()
+
+    def buka_arsip(self):
+        if self._arsip is None:
+            self._arsip = ArsipPesanan(self.direktori, self.baca_saja)
+        return self._arsip
+
+    def simpan_snapshot(self, snapshot):
+        self._cek_tulis()
+        self._fsync()
+        if self._arsip is not None:
+            self._arsip.flush()   # snapshot mengesahkan panjang arsip, jadi isinya harus sudah di disk
+        snapshot = dict(snapshot, seq=self._seq)
+        tmp = self._path(self.NAMA_SNAPSHOT + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path(self.NAMA_SNAPSHOT))
+        # kompaksi: mulai segmen baru, segmen lama sudah tercakup snapshot
+        self._buka_segmen(self._seq + 1)
+        for seq_awal, nama in self._segmen():
+            if seq_awal <= self._seq:
+                os.remove(self._path(nama))
+
+    def _versi_snapshot(self):
+        try:
+            st = os.stat(self._path(self.NAMA_SNAPSHOT))
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def pulihkan(self):
+        while True:
+            versi = self._versi_snapshot()
+            try:
+                hasil = self._pulihkan()
+            except FileNotFoundError:
+                if not self.baca_saja:
+                    raise
+                # penulis baru saja membuat snapshot dan menghapus segmen lama: baca ulang
+                continue
+            if not self.baca_saja or self._versi_snapshot() == versi:
+                return hasil
+
+    def _pulihkan(self):
+        snapshot = None
+        path = self._path(self.NAMA_SNAPSHOT)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        seq_snapshot = snapshot["seq"] if snapshot else 0
+
+        events = []
+        seq = seq_snapshot
+        for _, nama in self._segmen():
+            with open(self._path(nama), "rb" if self.baca_saja else "rb+") as f:
+                posisi = 0
+                for baris in f:
+                    try:
+                        event = json.loads(baris)
+                    except ValueError:
+                        # baris terakhir terpotong saat crash (atau masih ditulis, jika baca-saja) -> abaikan ekornya
+                        if not self.baca_saja:
+                            f.truncate(posisi)
+                        break
+                    posisi += len(baris)
+                    if event["seq"] > seq:
+                        events.append(event)
+                        seq = event["seq"]
+        self._seq = seq
+        return snapshot, events
+
+    def tutup(self):
+        self._fsync()
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._arsip is not None:
+            self._arsip.tutup()
+            self._arsip = None
+        if self._kunci is not None:
+            self._kunci.close()
+            self._kunci = None
+
+
+class PenyimpananSQLite(Penyimpanan):
+    """
+    Backend SQLite (stdlib sqlite3, mode WAL).
+
+    Selain jurnal event + snapshot (untuk pemulihan, sama seperti
+    PenyimpananJurnal), backend ini menyimpan state terkini di tabel
+    berindeks: menu, meja, pesanan, dan item_pesanan. Semua penulisan
+    lewat satu thread writer yang melakukan group commit: operasi dari
+    banyak aksi digabung dalam satu transaksi (maks `ukuran_batch` operasi
+    atau `interval_commit` detik), dan upsert berulang untuk baris yang
+    sama dalam satu batch hanya ditulis sekali.
+
+    Laporan dan daftar nota dijawab dengan query SQL berindeks.
+    """
+    perlu_state = True
+
+    SKEMA = """
+    CREATE TABLE IF NOT EXISTS jurnal (seq INTEGER PRIMARY KEY, data TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS snapshot (id INTEGER PRIMARY KEY CHECK (id = 1), seq INTEGER NOT NULL, data TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS menu (
+        id INTEGER PRIMARY KEY, nama TEXT NOT NULL, kategori TEXT NOT NULL, harga INTEGER NOT NULL, stok INTEGER NOT NULL);
+    CREATE TABLE IF NOT EXISTS meja (
+        nomor INTEGER PRIMARY KEY, kapasitas INTEGER NOT NULL, status TEXT NOT NULL, id_pesanan INTEGER);
+    CREATE TABLE IF NOT EXISTS pesanan (
+        id INTEGER PRIMARY KEY, meja INTEGER NOT NULL, status TEXT NOT NULL,
+        waktu_buat TEXT NOT NULL, waktu_selesai TEXT, total INTEGER NOT NULL, gabungan TEXT);
+    CREATE TABLE IF NOT EXISTS item_pesanan (
+        id_pesanan INTEGER NOT NULL, baris INTEGER NOT NULL, id_menu INTEGER NOT NULL,
+        jumlah INTEGER NOT NULL, catatan TEXT NOT NULL, subtotal INTEGER NOT NULL,
+        PRIMARY KEY (id_pesanan, baris));
+    CREATE INDEX IF NOT EXISTS idx_pesanan_status_selesai ON pesanan (status, waktu_selesai);
+    CREATE INDEX IF NOT EXISTS idx_pesanan_meja ON pesanan (meja);
+    CREATE INDEX IF NOT EXISTS idx_item_menu ON item_pesanan (id_menu);
+    CREATE INDEX IF NOT EXISTS idx_menu_kategori ON menu (kategori);
+    """
+
+    # prepared statement (sqlite3 meng-cache statement per teks query)
+    SQL_JURNAL = "INSERT INTO jurnal (seq, data) VALUES (?, ?)"
+    SQL_MENU = "INSERT OR REPLACE INTO menu (id, nama, kategori, harga, stok) VALUES (?, ?, ?, ?, ?)"
+    SQL_STOK = "UPDATE menu SET stok = ? WHERE id = ?"
+    SQL_MEJA = "INSERT OR REPLACE INTO meja (nomor, kapasitas, status, id_pesanan) VALUES (?, ?, ?, ?)"
+    SQL_PESANAN = ("INSERT OR REPLACE INTO pesanan (id, meja, status, waktu_buat, waktu_selesai, total, gabungan) "
+                   "VALUES (?, ?, ?, ?, ?, ?, ?)")
+    SQL_ITEM = ("INSERT INTO item_pesanan (id_pesanan, baris, id_menu, jumlah, catatan, subtotal) "
+                "VALUES (?, ?, ?, ?, ?, ?)")
+
+    def __init__(self, path, ukuran_batch=256, interval_commit=0.05, snapshot_setiap=5000, batas_tunggu=30.0,
+                 baca_saja=False):
+        self.path = path
+        self.ukuran_batch = ukuran_batch
+        self.interval_commit = interval_commit
+        self.snapshot_setiap = snapshot_setiap
+        self.batas_tunggu = batas_tunggu   # detik maksimum flush()/tutup() menunggu writer
+        self.baca_saja = baca_saja
+        self._seq = 0
+        self._galat = None                 # exception yang menghentikan thread writer
+        self._kunci = None
+        self._thread = None
+        if baca_saja:
+            # tanpa thread writer dan tanpa kunci; query melihat transaksi terakhir yang sudah dikomit penulis
+            self._baca = sqlite3.connect(pathlib.Path(os.path.abspath(path)).as_uri() + "?mode=ro", uri=True,
+                                         check_same_thread=False)
+            self._ada_gabungan = self._kolom_gabungan()
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._kunci = _kunci_eksklusif(path + ".lock")
+
+        self._baca = sqlite3.connect(path, check_same_thread=False)
+        self._baca.execute("PRAGMA journal_mode=WAL")
+        self._baca.executescript(self.SKEMA)
+        if not self._kolom_gabungan():
+            # database dari versi sebelum meja gabungan; barisnya terisi ulang di snapshot berikutnya
+            self._baca.execute("ALTER TABLE pesanan ADD COLUMN gabungan TEXT")
+        self._baca.commit()
+        self._ada_gabungan = True
+
+        self._antrian = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def _kolom_gabungan(self):
+        return "gabungan" in {baris[1] for baris in self._baca.execute("PRAGMA table_info(pesanan)")}
+
+    # ------------------
+    # Thread writer (group commit)
+    # ------------------
+    def _writer(self):
+        try:
+            self._tulis_terus()
+        except BaseException as e:
+            # disimpan untuk _tunggu: pemanggil flush/tutup melihat error-nya, bukan menunggu selamanya
+            self._galat = e
+
+    def _tulis_terus(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        selesai = False
+        while not selesai:
+            batch = [self._antrian.get()]
+            batas_waktu = time.monotonic() + self.interval_commit
+            # penanda flush/tutup langsung dikomit: ada yang sedang menunggu, jendela batch tidak ditunggu
+            while len(batch) < self.ukuran_batch and not isinstance(batch[-1][1], threading.Event):
+                sisa = batas_waktu - time.monotonic()
+                if sisa <= 0:
+                    break
+                try:
+                    batch.append(self._antrian.get(timeout=sisa))
+                except queue.Empty:
+                    break
+
+            tertunda = {}   # (jenis, kunci) -> data; upsert terakhir yang menang
+            penanda = []
+            with conn:
+                for op, data in batch:
+                    if op == "jurnal":
+                        conn.execute(self.SQL_JURNAL, data)
+                    elif op in ("stok", "menu", "meja", "pesanan", "hapus_pesanan"):
+                        kunci = {"hapus_pesanan": "pesanan", "stok": "menu"}.get(op, op)
+                        id_baris = data["id"] if op in ("pesanan", "menu") else data[0]
+                        if op == "stok" and ("menu", id_baris) in tertunda and tertunda[("menu", id_baris)][0] == "menu":
+                            # baris menu lengkap masih tertunda: cukup perbarui stoknya
+                            tertunda[("menu", id_baris)][1]["stok"] = data[1]
+                            continue
+                        tertunda[(kunci, id_baris)] = (op, data)
+                    elif op == "snapshot":
+                        self._terapkan(conn, tertunda)
+                        tertunda = {}
+                        self._tulis_snapshot(conn, data)
+                    elif isinstance(data, threading.Event):
+                        penanda.append(data)
+                        selesai = selesai or op == "tutup"
+                self._terapkan(conn, tertunda)
+            for event in penanda:
+                event.set()
+        conn.close()
+
+    def _terapkan(self, conn, tertunda):
+        for op, data in tertunda.values():
+            if op == "stok":
+                conn.execute(self.SQL_STOK, (data[1], data[0]))
+            elif op == "menu":
+                conn.execute(self.SQL_MENU, (data["id"], data["nama"], data["kategori"], data["harga"], data["stok"]))
+            elif op == "meja":
+                conn.execute(self.SQL_MEJA, data)
+            elif op == "hapus_pesanan":
+                conn.execute("DELETE FROM pesanan WHERE id = ?", (data[0],))
+                conn.execute("DELETE FROM item_pesanan WHERE id_pesanan = ?", (data[0],))
+            else:
+                self._tulis_pesanan(conn, data)
+
+    def _tulis_pesanan(self, conn, p):
+        total = sum(it[3] for it in p["items"])
+        gabungan = "+".join(map(str, p["gabungan"])) if p.get("gabungan") else None
+        conn.execute(self.SQL_PESANAN, (p["id"], p["meja"], p["status"], p["waktu_buat"], p["waktu_selesai"], total,
+                                        gabungan))
+        conn.execute("DELETE FROM item_pesanan WHERE id_pesanan = ?", (p["id"],))
+        conn.executemany(self.SQL_ITEM, [(p["id"], i, *it) for i, it in enumerate(p["items"])])
+
+    def _tulis_snapshot(self, conn, snapshot):
+        # snapshot = titik sinkron penuh: tabel state ditulis ulang, jurnal lama dibuang
+        conn.execute("INSERT OR REPLACE INTO snapshot (id, seq, data) VALUES (1, ?, ?)",
+                     (snapshot["seq"], json.dumps(snapshot, ensure_ascii=False, separators=(",", ":"))))
+        conn.execute("DELETE FROM jurnal WHERE seq <= ?", (snapshot["seq"],))
+        conn.execute("DELETE FROM menu")
+        conn.executemany(self.SQL_MENU, [(m["id"], m["nama"], m["kategori"], m["harga"], m["stok"]) for m in snapshot["menu"]])
+        conn.execute("DELETE FROM meja")
+        conn.executemany(self.SQL_MEJA, snapshot["meja"])
+        conn.execute("DELETE FROM pesanan")
+        conn.execute("DELETE FROM item_pesanan")
+        for p in snapshot["pesanan"]:
+            self._tulis_pesanan(conn, p)
+
+    def _tunggu(self, op="flush"):
+        event = threading.Event()
+        self._antrian.put((op, event))
+        batas = time.monotonic() + self.batas_tunggu
+        while not event.wait(0.1):
+            if not self._thread.is_alive():
+                break
+            if time.monotonic() >= batas:
+                raise TimeoutError(f"Writer SQLite tidak merespons dalam {self.batas_tunggu} detik")
+        if self._galat is not None:
+            raise RuntimeError("Writer SQLite berhenti karena error") from self._galat
+
+    # ------------------
+    # Antarmuka Penyimpanan
+    # ------------------
+    def _cek_tulis(self):
+        if self.baca_saja:
+            raise PermissionError(f"Data {self.path} dibuka baca-saja")
+
+    def catat(self, event):
+        self._cek_tulis()
+        self._seq += 1
+        event = dict(event, seq=self._seq)
+        self._antrian.put(("jurnal", (self._seq, json.dumps(event, ensure_ascii=False, separators=(",", ":")))))
+
+    def perbarui(self, jenis, data):
+        # jenis: "stok" [id, stok], "menu" (dict MenuItem.ke_dict), "meja" [nomor, kapasitas, status, id_pesanan],
+        #        "pesanan" (dict Pesanan.ke_dict), "hapus_pesanan" [id]
+        self._cek_tulis()
+        self._antrian.put((jenis, data))
+
+    def simpan_snapshot(self, snapshot):
+        self._cek_tulis()
+        self._antrian.put(("snapshot", dict(snapshot, seq=self._seq)))
+
+    def pulihkan(self):
+        snapshot = None
+        baris = self._baca.execute("SELECT data FROM snapshot WHERE id = 1").fetchone()
+        if baris:
+            snapshot = json.loads(baris[0])
+        seq_snapshot = snapshot["seq"] if snapshot else 0
+        events = [json.loads(data) for (data,) in
+                  self._baca.execute("SELECT data FROM jurnal WHERE seq > ? ORDER BY seq", (seq_snapshot,))]
+        self._seq = events[-1]["seq"] if events else seq_snapshot
+        return snapshot, events
+
+    def flush(self):
+        if self._thread is not None:
+            self._tunggu()
+
+    def tutup(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._tunggu("tutup")
+            self._thread.join()
+        self._baca.close()
+        if self._kunci is not None:
+            self._kunci.close()
+            self._kunci = None
+
+    # ------------------
+    # Query (indeks SQL)
+    # ------------------
+    def laporan_penjualan(self, mulai=None, sampai=None):
+        self.flush()
+        sql = "SELECT COALESCE(SUM(total), 0), COUNT(*) FROM pesanan WHERE status = 'selesai'"
+        param = []
+        if mulai is not None:
+            sql += " AND waktu_selesai >= ?"
+            param.append(mulai.isoformat())
+        if sampai is not None:
+            sql += " AND waktu_selesai < ?"
+            param.append(sampai.isoformat())
+        return tuple(self._baca.execute(sql, param).fetchone())
+
+    def daftar_nota(self, offset=0, batas=None):
+        # (id, label meja mis. "6+7", total, waktu_selesai_iso) urut waktu selesai
+        self.flush()
+        meja = "meja || COALESCE('+' || gabungan, '')" if self._ada_gabungan else "CAST(meja AS TEXT)"
+        return self._baca.execute(
+            f"SELECT id, {meja}, total, waktu_selesai FROM pesanan WHERE status = 'selesai' "
+            "ORDER BY waktu_selesai, id LIMIT ? OFFSET ?", (-1 if batas is None else batas, offset)).fetchall()
+
+    def penjualan_per_menu(self, mulai=None, sampai=None):
+        self.flush()
+        sql = ("SELECT i.id_menu, SUM(i.jumlah), SUM(i.subtotal) FROM item_pesanan i "
+               "JOIN pesanan p ON p.id = i.id_pesanan WHERE p.status = 'selesai'")
+        param = []
+        if mulai is not None:
+            sql += " AND p.waktu_selesai >= ?"
+            param.append(mulai.isoformat())
+        if sampai is not None:
+            sql += " AND p.waktu_selesai < ?"
+            param.append(sampai.isoformat())
+        return self._baca.execute(sql + " GROUP BY i.id_menu ORDER BY 3 DESC", param).fetchall()
+
+
+# ===============================
+#  ARSIP DINGIN (nota lama, mmap)
+# ===============================
+class ArsipPesanan:
+    """
+    Segmen append-only untuk pesanan selesai yang sudah keluar dari set panas
+    ManajerRestoran. Tiga file, dibaca lewat mmap (hanya halaman yang disentuh
+    yang masuk memori):
+
+      arsip.dat   satu JSON Pesanan.ke_dict per baris, urut waktu arsip
+      arsip.idx   rekaman tetap (id, waktu_selesai epoch, offset, panjang, meja, total);
+                  meja negatif = pesanan meja gabungan, label lengkapnya di arsip.dat
+                  manajer hanya mengarsip nota tertua, jadi urut waktu selesai
+                  -> rentang tanggal dicari dengan bisect
+      arsip.id    tabel langsung id pesanan -> nomor rekaman + 1 (0 = tidak ada)
+
+    Isi arsip baru dianggap sah setelah tercakup snapshot (lihat potong()):
+    rekaman setelah snapshot terakhir dibuang saat pemulihan dan dibuat ulang
+    oleh replay jurnal, jadi arsip tidak pernah mendahului jurnal.
+    """
+    REKAMAN = struct.Struct("<qqqiiq")
+    SLOT = struct.Struct("<I")
+
+    def __init__(self, direktori, baca_saja=False):
+        self.baca_saja = baca_saja
+        self._path = {nama: os.path.join(direktori, f"arsip.{nama}") for nama in ("dat", "idx", "id")}
+        self._peta = {}   # nama -> mmap (dibuat ulang setelah file bertambah)
+        if baca_saja:
+            # file tidak dibuat / dipotong; arsip yang belum ada dianggap kosong
+            ada = all(os.path.exists(path) for path in self._path.values())
+            self._file = {nama: open(path, "rb") for nama, path in self._path.items()} if ada else {}
+            self._jumlah = self._jumlah_di_disk() if ada else 0
+            return
+        for path in self._path.values():
+            open(path, "ab").close()
+        self._file = {nama: open(path, "r+b") for nama, path in self._path.items()}
+        self._jumlah = self._jumlah_di_disk()
+        self.potong(self._jumlah)   # buang rekaman / data setengah tertulis
+
+    def _jumlah_di_disk(self):
+        return os.path.getsize(self._path["idx"]) // self.REKAMAN.size
+
+    def __len__(self):
+        return self._jumlah
+
+    def __contains__(self, id_pesanan):
+        return self._nomor(id_pesanan) is not None
+
+    def _baca_peta(self, nama):
+        peta = self._peta.get(nama)
+        if peta is None:
+            if nama not in self._file or os.fstat(self._file[nama].fileno()).st_size == 0:
+                return b""
+            peta = self._peta[nama] = mmap.mmap(self._file[nama].fileno(), 0, access=mmap.ACCESS_READ)
+        return peta
+
+    def _lepas_peta(self):
+        for peta in self._peta.values():
+            peta.close()
+        self._peta = {}
+
+    def _nomor(self, id_pesanan):
+        peta = self._baca_peta("id")
+        posisi = id_pesanan * self.SLOT.size
+        if id_pesanan < 0 or posisi + self.SLOT.size > len(peta):
+            return None
+        i = self.SLOT.unpack_from(peta, posisi)[0] - 1
+        # slot bisa tersisa dari rekaman setengah tertulis yang nomornya sudah dipakai pesanan lain
+        if 0 <= i < self._jumlah and self.rekaman(i)[0] == id_pesanan:
+            return i
+        return None
+
+    def rekaman(self, i):
+        """(id, waktu_selesai epoch, offset, panjang, meja, total) rekaman ke-i."""
+        return self.REKAMAN.unpack_from(self._baca_peta("idx"), i * self.REKAMAN.size)
+
+    def rentang(self, awal, akhir):
+        """(id, waktu_selesai epoch, label meja, total) untuk rekaman [awal, akhir).
+
+        Isi nota hanya dibaca untuk pesanan meja gabungan (mis. "6+7").
+        """
+        ukuran = self.REKAMAN.size
+        for id_p, waktu, offset, panjang, meja, total in self.REKAMAN.iter_unpack(
+                self._baca_peta("idx")[awal * ukuran:akhir * ukuran]):
+            if meja < 0:
+                d = json.loads(self._baca_peta("dat")[offset:offset + panjang])
+                yield id_p, waktu, "+".join(map(str, [d["meja"]] + d["gabungan"])), total
+            else:
+                yield id_p, waktu, str(meja), total
+
+    def baca(self, i):
+        _, _, offset, panjang, _, _ = self.rekaman(i)
+        return json.loads(self._baca_peta("dat")[offset:offset + panjang])
+
+    def ambil(self, id_pesanan):
+        """Dict pesanan (Pesanan.ke_dict) atau None jika tidak ada di arsip; O(1) lewat arsip.id."""
+        i = self._nomor(id_pesanan)
+        return None if i is None else self.baca(i)
+
+    def cari_waktu(self, waktu):
+        """Nomor rekaman pertama dengan waktu_selesai >= waktu (epoch)."""
+        lo, hi = 0, self._jumlah
+        while lo < hi:
+            tengah = (lo + hi) // 2
+            if self.rekaman(tengah)[1] < waktu:
+                lo = tengah + 1
+            else:
+                hi = tengah
+        return lo
+
+    def tambah(self, daftar):
+        """daftar: [(id, waktu_selesai epoch, meja, total, dict)] urut waktu selesai."""
+        if self.baca_saja:
+            raise PermissionError("Arsip dibuka baca-saja")
+        f_dat, f_idx, f_id = self._file["dat"], self._file["idx"], self._file["id"]
+        f_dat.seek(0, os.SEEK_END)
+        f_idx.seek(self._jumlah * self.REKAMAN.size)
+        offset = f_dat.tell()
+        for id_p, waktu, meja, total, d in daftar:
+            if id_p in self:
+                continue
+            data = json.dumps(d, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            f_dat.write(data)
+            f_idx.write(self.REKAMAN.pack(id_p, waktu, offset, len(data), -meja if d.get("gabungan") else meja, total))
+            f_id.seek(id_p * self.SLOT.size)
+            f_id.write(self.SLOT.pack(self._jumlah + 1))
+            offset += len(data)
+            self._jumlah += 1
+        for f in self._file.values():
+            f.flush()
+        self._lepas_peta()
+
+    def potong(self, jumlah):
+        """Sisakan `jumlah` rekaman pertama (titik yang tercakup snapshot)."""
+        if self.baca_saja:
+            # hanya batas baca; ukuran dibaca ulang karena penulis bisa menambah arsip sebelum snapshot ini
+            self._lepas_peta()
+            self._jumlah = min(jumlah, self._jumlah_di_disk()) if self._file else 0
+            return
+        jumlah = min(jumlah, self._jumlah)
+        buang = [self.rekaman(i)[0] for i in range(jumlah, self._jumlah)]
+        akhir_data = sum(self.rekaman(jumlah - 1)[2:4]) if jumlah else 0
+        self._lepas_peta()
+        for id_p in buang:
+            self._file["id"].seek(id_p * self.SLOT.size)
+            self._file["id"].write(self.SLOT.pack(0))
+        self._file["dat"].truncate(akhir_data)
+        self._file["idx"].truncate(jumlah * self.REKAMAN.size)
+        for f in self._file.values():
+            f.flush()
+        self._jumlah = jumlah
+
+    def flush(self):
+        if self.baca_saja:
+            return
+        for f in self._file.values():
+            f.flush()
+            os.fsync(f.fileno())
+
+    def tutup(self):
+        self._lepas_peta()
+        for f in self._file.values():
+            f.close()
@@ -0,0 +1,139 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import analitik
+from analitik import GudangAnalitik, TabelKolom
+from Tugasakhir import ManajerRestoran
+
+AWAL = datetime(2026, 3, 2, 9, 0, 0)
+
+
+@pytest.fixture
+def kecil(monkeypatch):
+    # chunk & kapasitas kecil supaya penampungan dan pertumbuhan array ikut teruji
+    monkeypatch.setattr(analitik, "UKURAN_CHUNK", 4)
+    monkeypatch.setattr(analitik, "KAPASITAS_AWAL", 8)
+
+
+def test_tabel_kolom_chunk_tumbuh_dan_tombstone(kecil):
+    t = TabelKolom((("a", "int64"), ("b", "int32")))
+    for i in range(3):
+        assert t.tambah((i, -i)) == i
+    assert (t.n, len(t)) == (0, 3)     # masih di penampung
+    t.tambah((3, -3))
+    assert (t.n, len(t)) == (4, 4)     # satu chunk penuh dipindah ke array
+    for i in range(4, 19):
+        t.tambah((i, -i))
+    t.tambah_array({"a": np.arange(19, 40), "b": -np.arange(19, 40)})
+    assert len(t) == t.n == 40 and len(t.hidup) == 64
+    assert t.kolom("a").tolist() == list(range(40))
+    assert t.kolom("b").tolist() == [-i for i in range(40)]
+    assert t.mask() is None
+
+    t.matikan(5, 10)
+    t.matikan(8, 12)                    # tumpang tindih: baris yang sudah mati tidak dihitung dua kali
+    assert t.jumlah_mati == 7
+    assert t.kolom("a")[t.mask()].tolist() == [i for i in range(40) if not 5 <= i < 12]
+    # baris baru setelah tumbuh lagi tetap hidup
+    for i in range(40, 70):
+        t.tambah((i, -i))
+    assert len(t.hidup) == 128 and int(t.mask().sum()) == 70 - 7
+
+
+def _isi(m, jumlah, rng, t):
+    for _ in range(jumlah):
+        t += timedelta(seconds=rng.randint(60, 2400), microseconds=rng.randint(0, 999999))
+        m.atur_waktu(t)
+        kosong = [meja.nomor for meja in m.meja if meja.status == "kosong"]
+        p = m.buat_pesanan_baru(rng.choice(kosong))
+        m.tambah_items_pesanan(p, [(rng.choice(m.menu_items), rng.randint(1, 3), "")
+                                   for _ in range(rng.randint(1, 4))])
+        m.atur_waktu(t + timedelta(minutes=rng.randint(5, 90)))
+        m.proses_pesanan(p.id_pesanan)
+        m.perbarui_katalog([dict(it.ke_dict(), stok=1000) for it in m.menu_items if it.stok < 50])
+    m.atur_waktu(None)
+    return t, p
+
+
+def _detik(w):
+    return w.replace(microsecond=0)
+
+
+def _harapan(m, mulai=None, sampai=None):
+    # agregasi Python biasa dari nota di manajer, pembanding hasil bincount
+    nota = [p for p in m.iter_nota()
+            if (mulai is None or p.waktu_selesai >= mulai) and (sampai is None or p.waktu_selesai < sampai)]
+    per_menu, per_jam, meja = {}, [0] * 24, {}
+    for p in nota:
+        for it in p.items:
+            j, s = per_menu.get(it.menu_item.id, (0, 0))
+            per_menu[it.menu_item.id] = (j + it.jumlah, s + it.subtotal)
+            per_jam[p.waktu_selesai.hour] += it.subtotal
+        menit = (_detik(p.waktu_selesai) - _detik(p.waktu_buat)).total_seconds() / 60
+        meja.setdefault(p.nomor_meja, []).append(menit)
+    return {
+        "per_menu": per_menu,
+        "per_jam": per_jam,
+        "jumlah_pesanan": len(nota),
+        "rata_total": sum(p.total_harga for p in nota) / len(nota) if nota else 0.0,
+        "rata_baris": sum(len(p.items) for p in nota) / len(nota) if nota else 0.0,
+        "meja": {n: (len(v), sum(v) / len(v)) for n, v in meja.items()},
+    }
+
+
+def _cocokkan(gudang, m, mulai=None, sampai=None):
+    harapan = _harapan(m, mulai, sampai)
+    lap = gudang.laporan(mulai, sampai, n_terlaris=len(m.menu_items))
+    assert {i: (j, s) for i, j, s in lap["terlaris"]} == harapan["per_menu"]
+    jumlah = [j for _, j, _ in lap["terlaris"]]
+    assert jumlah == sorted(jumlah, reverse=True)
+    assert lap["per_jam"] == harapan["per_jam"]
+    assert lap["nota"]["jumlah_pesanan"] == harapan["jumlah_pesanan"]
+    assert lap["nota"]["rata_total"] == pytest.approx(harapan["rata_total"])
+    assert lap["nota"]["rata_baris"] == pytest.approx(harapan["rata_baris"])
+    assert lap["meja"].keys() == harapan["meja"].keys()
+    for nomor, (n, menit) in harapan["meja"].items():
+        assert lap["meja"][nomor][0] == n
+        assert lap["meja"][nomor][1] == pytest.approx(menit)
+    kategori = {}
+    for id_menu, (_, s) in harapan["per_menu"].items():
+        kat = m.get_menu(id_menu).kategori
+        kategori[kat] = kategori.get(kat, 0) + s
+    assert lap["per_kategori"] == kategori
+
+
+def test_laporan_sama_dengan_agregasi_python(kecil):
+    m = ManajerRestoran()
+    rng = random.Random(11)
+    t, _ = _isi(m, 40, rng, AWAL)
+    gudang = GudangAnalitik().ikuti(m)          # nota lama dimuat sekaligus
+    _, terakhir = _isi(m, 60, rng, t)           # nota baru masuk lewat pendengar
+    assert len(gudang.baris) > 8 and len(gudang.baris.hidup) > 8
+
+    _cocokkan(gudang, m)
+    mulai, sampai = AWAL + timedelta(hours=7), AWAL + timedelta(hours=20)
+    _cocokkan(gudang, m, mulai, sampai)
+
+    # undo proses: pesanan aktif lagi -> baris analitiknya ditandai mati
+    m.undo_aksi()
+    assert terakhir.status == "aktif"
+    assert gudang.baris.jumlah_mati == len(terakhir.items)
+    _cocokkan(gudang, m)
+    _cocokkan(gudang, m, mulai, sampai)
+
+    # redo: dicatat ulang sebagai baris baru, baris lama tetap mati
+    m.redo_aksi()
+    assert terakhir.status == "selesai"
+    _cocokkan(gudang, m)
+
+    # undo proses, tambah item, dan buat pesanan: pesanan hilang sama sekali
+    m.undo_aksi()
+    m.undo_aksi()
+    m.undo_aksi()
+    assert terakhir not in m.pesanan
+    _cocokkan(gudang, m)
+    _cocokkan(gudang, m, mulai, sampai)
@@ -0,0 +1,53 @@
+from Tugasakhir import ManajerRestoran, MenuItem, Pesanan
+
+
+def _menu():
+    return MenuItem(1, "Nasi Goreng", "makanan", 15000, 5), MenuItem(2, "Es Teh", "minuman", 5000, 2)
+
+
+def test_batch_berhasil_semua_baris():
+    nasi, teh = _menu()
+    p = Pesanan(1, 1)
+    assert p.tambah_items([(nasi, 2, "pedas"), (teh, 1, ""), (nasi, 1, "")])
+    assert [(it.menu_item, it.jumlah) for it in p.items] == [(nasi, 2), (teh, 1), (nasi, 1)]
+    assert p.total_harga == 3 * 15000 + 5000
+    assert (nasi.stok, nasi.direservasi, teh.stok, teh.direservasi) == (2, 3, 1, 1)
+
+
+def test_batch_gagal_tidak_mengubah_apa_pun():
+    nasi, teh = _menu()
+    p = Pesanan(1, 1)
+    # baris terakhir melebihi stok teh: baris sebelumnya ikut batal
+    assert not p.tambah_items([(nasi, 2, ""), (teh, 3, "")])
+    assert (p.items, p.total_harga) == ([], 0)
+    assert (nasi.stok, nasi.direservasi, teh.stok, teh.direservasi) == (5, 0, 2, 0)
+
+
+def test_batch_menu_sama_di_beberapa_baris_dihitung_bersama():
+    nasi, _ = _menu()
+    p = Pesanan(1, 1)
+    # tiap baris muat sendiri-sendiri, tapi jumlahnya melebihi stok
+    assert not p.tambah_items([(nasi, 3, ""), (nasi, 3, "")])
+    assert (nasi.stok, nasi.direservasi, p.items) == (5, 0, [])
+
+
+def test_batch_jumlah_tidak_valid_ditolak():
+    nasi, teh = _menu()
+    p = Pesanan(1, 1)
+    assert not p.tambah_items([(nasi, 1, ""), (teh, 0, "")])
+    assert not p.tambah_items([])
+    assert (nasi.stok, teh.stok, p.items) == (5, 2, [])
+
+
+def test_batch_satu_entri_undo():
+    m = ManajerRestoran()
+    a, b = m.menu_items[0], m.menu_items[1]
+    stok = (a.stok, b.stok)
+    p = m.buat_pesanan_baru(1)
+    assert m.tambah_items_pesanan(p, [(a, 1, ""), (b, 2, None)])
+    assert len(p.items) == 2 and p.items[1].catatan == ""
+
+    m.undo_aksi()
+    assert (p.items, p.total_harga, (a.stok, b.stok)) == ([], 0, stok)
+    m.redo_aksi()
+    assert len(p.items) == 2
@@ -0,0 +1,59 @@
+import gzip
+import random
+import shutil
+from datetime import datetime, timedelta
+
+import pytest
+
+import cabang
+from ekspor import ekspor_nota
+from Tugasakhir import ManajerRestoran
+
+AWAL = datetime(2024, 5, 1, 10, 0, 0)
+
+
+@pytest.fixture(scope="module")
+def manajer():
+    m = ManajerRestoran()
+    rng = random.Random(5)
+    t = AWAL
+    for _ in range(200):
+        t += timedelta(minutes=rng.randint(1, 40))
+        m.atur_waktu(t)
+        p = m.buat_pesanan_baru(rng.randint(1, 10))
+        for _ in range(rng.randint(1, 3)):
+            # catatan berkoma/berkutip agar baris CSV ber-quote ikut teruji
+            m.tambah_item_pesanan(p, rng.choice(m.menu_items), 1, 'pedas, "ekstra"' if rng.random() < 0.3 else "")
+        m.proses_pesanan(p.id_pesanan)
+        for it in m.menu_items:
+            it.stok = 10**6
+    m.atur_waktu(None)
+    return m
+
+
+@pytest.mark.parametrize("format", ["csv", "jsonl"])
+def test_gz_dibaca_per_baris_sama_dengan_file_biasa(manajer, tmp_path, format):
+    biasa = str(tmp_path / f"a.{format}")
+    ekspor_nota(manajer, biasa)
+    gz = str(tmp_path / f"b.{format}.gz")
+    with open(biasa, "rb") as src, gzip.open(gz, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+
+    # .gz tidak dibaca utuh ke memori: baris keluar satu per satu dari generator
+    baris = cabang._baris_potongan(gz, 0, None)
+    with open(biasa, encoding="utf-8", newline="") as f:
+        assert next(baris) == f.readline()
+    baris.close()
+
+    # satu file .gz = satu tugas; file biasa dipecah per potongan byte
+    tugas = cabang.bagi_tugas([biasa, gz], ukuran_potongan=211)
+    assert sum(1 for t in tugas if t[1] == gz) == 1
+    assert sum(1 for t in tugas if t[1] == biasa) > 1
+
+    harapan = manajer.get_laporan_penjualan()
+    _, per = cabang.gabung_cabang([biasa, gz], proses=1, ukuran_potongan=211)
+    for nama in ("a", "b"):
+        assert per[nama].total_penjualan == harapan["total_penjualan"]
+        assert per[nama].jumlah_pesanan == harapan["jumlah_pesanan"]
+    assert per["a"].per_menu == per["b"].per_menu
+    assert per["a"].per_jam == per["b"].per_jam
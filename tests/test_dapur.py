@@ -0,0 +1,214 @@
+import time
+
+import pytest
+
+from dapur import WAKTU_MASAK, PenjadwalDapur, Tiket, pecah_tiket, simulasikan
+from Tugasakhir import ManajerRestoran
+
+
+def _menu(m, nama):
+    return next(x for x in m.menu_items if x.nama == nama)
+
+
+def _tiket(dapur, id_pesanan):
+    with dapur._kunci:
+        return {t.stasiun: t for t in dapur._tiket.get(id_pesanan, ())}
+
+
+def _tunggu(kondisi, batas=5.0):
+    akhir = time.monotonic() + batas
+    while not kondisi():
+        if time.monotonic() > akhir:
+            raise AssertionError("kondisi tidak terpenuhi")
+        time.sleep(0.005)
+
+
+def _sibukkan_grill(m, dapur):
+    # pesanan penghalang menahan satu-satunya pekerja grill, jadi tiket grill berikutnya tetap antre
+    p = m.buat_pesanan_baru(10)
+    m.tambah_item_pesanan(p, _menu(m, "Mie Dok Dok"), 1)
+    dapur.kirim(p)
+    _tunggu(lambda: _tiket(dapur, p.id_pesanan)["grill"].mulai is not None)
+    return p
+
+
+@pytest.fixture
+def manajer():
+    m = ManajerRestoran()
+    for it in m.menu_items:
+        it.stok = 1000
+    return m
+
+
+def test_item_berubah_setelah_masuk_dapur_dipecah_ulang(manajer):
+    m = manajer
+    # 1 detik dapur = 10 detik nyata: tiket yang sudah mulai tetap "sedang dimasak" selama tes
+    dapur = PenjadwalDapur(stasiun={"grill": 1, "minuman": 1, "dapur": 1}, skala_waktu=10)
+    try:
+        penghalang = _sibukkan_grill(m, dapur)
+        p = m.buat_pesanan_baru(1)
+        m.tambah_item_pesanan(p, _menu(m, "Ayam Balap"), 1)
+        m.tambah_item_pesanan(p, _menu(m, "Es Teh Manis"), 1)
+        dapur.kirim(p)
+        _tunggu(lambda: _tiket(dapur, p.id_pesanan)["minuman"].mulai is not None)
+        minuman = _tiket(dapur, p.id_pesanan)["minuman"]
+
+        m.tambah_item_pesanan(p, _menu(m, "Ayam Balap"), 2)
+        m.tambah_item_pesanan(p, _menu(m, "Jus Jeruk"), 1)
+        assert dapur.perbarui(p)
+        tiket = list(dapur._tiket[p.id_pesanan])
+        grill = [t for t in tiket if t.stasiun == "grill"]
+        # tiket grill yang masih antre diubah di tempat, bukan ditambah
+        assert len(grill) == 1 and grill[0].baris == [("Ayam Balap", 3)]
+        assert grill[0].durasi == WAKTU_MASAK["grill"][0] + 3 * WAKTU_MASAK["grill"][1]
+        # tiket minuman yang sedang dimasak tetap; porsi baru jadi tiket tambahan
+        baru = [t for t in tiket if t.stasiun == "minuman" and t is not minuman]
+        assert minuman in tiket and minuman.baris == [("Es Teh Manis", 1)]
+        assert len(baru) == 1 and baru[0].baris == [("Jus Jeruk", 1)] and baru[0].mulai is None
+        assert set(dapur.perkiraan()) == {penghalang.id_pesanan, p.id_pesanan}
+
+        # semua makanan dihapus: tiket grill yang belum dimasak dibatalkan
+        p.hapus_items(0, len(p.items))
+        m.tambah_item_pesanan(p, _menu(m, "Es Teh Manis"), 1)
+        assert dapur.perbarui(p)
+        assert grill[0].batal and baru[0].batal
+        assert [t.stasiun for t in dapur._tiket[p.id_pesanan]] == ["minuman"]
+        assert p.id_pesanan in dapur
+        assert dapur.ambil_selesai() == []
+    finally:
+        dapur.berhenti(tunggu=False)
+
+
+def test_semua_item_antre_dihapus_pesanan_selesai(manajer):
+    m = manajer
+    dapur = PenjadwalDapur(stasiun={"grill": 1, "minuman": 1, "dapur": 1}, skala_waktu=10)
+    try:
+        _sibukkan_grill(m, dapur)
+        p = m.buat_pesanan_baru(2)
+        m.tambah_item_pesanan(p, _menu(m, "Ayam Bali"), 1)
+        dapur.kirim(p)
+        assert not dapur.perbarui(m.buat_pesanan_baru(3))   # belum di dapur
+        p.hapus_items(0, len(p.items))
+        assert dapur.perbarui(p)
+        assert p.id_pesanan not in dapur
+        assert dapur.ambil_selesai() == [p.id_pesanan]
+    finally:
+        dapur.berhenti(tunggu=False)
+
+
+def test_pecah_tiket_per_stasiun(manajer):
+    m = manajer
+    m.perbarui_katalog([{"jenis": "menu", "id": 300, "nama": "Tahu Isi", "kategori": "camilan", "harga": 3000,
+                         "stok": 50}])
+    p = m.buat_pesanan_baru(1)
+    m.tambah_items_pesanan(p, [(_menu(m, "Ayam Balap"), 2, ""), (_menu(m, "Es Teh Manis"), 1, ""),
+                               (_menu(m, "Jus Jeruk"), 2, ""), (m.get_menu(300), 4, "")])
+    tiket = {t.stasiun: t for t in pecah_tiket(p, prioritas=2)}
+    assert set(tiket) == {"grill", "minuman", "dapur"}
+    assert tiket["grill"].durasi == 180 + 60 * 2
+    assert tiket["minuman"].baris == [("Es Teh Manis", 1), ("Jus Jeruk", 2)]
+    assert tiket["minuman"].durasi == 20 + 15 * 3
+    assert tiket["dapur"].durasi == 120 + 40 * 4
+    assert all(t.prioritas == 2 and t.id_pesanan == p.id_pesanan for t in tiket.values())
+    assert pecah_tiket(m.buat_pesanan_baru(2)) == []
+
+
+def _kedatangan():
+    # A mengisi satu-satunya pekerja grill; B, C, D antre bersamaan di detik 1
+    return [(0, [Tiket(1, "grill", [], 300)]),
+            (1, [Tiket(2, "grill", [], 200)]),
+            (1, [Tiket(3, "grill", [], 50)]),
+            (1, [Tiket(4, "grill", [], 100, prioritas=5)])]
+
+
+@pytest.mark.parametrize("kebijakan, selesai", [
+    ("fifo", {2: 500, 3: 550, 4: 650}),
+    ("sjf", {3: 350, 4: 450, 2: 650}),
+    ("prioritas", {4: 400, 3: 450, 2: 650}),
+])
+def test_simulasi_urutan_kebijakan(kebijakan, selesai):
+    statistik, durasi, tunggu = simulasikan(_kedatangan(), {"grill": 1}, kebijakan)
+    assert durasi == 650
+    assert tunggu == {1: 300, **{i: s - 1 for i, s in selesai.items()}}
+    assert statistik.pesanan_selesai == statistik.tiket_selesai == 4
+    assert statistik.sibuk == {"grill": 650}
+
+
+def test_simulasi_multi_stasiun_pesanan_selesai_saat_tiket_terakhir():
+    kedatangan = [(0, [Tiket(1, "grill", [], 240), Tiket(1, "minuman", [], 35)]),
+                  (10, [Tiket(2, "grill", [], 240)]),
+                  (20, [Tiket(3, "grill", [], 240), Tiket(3, "minuman", [], 50)])]
+    statistik, durasi, tunggu = simulasikan(kedatangan, {"grill": 2, "minuman": 1}, "fifo")
+    # pesanan 3: grill menunggu pekerja pertama bebas (detik 240), minuman menunggu sampai detik 35
+    assert tunggu == {1: 240, 2: 240, 3: 460}
+    assert durasi == 480
+    assert statistik.ke_dict()["rata_antre_tiket"] == pytest.approx((220 + 15) / 5)
+
+
+def _eta(dapur, id_pesanan):
+    return dapur.perkiraan()[id_pesanan]
+
+
+@pytest.mark.parametrize("kebijakan", ["fifo", "sjf", "prioritas"])
+def test_penjadwal_urutan_eta_dan_pembatalan(manajer, kebijakan):
+    m = manajer
+    dapur = PenjadwalDapur(stasiun={"grill": 1, "minuman": 1, "dapur": 1}, kebijakan=kebijakan, skala_waktu=10)
+    try:
+        penghalang = _sibukkan_grill(m, dapur)
+        sisa = _eta(dapur, penghalang.id_pesanan)
+        assert sisa == pytest.approx(240, abs=1)
+
+        besar = m.buat_pesanan_baru(1)
+        m.tambah_item_pesanan(besar, _menu(m, "Ayam Balap"), 3)       # 360 detik dapur
+        kecil = m.buat_pesanan_baru(2)
+        m.tambah_item_pesanan(kecil, _menu(m, "Ayam Bali"), 1)        # 240 detik dapur
+        dapur.kirim(besar)
+        dapur.kirim(kecil)
+        assert not dapur.kirim(kecil)
+        # fifo: urutan masuk; sjf dan prioritas (prioritas sama): yang terpendek dulu
+        kecil_dulu = kebijakan != "fifo"
+        assert _eta(dapur, kecil.id_pesanan) == pytest.approx(sisa + (240 if kecil_dulu else 600), abs=1)
+        assert _eta(dapur, besar.id_pesanan) == pytest.approx(sisa + (600 if kecil_dulu else 360), abs=1)
+
+        # prioritaskan hanya mengubah kunci pada kebijakan "prioritas"; entri heap lama jadi basi
+        assert dapur.prioritaskan(besar.id_pesanan, 5)
+        if kebijakan == "prioritas":
+            assert len(dapur._antrian["grill"]) == 3
+            assert _eta(dapur, besar.id_pesanan) == pytest.approx(sisa + 360, abs=1)
+            assert _eta(dapur, kecil.id_pesanan) == pytest.approx(sisa + 600, abs=1)
+        else:
+            assert len(dapur._antrian["grill"]) == 2
+
+        # batal: tiket hanya ditandai, dibuang dari heap saat diambil
+        assert dapur.batalkan(besar.id_pesanan)
+        assert not dapur.batalkan(besar.id_pesanan)
+        assert besar.id_pesanan not in dapur and besar.id_pesanan not in dapur.perkiraan()
+        assert _eta(dapur, kecil.id_pesanan) == pytest.approx(sisa + 240, abs=1)
+        assert len(dapur._antrian["grill"]) >= 2
+        with dapur._kunci:
+            tiket = dapur._ambil("grill")
+            assert tiket.id_pesanan == kecil.id_pesanan
+            assert dapur._ambil("grill") is None and dapur._antrian["grill"] == []
+    finally:
+        dapur.berhenti(tunggu=False)
+
+
+def test_penjadwal_memasak_sampai_selesai(manajer):
+    m = manajer
+    selesai = []
+    dapur = PenjadwalDapur(kebijakan="sjf", skala_waktu=0.0005, saat_selesai=selesai.append)
+    try:
+        pesanan = []
+        for meja in (1, 2, 3):
+            p = m.buat_pesanan_baru(meja)
+            m.tambah_items_pesanan(p, [(_menu(m, "Mie Dok Dok"), 1, ""), (_menu(m, "Kopi Latte"), 1, "")])
+            dapur.kirim(p)
+            pesanan.append(p.id_pesanan)
+        _tunggu(lambda: len(selesai) == 3)
+        assert sorted(selesai) == sorted(dapur.ambil_selesai()) == pesanan
+        assert len(dapur) == 0 and dapur.ambil_selesai() == []
+        statistik = dapur.statistik.ke_dict()
+        assert (statistik["pesanan_selesai"], statistik["tiket_selesai"]) == (3, 6)
+        assert statistik["sibuk"] == {"grill": 3 * 240, "minuman": 3 * 35}
+    finally:
+        dapur.berhenti()
@@ -0,0 +1,128 @@
+import shutil
+
+import pytest
+
+from katalog import ErrorKatalog, impor_katalog, normalisasi
+from penyimpanan import PenyimpananJurnal
+from Tugasakhir import ManajerRestoran
+
+
+def _tulis(path, *baris):
+    path.write_text("\n".join(baris) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_normalisasi_baris_lengkap_dan_delta():
+    d = normalisasi({"id": "7", "nama": " Sate ", "kategori": "Makanan", "harga": "20000", "stok": "4",
+                     "tingkat_kepedasan": "2"})
+    assert d == {"id": 7, "nama": "Sate", "kategori": "Makanan", "harga": 20000, "stok": 4,
+                 "tingkat_kepedasan": 2, "jenis": "makanan"}
+    assert normalisasi({"id": 8, "nama": "Kerupuk", "kategori": "Camilan", "harga": 1, "stok": 1})["jenis"] == "menu"
+
+    lama = dict(d)
+    assert normalisasi({"id": 7, "stok": "+5"}, lama)["stok"] == 9
+    assert normalisasi({"id": 7, "stok": "-3"}, lama)["stok"] == 1
+    assert normalisasi({"id": 7, "stok": "-4"}, lama)["stok"] == 0
+    assert normalisasi({"id": 7, "stok": "2", "harga": "25000"}, lama) == dict(lama, stok=2, harga=25000)
+
+    for baris, lama_ in [({"id": 7, "stok": "-5"}, lama),            # stok jadi negatif
+                         ({"id": 7, "stok": "+5"}, None),            # relatif tanpa item lama
+                         ({"id": 0, "nama": "x", "kategori": "y", "harga": 1, "stok": 1}, None),
+                         ({"id": 9, "nama": "x", "kategori": "y", "harga": 1}, None),
+                         ({"id": 9, "nama": "x", "kategori": "y", "harga": True, "stok": 1}, None),
+                         ("bukan objek", None)]:
+        with pytest.raises(ValueError):
+            normalisasi(baris, lama_)
+
+
+def test_impor_delta_stok_relatif_dan_batch(tmp_path):
+    m = ManajerRestoran()
+    ayam, bali, teh = m.get_menu(1), m.get_menu(2), m.get_menu(101)
+    stok_awal = {i.id: i.stok for i in (ayam, bali, teh)}
+    panggilan = []
+    asli = m.perbarui_katalog
+    m.perbarui_katalog = lambda data: panggilan.append(len(data)) or asli(data)
+
+    path = _tulis(tmp_path / "delta.csv",
+                  "id,harga,stok",
+                  "1,,+5",
+                  "2,16000,-3",
+                  "1,,+2",          # id sama dalam satu batch: menumpuk pada baris sebelumnya
+                  "101,,7",
+                  "102,,-999",      # ditolak: stok negatif
+                  "500,1000,3")     # ditolak: id baru tanpa nama/kategori
+    hasil = impor_katalog(m, path, delta=True, ukuran_batch=2)
+
+    assert ayam.stok == stok_awal[1] + 7
+    assert (bali.stok, bali.harga) == (stok_awal[2] - 3, 16000)
+    assert teh.stok == 7
+    assert m.get_menu(102).stok == 15 and m.get_menu(500) is None
+    assert (hasil.dibaca, hasil.berubah, hasil.baru, hasil.jumlah_ditolak) == (6, 4, 0, 2)
+    assert [nomor for nomor, _ in hasil.ditolak] == [6, 7]
+    # muat ulang per batch: satu perbarui_katalog (= satu event jurnal) per batch yang punya baris valid
+    assert panggilan == [2, 2]
+    # objek menu diubah di tempat, bukan diganti
+    assert m.get_menu(1) is ayam
+
+
+def test_impor_penuh_menambah_dan_reindeks(tmp_path):
+    m = ManajerRestoran()
+    ayam = m.get_menu(1)
+    path = _tulis(tmp_path / "menu.jsonl",
+                  '{"id": 1, "nama": "Sate Kambing", "kategori": "Makanan", "harga": 30000, "stok": 9}',
+                  '{"id": 103, "nama": "Kopi Latte", "kategori": "Spesial", "harga": 18000, "stok": 12}',
+                  '{"id": 200, "nama": "Es Campur", "kategori": "Minuman", "harga": 10000, "stok": 5}',
+                  '{"id": 201, "nama": rusak}')
+    hasil = impor_katalog(m, path)
+    assert (hasil.baru, hasil.berubah, hasil.jumlah_ditolak) == (1, 2, 1)
+
+    # ganti nama: kata lama hilang dari indeks, kata baru bisa dicari
+    assert m.get_menu(1) is ayam and ayam.nama == "Sate Kambing"
+    assert ayam in m.cari_menu("kambing") and ayam in m.cari_menu("sate")
+    assert ayam not in m.cari_menu("balap")
+    # ganti kategori: pindah bucket
+    latte = m.get_menu(103)
+    assert latte in m.get_menu_by_kategori("Spesial")
+    assert latte not in m.get_menu_by_kategori("minuman")
+    # menu baru berjenis minuman memakai kategori bawaan kelasnya
+    assert m.get_menu(200) in m.get_menu_by_kategori("minuman") and m.cari_menu("campur") == [m.get_menu(200)]
+
+    with pytest.raises(ErrorKatalog):
+        impor_katalog(m, _tulis(tmp_path / "menu.xml", "<menu/>"))
+
+
+def test_stok_absolut_di_luar_reservasi(tmp_path):
+    m = ManajerRestoran()
+    ayam = m.get_menu(1)
+    p = m.buat_pesanan_baru(1)
+    m.tambah_item_pesanan(p, ayam, 3)
+    assert (ayam.stok, ayam.direservasi) == (12, 3)
+
+    # stok absolut = yang masih bisa dipesan; reservasi pesanan aktif tidak ikut ditimpa
+    impor_katalog(m, _tulis(tmp_path / "stok.csv", "id,stok", "1,20"), delta=True)
+    assert (ayam.stok, ayam.direservasi) == (20, 3)
+    m.undo_aksi()   # item dibatalkan: porsinya kembali ke stok
+    assert (ayam.stok, ayam.direservasi) == (23, 0)
+
+    m.tambah_item_pesanan(p, ayam, 2)
+    m.proses_pesanan(p.id_pesanan)   # diproses dapur: reservasi dikomit, stok tetap
+    assert (ayam.stok, ayam.direservasi) == (21, 0)
+
+
+def test_impor_katalog_pulih_dari_jurnal(tmp_path):
+    m = ManajerRestoran(PenyimpananJurnal(str(tmp_path / "data")))
+    p = m.buat_pesanan_baru(2)
+    m.tambah_item_pesanan(p, m.get_menu(101), 2)
+    impor_katalog(m, _tulis(tmp_path / "delta.csv", "id,nama,stok", "101,Es Teh Tawar,+4", "3,,-2"), delta=True)
+    m.penyimpanan.flush()
+    shutil.copytree(tmp_path / "data", tmp_path / "crash", ignore=shutil.ignore_patterns("*.lock"))
+
+    m2 = ManajerRestoran(PenyimpananJurnal(str(tmp_path / "crash")))
+    try:
+        assert m2.ke_snapshot() == m.ke_snapshot()
+        teh = m2.get_menu(101)
+        assert (teh.nama, teh.stok, teh.direservasi) == ("Es Teh Tawar", 22, 2)
+        assert m2.cari_menu("tawar") == [teh]
+    finally:
+        m2.tutup()
+        m.tutup()
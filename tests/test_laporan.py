@@ -0,0 +1,81 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from Tugasakhir import ManajerRestoran
+from penyimpanan import PenyimpananJurnal, PenyimpananSQLite
+
+AWAL = datetime(2026, 3, 1, 8, 0, 0)
+
+
+def _isi(m, jumlah=300, seed=3):
+    # nota dengan waktu selesai acak (termasuk mikrodetik) melintasi beberapa hari
+    rng = random.Random(seed)
+    t = AWAL
+    for _ in range(jumlah):
+        t += timedelta(seconds=rng.randint(1, 1800), microseconds=rng.randint(0, 999999))
+        m.atur_waktu(t)
+        p = m.buat_pesanan_baru(rng.randint(1, 10))
+        m.tambah_item_pesanan(p, m.menu_items[0], 1)
+        m.proses_pesanan(p.id_pesanan)
+        if m.menu_items[0].stok < 2:
+            m.perbarui_katalog([dict(m.menu_items[0].ke_dict(), stok=100)])
+    m.atur_waktu(None)
+    return [(p.waktu_selesai, p.total_harga) for p in m.iter_nota()]
+
+
+def _harapan(nota, mulai, sampai):
+    dalam = [total for waktu, total in nota if mulai <= waktu < sampai]
+    return sum(dalam), len(dalam)
+
+
+def _rentang_acak(nota, rng):
+    awal, akhir = nota[0][0], nota[-1][0]
+    mulai = awal - timedelta(hours=1) + timedelta(seconds=rng.uniform(0, (akhir - awal).total_seconds() + 7200))
+    return mulai, mulai + timedelta(seconds=rng.uniform(0, 30 * 3600))
+
+
+@pytest.fixture(params=["memori", "jurnal", "sqlite"])
+def manajer(request, tmp_path):
+    if request.param == "memori":
+        m = ManajerRestoran()
+    elif request.param == "jurnal":
+        m = ManajerRestoran(PenyimpananJurnal(str(tmp_path)))
+        m.batas_nota_panas = 20   # sebagian besar nota masuk arsip dingin
+    else:
+        m = ManajerRestoran(PenyimpananSQLite(str(tmp_path / "restoran.db")))
+    yield m
+    m.tutup()
+
+
+def test_laporan_rentang_tepat_di_luar_batas_jam(manajer):
+    nota = _isi(manajer)
+    rng = random.Random(7)
+    for _ in range(200):
+        mulai, sampai = _rentang_acak(nota, rng)
+        lap = manajer.get_laporan_penjualan(mulai, sampai)
+        assert (lap["total_penjualan"], lap["jumlah_pesanan"]) == _harapan(nota, mulai, sampai)
+
+
+def test_laporan_batas_tepat_di_waktu_nota(manajer):
+    nota = _isi(manajer)
+    for waktu, _ in nota[::25]:
+        # nota di batas bawah ikut, di batas atas tidak
+        for mulai, sampai in ((waktu, waktu + timedelta(minutes=10)), (waktu - timedelta(minutes=10), waktu),
+                              (waktu, waktu + timedelta(microseconds=1))):
+            lap = manajer.get_laporan_penjualan(mulai, sampai)
+            assert (lap["total_penjualan"], lap["jumlah_pesanan"]) == _harapan(nota, mulai, sampai)
+
+
+def test_agregat_sama_dengan_sqlite_di_jam_yang_terpotong(tmp_path):
+    m = ManajerRestoran(PenyimpananSQLite(str(tmp_path / "restoran.db")))
+    try:
+        nota = _isi(m, jumlah=120)
+        rng = random.Random(11)
+        for _ in range(100):
+            mulai, sampai = _rentang_acak(nota, rng)
+            # agregat di memori harus menjawab sama dengan query SQL, bukan dibulatkan ke jam
+            assert m.penjualan.rentang(mulai, sampai) == m.penyimpanan.laporan_penjualan(mulai, sampai)
+    finally:
+        m.tutup()
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from Tugasakhir import ManajerRestoran
+from layanan import KlienLayanan, LayananRestoran
+
+
+def _jalankan(uji):
+    # layanan di port acak localhost, dipakai bersama oleh satu skenario uji
+    async def utama():
+        manajer = ManajerRestoran()
+        layanan = await LayananRestoran(manajer, port=0).mulai()
+        try:
+            await asyncio.wait_for(uji(manajer, KlienLayanan(port=layanan.port)), 10)
+        finally:
+            await layanan.berhenti()
+    asyncio.run(utama())
+
+
+async def _mentah(port, data):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    balasan = await reader.read()
+    writer.close()
+    return balasan
+
+
+async def _tunggu_jenis(ws, jenis):
+    while True:
+        pesan = await ws.terima()
+        if pesan["jenis"] == jenis:
+            return pesan["data"]
+
+
+def test_alur_kasir_lewat_http():
+    async def uji(manajer, klien):
+        menu = manajer.menu_items[0]
+        status, p = await klien.request("POST", "/pesanan", {"meja": 2})
+        assert status == 201 and p["meja"] == 2
+
+        status, p = await klien.request("POST", f"/pesanan/{p['id']}/item", {"menu": menu.id, "jumlah": 2})
+        assert status == 200 and p["total"] == menu.harga * 2
+        status, p = await klien.request("POST", f"/pesanan/{p['id']}/items",
+                                        {"items": [{"menu": menu.id, "jumlah": 1, "catatan": "pedas"}]})
+        assert status == 200 and len(p["items"]) == 2
+
+        status, hasil = await klien.request("POST", "/undo")
+        assert status == 200 and hasil["berhasil"]
+        status, p = await klien.request("GET", f"/pesanan/{p['id']}")
+        assert len(p["items"]) == 1
+
+        status, p = await klien.request("POST", "/antrian/proses")
+        assert status == 200 and p["status"] == "selesai"
+        status, laporan = await klien.request("GET", "/laporan")
+        assert (laporan["jumlah_pesanan"], laporan["total_penjualan"]) == (1, menu.harga * 2)
+        status, antrian = await klien.request("GET", "/antrian")
+        assert antrian == []
+    _jalankan(uji)
+
+
+def test_pelanggan_websocket_menerima_push():
+    async def uji(manajer, klien):
+        ws = await klien.langganan()
+        try:
+            assert await _tunggu_jenis(ws, "antrian") == []
+            await _tunggu_jenis(ws, "meja_semua")
+
+            status, p = await klien.request("POST", "/pesanan", {"orang": 7})
+            assert status == 201
+            meja = await _tunggu_jenis(ws, "meja")
+            assert meja["status"] == "terisi" and meja["pesanan"] == p["id"]
+            antrian = await _tunggu_jenis(ws, "antrian")
+            assert [x["id"] for x in antrian] == [p["id"]]
+            # rombongan 7 orang menempati meja gabungan; layar dapur harus melihat semua mejanya
+            assert antrian[0]["label_meja"] == "+".join(map(str, [p["meja"]] + p["gabungan"]))
+            assert p["gabungan"]
+        finally:
+            await ws.tutup()
+    _jalankan(uji)
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/pesanan", b"{rusak"),
+    ("/pesanan/1/item", b'{"menu": 99999, "jumlah": 1}'),
+    ("/pesanan/1/item", b'{"menu": 1, "jumlah": 1, "catatan": 5}'),
+])
+def test_request_tidak_valid_400(path, body):
+    async def uji(manajer, klien):
+        await klien.request("POST", "/pesanan", {"meja": 1})
+        balasan = await _mentah(klien.port, f"POST {path} HTTP/1.1\r\nConnection: close\r\n"
+                                             f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        assert balasan.startswith(b"HTTP/1.1 400 ")
+    _jalankan(uji)
+
+
+@pytest.mark.parametrize("header", [
+    b"",                                                                        # tanpa Sec-WebSocket-Key
+    b"Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\nSec-WebSocket-Version: 8\r\n",
+])
+def test_handshake_websocket_tidak_lengkap_400(header):
+    async def uji(manajer, klien):
+        balasan = await _mentah(klien.port, b"GET /ws HTTP/1.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                                            + header + b"\r\n")
+        assert balasan.startswith(b"HTTP/1.1 400 ")
+    _jalankan(uji)
+
+
+def test_baris_request_rusak_400():
+    async def uji(manajer, klien):
+        assert (await _mentah(klien.port, b"GARBAGE\r\n\r\n")).startswith(b"HTTP/1.1 400 ")
+    _jalankan(uji)
@@ -0,0 +1,109 @@
+import shutil
+
+from Tugasakhir import AlokasiMeja, ManajerRestoran, Meja
+from penyimpanan import PenyimpananJurnal
+
+
+def _nomor(meja):
+    return None if meja is None else [m.nomor for m in meja]
+
+
+def _duduki(alokasi, *meja):
+    for m in meja:
+        m.status = "terisi"
+        alokasi.perbarui(m)
+
+
+def _kosong(m):
+    return sorted(meja.nomor for meja in m.meja if meja.status == "kosong")
+
+
+def test_meja_pas_atau_terkecil_yang_cukup():
+    meja = [Meja(1, 2), Meja(2, 4), Meja(3, 6), Meja(4, 4), Meja(5, 8)]
+    alokasi = AlokasiMeja(meja)
+    assert _nomor(alokasi.cari(4)) == [2]   # pas, nomor terkecil bila kapasitas sama
+    assert _nomor(alokasi.cari(3)) == [2]
+    assert _nomor(alokasi.cari(5)) == [3]   # tidak ada yang pas: terkecil yang lebih besar
+    assert _nomor(alokasi.cari(1)) == [1]
+    assert alokasi.cari(0) is None
+    _duduki(alokasi, meja[1])
+    assert _nomor(alokasi.cari(4)) == [4]
+    _duduki(alokasi, meja[3], meja[2])
+    assert _nomor(alokasi.cari(4)) == [5]
+    # dilepas lagi: kembali jadi pilihan terbaik
+    meja[1].status = "kosong"
+    alokasi.perbarui(meja[1])
+    assert _nomor(alokasi.cari(4)) == [2]
+    assert alokasi.jumlah_kosong() == 3
+
+
+def test_gabung_meja_bersebelahan_jika_tidak_ada_yang_cukup():
+    meja = [Meja(i, 2) for i in range(1, 7)]
+    alokasi = AlokasiMeja(meja)
+    assert _nomor(alokasi.cari(3)) == [1, 2]
+    assert _nomor(alokasi.cari(5)) == [1, 2, 3]
+    _duduki(alokasi, meja[1])
+    # 1 tidak bersebelahan dengan 3 lagi; gabungan dimulai dari meja kosong berikutnya
+    assert _nomor(alokasi.cari(3)) == [3, 4]
+    assert _nomor(alokasi.cari(8)) == [3, 4, 5, 6]
+    assert alokasi.cari(7, maks_gabung=3) is None   # paling banyak 3 meja = 6 kursi
+    assert alokasi.cari(9) is None                  # kursi kosong tidak cukup
+
+
+def test_gabungan_memilih_total_kursi_terkecil():
+    meja = [Meja(1, 4), Meja(2, 4), Meja(3, 2), Meja(4, 2), Meja(5, 2)]
+    alokasi = AlokasiMeja(meja)
+    # 2+3 = 6 kursi dengan 2 meja; 1+2 (8 kursi) dan 3+4+5 (6 kursi, 3 meja) kalah
+    assert _nomor(alokasi.cari(5)) == [2, 3]
+    _duduki(alokasi, meja[1])
+    assert _nomor(alokasi.cari(5)) == [3, 4, 5]
+    assert alokasi.cari(5, maks_gabung=2) is None
+
+
+def test_rombongan_lewat_manajer_dan_meja_dilepas():
+    m = ManajerRestoran()   # meja 1-5 kapasitas 2, 6-10 kapasitas 4
+    p1 = m.buat_pesanan_rombongan(2)
+    p2 = m.buat_pesanan_rombongan(3)
+    assert (p1.nomor_meja, p2.nomor_meja) == (1, 6)
+    p3 = m.buat_pesanan_rombongan(7)
+    assert [p3.nomor_meja] + list(p3.meja_gabungan) == [7, 8]
+    assert all(m.meja[n - 1].pesanan is p3 for n in (7, 8))
+    assert m.buat_pesanan_rombongan(40) is None
+    assert _kosong(m) == [2, 3, 4, 5, 9, 10]
+
+    # selesai diproses: meja gabungan ikut kosong dan bisa dipakai lagi
+    m.tambah_item_pesanan(p3, m.menu_items[0], 1)
+    m.proses_pesanan(p3.id_pesanan)
+    assert _kosong(m) == [2, 3, 4, 5, 7, 8, 9, 10]
+    assert _nomor(m.cari_meja(8)) == [7, 8]
+
+    # undo buat pesanan melepas meja pesanan tersebut
+    p4 = m.buat_pesanan_rombongan(8)
+    assert [p4.nomor_meja] + list(p4.meja_gabungan) == [7, 8]
+    m.undo_aksi()
+    assert _kosong(m) == [2, 3, 4, 5, 7, 8, 9, 10]
+    assert _nomor(m.cari_meja(4)) == [7]
+
+
+def test_meja_gabungan_pulih_dari_jurnal(tmp_path):
+    m = ManajerRestoran(PenyimpananJurnal(str(tmp_path / "data")))
+    p = m.buat_pesanan_rombongan(7)
+    m.buat_pesanan_rombongan(9)
+    m.tambah_item_pesanan(p, m.menu_items[0], 2)
+    m.penyimpanan.flush()
+    shutil.copytree(tmp_path / "data", tmp_path / "crash", ignore=shutil.ignore_patterns("*.lock"))
+
+    m2 = ManajerRestoran(PenyimpananJurnal(str(tmp_path / "crash")))
+    try:
+        assert m2.ke_snapshot() == m.ke_snapshot()
+        p2 = m2.pesanan.get(p.id_pesanan)
+        assert [p2.nomor_meja] + list(p2.meja_gabungan) == [6, 7]
+        assert all(m2.meja[n - 1].pesanan is p2 for n in (6, 7))
+        # indeks meja kosong ikut pulih: meja gabungan tidak ditawarkan lagi
+        assert _kosong(m2) == _kosong(m)
+        assert _nomor(m2.cari_meja(4)) == _nomor(m.cari_meja(4))
+        m2.proses_pesanan(p2.id_pesanan)
+        assert {6, 7} <= set(_kosong(m2))
+    finally:
+        m2.tutup()
+        m.tutup()
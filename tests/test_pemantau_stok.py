@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from pemantau_stok import LajuGeser, PemantauStok
+from Tugasakhir import ManajerRestoran
+
+AWAL = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def test_laju_jendela_geser():
+    laju = LajuGeser(300, 12)   # jendela 60 menit, bucket 5 menit
+    assert laju.laju(0) == 0.0
+    laju.catat(6, 0)
+    # di awal laju dibagi minimal satu bucket, bukan jendela penuh
+    assert laju.laju(100) == pytest.approx(6 / 300)
+    laju.catat(4, 1500)
+    assert laju.laju(1800) == pytest.approx(10 / 1800)
+    assert laju.laju(3599) == pytest.approx(10 / 3599)
+    # bucket pertama (0-300 s) keluar dari jendela, bucket menit ke-25 masih di dalam
+    assert laju.laju(3700) == pytest.approx(4 / 3600)
+    assert laju.laju(1500 + 3600) == 0.0
+    assert laju.total == 0
+
+    laju.catat(3, 10000)
+    laju.catat(-10, 10000)   # undo lebih banyak dari pemakaian di bucket: tidak negatif
+    assert laju.total == 0 and laju.laju(10000) == 0.0
+    laju.catat(2, 10300)
+    laju.catat(1, 10000)     # jam mundur: tetap masuk bucket sekarang
+    assert laju.total == 3
+
+
+@pytest.fixture
+def pantau():
+    m = ManajerRestoran()
+    m.atur_waktu(AWAL)
+    ayam = m.get_menu(1)
+    m.perbarui_katalog([dict(ayam.ke_dict(), stok=100)])
+    pemantau = PemantauStok(jendela_menit=60, jumlah_bucket=12, ambang_menit=30, stok_minimum=3).ikuti(m)
+    peringatan = []
+    pemantau.tambah_pendengar(peringatan.append)
+    yield m, ayam, pemantau, peringatan
+    pemantau.lepas()
+    m.atur_waktu(None)
+
+
+def _tingkat(peringatan):
+    return [p.tingkat for p in peringatan]
+
+
+def test_peringatan_sekali_dan_histeresis(pantau):
+    m, ayam, pemantau, peringatan = pantau
+    p = m.buat_pesanan_baru(1)
+    m.tambah_item_pesanan(p, ayam, 40)   # 40 porsi / 5 menit: 60 sisa habis dalam 7,5 menit
+    assert _tingkat(peringatan) == ["menipis"]
+    assert peringatan[0].habis_dalam_menit == pytest.approx(7.5)
+    m.atur_waktu(AWAL + timedelta(minutes=1))
+    m.tambah_item_pesanan(p, ayam, 1)
+    assert _tingkat(peringatan) == ["menipis"]   # masih menipis: tidak dikirim ulang
+
+    # restock bukan pemakaian; laju 41 porsi / 10 menit
+    m.atur_waktu(AWAL + timedelta(minutes=10))
+    m.perbarui_katalog([dict(ayam.ke_dict(), stok=150)])
+    assert pemantau.proyeksi(ayam)[0] == pytest.approx(41 * 6)
+    # proyeksi ±36 menit: di atas ambang 30 tapi di bawah 30 x 1,5 -> tetap menipis
+    assert pemantau.daftar_peringatan() == [(1, "menipis")]
+    assert _tingkat(peringatan) == ["menipis"]
+    m.perbarui_katalog([dict(ayam.ke_dict(), stok=200)])   # ±48 menit
+    assert _tingkat(peringatan) == ["menipis", "aman"]
+    assert pemantau.daftar_peringatan() == []
+
+    # jendela lewat tanpa pemakaian: laju kembali nol
+    assert pemantau.proyeksi(ayam, (AWAL + timedelta(minutes=75)).timestamp()) == (0.0, None)
+
+
+def test_stok_minimum_dan_habis(pantau):
+    m, ayam, pemantau, peringatan = pantau
+    m.perbarui_katalog([dict(ayam.ke_dict(), stok=5)])
+    p = m.buat_pesanan_baru(1)
+    m.atur_waktu(AWAL + timedelta(hours=3))
+    m.tambah_item_pesanan(p, ayam, 2)
+    assert _tingkat(peringatan) == ["menipis"]
+    assert peringatan[-1].stok == 3
+    m.tambah_item_pesanan(p, ayam, 3)
+    assert _tingkat(peringatan) == ["menipis", "habis"]
+
+
+def test_undo_dan_batal_mengembalikan_stok(pantau):
+    m, ayam, pemantau, peringatan = pantau
+    p = m.buat_pesanan_baru(1)
+    m.tambah_item_pesanan(p, ayam, 40)
+    assert _tingkat(peringatan) == ["menipis"]
+
+    # undo tambah item: stok naik lagi, tidak dihitung sebagai pemakaian negatif di bawah nol
+    m.atur_waktu(AWAL + timedelta(minutes=2))
+    m.undo_aksi()
+    assert ayam.stok == 100
+    assert _tingkat(peringatan) == ["menipis", "aman"]
+    assert pemantau.proyeksi(ayam) == (0.0, None)
+
+    # pesanan dibatalkan (undo tambah banyak + undo buat pesanan): seluruh reservasinya kembali
+    m.tambah_items_pesanan(p, [(ayam, 30, ""), (ayam, 10, "pedas")])
+    assert _tingkat(peringatan)[-1] == "menipis"
+    m.atur_waktu(AWAL + timedelta(minutes=3))
+    m.undo_aksi()
+    m.undo_aksi()
+    assert ayam.stok == 100 and p not in m.pesanan
+    assert _tingkat(peringatan) == ["menipis", "aman", "menipis", "aman"]
@@ -0,0 +1,149 @@
+import random
+import shutil
+
+import pytest
+
+from Tugasakhir import ManajerRestoran
+from penyimpanan import DataSedangDipakai, PenyimpananJurnal, PenyimpananSQLite
+
+
+def _operasi_acak(m, langkah=400, seed=1):
+    # campuran aksi kasir, termasuk undo/redo dan batch, supaya semua jenis event ikut di-replay
+    rng = random.Random(seed)
+    for _ in range(langkah):
+        r = rng.random()
+        aktif = m.pesanan.by_status("aktif")
+        if r < 0.2:
+            kosong = [meja.nomor for meja in m.meja if meja.status == "kosong"]
+            if kosong:
+                m.buat_pesanan_baru(rng.choice(kosong))
+        elif r < 0.5 and aktif:
+            m.tambah_item_pesanan(rng.choice(aktif), rng.choice(m.menu_items), rng.randint(1, 2),
+                                  rng.choice(["", "pedas"]))
+        elif r < 0.6 and aktif:
+            m.tambah_items_pesanan(rng.choice(aktif), [(rng.choice(m.menu_items), rng.randint(1, 3), "")
+                                                       for _ in range(rng.randint(1, 4))])
+        elif r < 0.7:
+            m.proses_pesanan_dequeue()
+        elif r < 0.8:
+            m.undo_aksi()
+        elif r < 0.9:
+            m.redo_aksi()
+        else:
+            _restok(m)
+
+
+def _restok(m):
+    # lewat katalog supaya perubahan stok ikut tercatat di jurnal
+    m.perbarui_katalog([dict(it.ke_dict(), stok=it.stok + 50) for it in m.menu_items if it.stok < 3])
+
+
+def _ringkas(nota):
+    return [(id_p, meja, total, waktu.replace(microsecond=0)) for id_p, meja, total, waktu in nota]
+
+
+def _salin_saat_crash(asal, tujuan):
+    # isi folder data seperti setelah proses mati: tanpa tutup(), tanpa file kunci
+    shutil.copytree(asal, tujuan, ignore=shutil.ignore_patterns("*.lock"))
+
+
+def test_jurnal_pulih_sama_persis(tmp_path):
+    m = ManajerRestoran(PenyimpananJurnal(str(tmp_path / "data"), snapshot_setiap=37))
+    _operasi_acak(m)
+    m.penyimpanan.flush()
+    _salin_saat_crash(tmp_path / "data", tmp_path / "crash")
+
+    m2 = ManajerRestoran(PenyimpananJurnal(str(tmp_path / "crash"), snapshot_setiap=37))
+    try:
+        assert m2.ke_snapshot() == m.ke_snapshot()
+        assert m2.get_laporan_penjualan() == m.get_laporan_penjualan()
+    finally:
+        m2.tutup()
+        m.tutup()
+
+
+def test_jurnal_pulih_dengan_arsip(tmp_path):
+    m = ManajerRestoran(PenyimpananJurnal(str(tmp_path / "data"), snapshot_setiap=50))
+    m.batas_nota_panas = 10
+    for i in range(400):
+        p = m.buat_pesanan_baru(i % 10 + 1)
+        m.tambah_item_pesanan(p, m.menu_items[i % len(m.menu_items)], 1)
+        m.proses_pesanan(p.id_pesanan)
+        _restok(m)
+    m.penyimpanan.flush()
+    assert len(m.arsip) > 0
+    _salin_saat_crash(tmp_path / "data", tmp_path / "crash")
+
+    m2 = ManajerRestoran(PenyimpananJurnal(str(tmp_path / "crash"), snapshot_setiap=50))
+    try:
+        assert m2.jumlah_nota() == m.jumlah_nota() == 400
+        # batas_nota_panas bawaan m2 lebih besar, jadi sebagian nota masih panas; indeks arsip hanya simpan detik
+        assert _ringkas(m2.daftar_nota()) == _ringkas(m.daftar_nota())
+        assert m2.get_laporan_penjualan() == m.get_laporan_penjualan()
+    finally:
+        m2.tutup()
+        m.tutup()
+
+
+
+def test_sqlite_pulih_sama_persis(tmp_path):
+    data = tmp_path / "data"
+    m = ManajerRestoran(PenyimpananSQLite(str(data / "restoran.db"), snapshot_setiap=37))
+    _operasi_acak(m)
+    m.penyimpanan.flush()
+    _salin_saat_crash(data, tmp_path / "crash")
+
+    m2 = ManajerRestoran(PenyimpananSQLite(str(tmp_path / "crash" / "restoran.db"), snapshot_setiap=37))
+    try:
+        assert m2.ke_snapshot() == m.ke_snapshot()
+        # tabel state ikut pulih: laporan & daftar nota dijawab dari SQL
+        assert m2.daftar_nota() == m.daftar_nota()
+        assert m2.penyimpanan.laporan_penjualan(None, None) == m.penyimpanan.laporan_penjualan(None, None)
+    finally:
+        m2.tutup()
+        m.tutup()
+
+
+def test_sqlite_error_writer_tidak_menggantung(tmp_path):
+    p = PenyimpananSQLite(str(tmp_path / "restoran.db"), batas_tunggu=5)
+    p.perbarui("pesanan", {"id": 1})   # dict pesanan tanpa field wajib -> writer gagal
+    with pytest.raises(RuntimeError) as info:
+        p.flush()
+    assert isinstance(info.value.__cause__, KeyError)
+
+
+def test_jurnal_baca_saja_tidak_mengubah_folder(tmp_path):
+    data = tmp_path / "data"
+    m = ManajerRestoran(PenyimpananJurnal(str(data)))
+    _operasi_acak(m, langkah=150)
+    m.penyimpanan.flush()
+    sebelum = {f.name: f.read_bytes() for f in data.iterdir()}
+
+    # penulis kedua ditolak, pembaca tetap bisa memulihkan state tanpa menulis apa pun
+    with pytest.raises(DataSedangDipakai):
+        PenyimpananJurnal(str(data))
+    r = ManajerRestoran(PenyimpananJurnal(str(data), baca_saja=True))
+    try:
+        assert r.ke_snapshot()["pesanan"] == m.ke_snapshot()["pesanan"]
+    finally:
+        r.tutup()
+    assert {f.name: f.read_bytes() for f in data.iterdir()} == sebelum
+    m.tutup()
+
+
+def test_sqlite_baca_saja_tanpa_kunci(tmp_path):
+    db = str(tmp_path / "restoran.db")
+    m = ManajerRestoran(PenyimpananSQLite(db))
+    _operasi_acak(m, langkah=150)
+    m.penyimpanan.flush()
+
+    with pytest.raises(DataSedangDipakai):
+        PenyimpananSQLite(db)
+    r = ManajerRestoran(PenyimpananSQLite(db, baca_saja=True))
+    try:
+        assert r.daftar_nota() == m.daftar_nota()
+        with pytest.raises(PermissionError):
+            r.penyimpanan.catat({"tipe": "undo"})
+    finally:
+        r.tutup()
+        m.tutup()
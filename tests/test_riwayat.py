@@ -0,0 +1,72 @@
+from Tugasakhir import ManajerRestoran
+
+
+def test_undo_redo_tambah_item_mengembalikan_stok():
+    m = ManajerRestoran()
+    menu = m.menu_items[0]
+    stok_awal = menu.stok
+    p = m.buat_pesanan_baru(1)
+    assert m.tambah_item_pesanan(p, menu, 2, "pedas")
+    assert (menu.stok, menu.direservasi, p.total_harga) == (stok_awal - 2, 2, menu.harga * 2)
+
+    aksi, ok, _ = m.undo_aksi()
+    assert ok
+    assert (menu.stok, menu.direservasi, p.total_harga, len(p.items)) == (stok_awal, 0, 0, 0)
+
+    aksi, ok, _ = m.redo_aksi()
+    assert ok
+    assert (menu.stok, menu.direservasi, p.total_harga) == (stok_awal - 2, 2, menu.harga * 2)
+    assert p.items[0].catatan == "pedas"
+
+
+def test_undo_buat_pesanan_mengosongkan_meja():
+    m = ManajerRestoran()
+    p = m.buat_pesanan_baru(3)
+    assert m.meja[2].status == "terisi"
+
+    m.undo_aksi()
+    assert m.get_pesanan(p.id_pesanan) is None
+    assert m.meja[2].status == "kosong"
+    assert p.id_pesanan not in [x.id_pesanan for x in m.antrian_pesanan]
+
+    m.redo_aksi()
+    assert m.get_pesanan(p.id_pesanan) is p
+    assert m.meja[2].status == "terisi"
+
+
+def test_undo_proses_pesanan_membatalkan_penjualan():
+    m = ManajerRestoran()
+    menu = m.menu_items[0]
+    stok_awal = menu.stok
+    p = m.buat_pesanan_baru(1)
+    m.tambah_item_pesanan(p, menu, 1)
+    m.proses_pesanan_dequeue()
+    assert p.status == "selesai"
+    assert m.get_laporan_penjualan()["jumlah_pesanan"] == 1
+    assert menu.direservasi == 0 and menu.stok == stok_awal - 1
+
+    m.undo_aksi()
+    assert p.status == "aktif"
+    assert m.get_laporan_penjualan()["jumlah_pesanan"] == 0
+    # reservasi kembali tertahan, belum terjual
+    assert menu.direservasi == 1 and menu.stok == stok_awal - 1
+
+    m.redo_aksi()
+    assert p.status == "selesai"
+    assert m.get_laporan_penjualan()["total_penjualan"] == menu.harga
+
+
+def test_aksi_baru_menghapus_redo():
+    m = ManajerRestoran()
+    p = m.buat_pesanan_baru(1)
+    m.tambah_item_pesanan(p, m.menu_items[0], 1)
+    m.undo_aksi()
+    m.tambah_item_pesanan(p, m.menu_items[1], 1)
+    assert m.redo_aksi() is None
+    assert [it.menu_item for it in p.items] == [m.menu_items[1]]
+
+
+def test_undo_redo_tanpa_riwayat():
+    m = ManajerRestoran()
+    assert m.undo_aksi() is None
+    assert m.redo_aksi() is None
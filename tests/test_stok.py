@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from Tugasakhir import ManajerRestoran, MenuItem, Pesanan
+
+
+def test_reservasi_komit_lepas():
+    menu = MenuItem(1, "Nasi Goreng", "makanan", 15000, 5)
+    assert menu.reservasi(3)
+    assert (menu.stok, menu.direservasi) == (2, 3)
+    assert not menu.reservasi(3)   # stok kurang: tidak ada yang berubah
+    assert (menu.stok, menu.direservasi) == (2, 3)
+
+    menu.komit_reservasi(2)        # 2 porsi terjual
+    assert (menu.stok, menu.direservasi) == (2, 1)
+    menu.lepas_reservasi(1)        # sisa reservasi dibatalkan, stok kembali
+    assert (menu.stok, menu.direservasi) == (3, 0)
+
+
+def test_hapus_item_melepas_reservasi():
+    menu = MenuItem(1, "Es Teh", "minuman", 5000, 4)
+    p = Pesanan(1, 1)
+    assert p.tambah_item(menu, 3)
+    assert not p.tambah_item(menu, 2)
+    assert (menu.stok, menu.direservasi, len(p.items)) == (1, 3, 1)
+    p.hapus_item_index(0)
+    assert (menu.stok, menu.direservasi, p.total_harga) == (4, 0, 0)
+
+
+def test_catatan_tidak_valid_tidak_menahan_stok():
+    menu = MenuItem(1, "Es Teh", "minuman", 5000, 4)
+    p = Pesanan(1, 1)
+    with pytest.raises(TypeError):
+        p.tambah_item(menu, 2, catatan=123)
+    assert (menu.stok, menu.direservasi) == (4, 0)
+
+
+def test_pesanan_selesai_mengkomit_reservasi():
+    m = ManajerRestoran()
+    menu = m.menu_items[0]
+    stok_awal = menu.stok
+    p = m.buat_pesanan_baru(1)
+    m.tambah_item_pesanan(p, menu, 2)
+    m.proses_pesanan(p.id_pesanan)
+    assert (menu.stok, menu.direservasi) == (stok_awal - 2, 0)
+
+
+def test_reservasi_bersamaan_tidak_oversell():
+    menu = MenuItem(1, "Ayam Bakar", "makanan", 25000, 1000)
+    berhasil = []
+    mulai = threading.Barrier(8)
+
+    def kasir():
+        mulai.wait()
+        n = 0
+        for _ in range(500):
+            if menu.reservasi(1):
+                n += 1
+        berhasil.append(n)
+
+    threads = [threading.Thread(target=kasir) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(berhasil) == 1000
+    assert (menu.stok, menu.direservasi) == (0, 1000)